@@ -0,0 +1,57 @@
+'''
+Import-time benchmark for pylfsr
+---------------------------------
+Time of cold 'import pylfsr' (fresh interpreter each run), compared with 'import numpy' alone,
+and check that plotting libraries (matplotlib) are not imported.
+
+usage: python benchmarks/bench_import.py [--budget 0.5] [--overhead 0.05] [--repeat 7]
+
+Exits with status 1 if minimum import time of pylfsr is more than budget (seconds), or time on top of
+numpy is more than overhead (seconds), or matplotlib is imported.
+'''
+from __future__ import print_function
+import os, sys, subprocess, argparse
+
+_CODE = '''
+import sys, time
+t0 = time.perf_counter()
+import %s
+t1 = time.perf_counter()
+print(t1 - t0, int('matplotlib' in sys.modules))
+'''
+
+def import_time(module, repeat=7):
+    '''
+    Minimum time (seconds) of importing module in a fresh interpreter, and whether matplotlib got imported
+    '''
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = root + os.pathsep + env.get('PYTHONPATH', '')
+    env['MPLBACKEND'] = 'Agg'
+    cmd = [sys.executable, '-c', _CODE % module]
+    # first run compiles bytecode, not counted
+    subprocess.check_output(cmd, env=env)
+    times, mpl = [], False
+    for _ in range(repeat):
+        t, m = subprocess.check_output(cmd, env=env).decode().split()
+        times.append(float(t))
+        mpl = mpl or bool(int(m))
+    return min(times), mpl
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='cold import time of pylfsr')
+    parser.add_argument('--budget', type=float, default=0.5, help='max import time of pylfsr in seconds')
+    parser.add_argument('--overhead', type=float, default=0.05, help='max import time on top of numpy in seconds')
+    parser.add_argument('--repeat', type=int, default=7, help='number of runs (minimum is reported)')
+    args = parser.parse_args()
+
+    t_np, _ = import_time('numpy', args.repeat)
+    t_lfsr, mpl = import_time('pylfsr', args.repeat)
+    print('import numpy  : %.1f ms' % (1000*t_np))
+    print('import pylfsr : %.1f ms (budget %.1f ms)' % (1000*t_lfsr, 1000*args.budget))
+    print('overhead      : %.1f ms (budget %.1f ms)' % (1000*(t_lfsr - t_np), 1000*args.overhead))
+    print('matplotlib imported: ', mpl)
+    ok = t_lfsr <= args.budget and t_lfsr - t_np <= args.overhead and not mpl
+    print('Pass?: ', ok)
+    sys.exit(0 if ok else 1)
@@ -28,7 +28,9 @@ import sys, os
 
 sys.path.append(os.path.dirname(__file__))
 
-from .pylfsr import (LFSR, PlotLFSR, dispLFSR)
-from .seq_generators import (A5_1, Geffe, Geffe3)
-from .utils import (lempel_ziv_patterns, lempel_ziv_complexity, get_fpolyList, get_Ifpoly)
+from .pylfsr import (LFSR, LFSRBank, LFSRTestResult, PlotLFSR, dispLFSR, generate_parallel)
+from .seq_generators import (A5_1, Geffe, Geffe3, a5_1_keystream, Combiner, FilterGenerator, ShrinkingGenerator,
+                             SelfShrinkingGenerator, AlternatingStepGenerator)
+from .utils import (lempel_ziv_patterns, lempel_ziv_complexity, get_fpolyList, get_Ifpoly, is_primitive, is_irreducible,
+                    search_fpoly, berlekamp_massey, BerlekampMassey)
 from .utils import (pretty_print, print_list, progbar, deprecated)
@@ -31,12 +31,205 @@ if sys.version_info[:2] < (3, 3):
             # Why might file=None? IDK, but it works for print(i, file=None)
             file.flush() if file is not None else sys.stdout.flush()
 
+import time, warnings
+from collections import namedtuple
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from .utils import deprecated, progbar
+# matplotlib is imported only in plotting functions (Viz, PlotLFSR, dispLFSR), so import pylfsr stays fast and headless
+from .utils import deprecated, progbar, _SeqMixin, _bits2str, _write_sequence
+from .utils import _gf2_powmod, _gf2_order, _popcount, is_primitive
+from .utils import _loadFpolyList, _loadFpolyDegree
 
-class LFSR():
+def _state2int(state):
+    '''
+    Pack binary state vector into an int, with state[i] as i-th bit of int
+    '''
+    b = np.packbits(np.asarray(state).astype(np.uint8), bitorder='little')
+    return int.from_bytes(b.tobytes(), 'little')
+
+def _int2state(S, N):
+    '''
+    Unpack an int into binary state vector of length N, i-th bit of int as state[i]
+    '''
+    b = np.frombuffer(S.to_bytes((N + 7)//8, 'little'), dtype=np.uint8)
+    return np.unpackbits(b, bitorder='little')[:N].astype(int)
+
+def _fpoly_mask(fpoly, conf='fibonacci'):
+    '''
+    Tap mask of feedback polynomial for packed stepping
+
+    For fibonacci, mask of registers xored to compute feedback bit.
+    For galois, mask of registers toggled by feedback bit (excluding the highest power).
+    '''
+    fpoly = fpoly if conf=='fibonacci' else fpoly[1:]
+    mask = 0
+    for f in fpoly:
+        mask |= 1 << (int(f) - 1)
+    return mask
+
+def _packed_step(S, N, conf, mask):
+    '''
+    One cycle of packed N-bit LFSR state S
+
+    mask: for fibonacci, _fpoly_mask(fpoly,'fibonacci'),
+        : for galois, _fpoly_mask(fpoly,'galois') | 1<<(N-1)
+    '''
+    if conf=='fibonacci':
+        return ((S << 1) & ((1 << N) - 1)) | (_popcount(S & mask) & 1)
+    return (S >> 1) ^ mask if S & 1 else S >> 1
+
+def _charpoly(fpoly, N):
+    '''
+    Characteristic polynomial of transition of N-bit LFSR as int (i-th bit as coefficient of x^i)
+
+    q(x) = x^N + sum x^(N-f), for f in fpoly. Each register of LFSR, for both fibonacci and galois configuration,
+    follows the recurrence  s(t) = XOR s(t-f), for f in fpoly, for t>=N.
+    '''
+    q = 1 << N
+    for f in fpoly:
+        q ^= 1 << (N - int(f))
+    return q
+
+def _state_minpoly(S, N, conf, mask):
+    '''
+    Minimal polynomial of packed state S w.r.t. transition A of N-bit LFSR, as int
+
+    Smallest degree polynomial mu with mu(A).S = 0, found as the first linear dependency of S, A.S, A^2.S, ...
+    (Krylov sequence), by Gaussian elimination on packed states, tracking the combination of each basis vector.
+    '''
+    basis = {}
+    for k in range(N + 1):
+        v, c = S, 1 << k
+        while v:
+            p = v.bit_length() - 1
+            if p not in basis:
+                break
+            v ^= basis[p][0]
+            c ^= basis[p][1]
+        if not v:
+            return c
+        basis[v.bit_length() - 1] = (v, c)
+        S = _packed_step(S, N, conf, mask)
+
+def _cell_sequence(S, N, conf, fpoly, n, cell=-1, max_block=2**20):
+    '''
+    Sequence of a register (cell) of N-bit LFSR for n cycles, starting from packed state S
+
+    Returns c(0), c(1),... c(n-1), values of state[cell] at time t, with c(0) from S, as np.uint8 array.
+
+    Each register follows the recurrence c(t) = XOR c(t-f) for f in fpoly (t>=N, see _charpoly), and since
+    q(x)^(2^j) = q(x^(2^j)) over GF(2), also c(t) = XOR c(t - 2^j f), for t >= 2^j N.
+    With lags of 2^j f, a block of 2^j min(fpoly) bits is computed at once by xoring len(fpoly) slices of
+    already computed sequence. Starting with j=0, after first N bits (from packed stepping), j is incremented
+    whenever 2^(j+1) N bits are available, so block size grows (upto max_block) irrespective of taps of fpoly.
+    '''
+    cell = cell % N
+    mask = _fpoly_mask(fpoly, conf)
+    if conf=='galois':
+        mask |= 1 << (N - 1)
+
+    c = np.empty(n, dtype=np.uint8)
+    for t in range(min(n, N)):
+        c[t] = (S >> cell) & 1
+        S = _packed_step(S, N, conf, mask)
+    if n <= N:
+        return c
+
+    lags = [int(f) for f in fpoly]
+    minf = min(lags)
+    T, j = N, 0
+    while T < n:
+        if T >= (N << (j + 1)) and (minf << j) < max_block:
+            j += 1
+            continue
+        L = min(minf << j, n - T)
+        out = c[T:T + L]
+        d0, d1 = T - (lags[0] << j), T - (lags[1] << j)
+        np.bitwise_xor(c[d0:d0 + L], c[d1:d1 + L], out=out)
+        for f in lags[2:]:
+            d = T - (f << j)
+            np.bitwise_xor(out, c[d:d + L], out=out)
+        T += L
+    return c
+
+LFSRTestResult = namedtuple('LFSRTestResult', ['passed', 'periodicity', 'balance', 'runlength', 'autocorr',
+                                               'period', 'N1s', 'N0s', 'runs', 'timings'])
+LFSRTestResult.__doc__ = '''
+Result of LFSR.test_suite
+
+passed: bool, True if all four properties are satisfied
+periodicity, balance, runlength, autocorr: bool, result of each property
+period: int, expected period T = 2^M-1
+N1s, N0s: int, number of 1s and 0s in a period
+runs: array, runs[k] number of runs of length k+1 in a period
+timings: dict, time (in seconds) of each step: 'generate', 'periodicity', 'balance', 'runlength', 'autocorr', 'total'
+'''
+
+# number of 1s in a byte
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _packed_ones(b, n):
+    '''
+    Number of 1s in first n bits of packed bytes b (bitorder='big')
+    '''
+    k, r = divmod(n, 8)
+    c = int(_POPCOUNT8[b[:k]].sum(dtype=np.int64))
+    if r:
+        c += _popcount(int(b[k]) >> (8 - r))
+    return c
+
+def _packed_runs(b, n, chunk=2**20):
+    '''
+    Runs in first n bits of packed bytes b (bitorder='big'), as a period, so a run can wrap around from end to start
+
+    Returns runs, runs[k] number of runs of length k+1, same as LFSR.runlength_property of unpacked bits.
+    Transitions (bit k != bit k+1) are computed bytewise as b ^ (b<<1), and unpacked only for chunk bytes at a time.
+    '''
+    nb = (n + 7)//8
+    b = np.r_[np.asarray(b, dtype=np.uint8)[:nb], np.uint8(0)]
+    runs = np.zeros(0, dtype=np.int64)
+    lengths = []
+    first, prev = None, -1
+    for i in range(0, nb, chunk):
+        x = b[i:i + chunk + 1]
+        d = x[:-1] ^ ((x[:-1] << 1) | (x[1:] >> 7))
+        pos = np.flatnonzero(np.unpackbits(d)) + 8*i
+        pos = pos[pos < n - 1]
+        if not len(pos):
+            continue
+        L = np.diff(pos, prepend=prev)
+        if first is None:
+            first, L = int(L[0]), L[1:]
+        if len(L):
+            c = np.bincount(L - 1)
+            if len(c) > len(runs):
+                runs = np.r_[runs, np.zeros(len(c) - len(runs), dtype=np.int64)]
+            runs[:len(c)] += c
+        prev = int(pos[-1])
+    if first is None:
+        lengths = [n]
+    elif (b[0] >> 7) == (b[(n - 1)//8] >> (7 - (n - 1) % 8)) & 1:
+        # first and last run are same run
+        lengths = [first + n - 1 - prev]
+    else:
+        lengths = [first, n - 1 - prev]
+    for l in lengths:
+        if l > len(runs):
+            runs = np.r_[runs, np.zeros(l - len(runs), dtype=np.int64)]
+        runs[l - 1] += 1
+    return runs
+
+def _check_runs(runs):
+    '''
+    Run length property of runs (runs[k] number of runs of length k+1), see LFSR.runlength_property
+    '''
+    pp=0
+    for k in range(len(runs)-2):
+        if runs[k]==2*runs[k+1]:
+            pp=pp+1
+    if runs[-2]==runs[-1]: pp=pp+1
+    return pp==len(runs)-1
+
+class LFSR(_SeqMixin):
     '''
     Linear Feedback Shift Register
 
@@ -91,6 +284,12 @@ class LFSR():
        : seq_bit_index can varies from -M to M-1,for M-bit LFSR. For example 5-bit LFSR, seq_bit_index=-5,-4,-3,-2,-1, 0, 1, 2, 3, 4
        : seq_bit_index=-1, means output sequence is taken out from last Register, -2, second last,
 
+    seq_history: int or None, default=None, number of last output bits retained in seq
+       : if None, whole output sequence since first cycle is retained in seq
+       : if 0, output sequence is not retained, seq is empty
+       : if N > 0, only last N bits of output sequence are retained in seq
+       : For long running LFSR, use seq_history=0 or N, to keep the memory bounded. runKCycle still returns all the generated bits.
+
 
     Attributes
     ----------
@@ -133,6 +332,12 @@ class LFSR():
     - next()         : running one cycle
     - runKCycle(k)   : running k cycles
     - runFullPeriod(): running a full period of cylces
+    - jump(k)        : skip k cycles, without generating output sequence
+    - generate_bits(n, dtype=np.uint8) : running n cycles in blocks (fast), output as np.uint8 array or packed bytes
+    - stream(chunk_size, n=None) : generator of output sequence in chunks
+    - iter(L)        : LFSR is iterable, iterating over output bits cycle by cycle
+
+    | See LFSRBank, for clocking many LFSRs together
 
     | Deprecated methods::
     - runFullCycle()  :
@@ -146,6 +351,7 @@ class LFSR():
     - set_conf(conf)   : change/set configuration
     - set_state(state) : change/set state
     - set_seq_bit_index(bit_index) : change/set seq_bit_index
+    - set_seq_history(seq_history) : change/set seq_history
 
     | Getters::
     - getFullPeriod()    : get a period
@@ -461,7 +667,7 @@ class LFSR():
     ==================
     '''
 
-    def __init__(self, fpoly=[5, 2], initstate='ones', conf='fibonacci',seq_bit_index=-1,verbose=False,counter_start_zero=True):
+    def __init__(self, fpoly=[5, 2], initstate='ones', conf='fibonacci',seq_bit_index=-1,verbose=False,counter_start_zero=True,seq_history=None):
 
         self._initstate = initstate
         if isinstance(initstate, str):
@@ -490,6 +696,7 @@ class LFSR():
 
 
         self.verbose = verbose
+        self.seq_history = seq_history
         self.update()
         self.check()
         self.seq =  np.array([-1]) if counter_start_zero else np.array([self.state[self.seq_bit_index]])
@@ -507,18 +714,22 @@ class LFSR():
         feed = feed + '1'
         self.feedpoly = feed
 
-        self.M = np.max(self.fpoly)
+        self.M = int(np.max(self.fpoly))
         self.order = self.M
         self.expectedPeriod = 2**self.M - 1
         self.T = 2**self.M - 1
+        # actual period, computed with get_period
+        self._period = None
 
-    def check(self):
+    def check(self, primitive=False):
         '''
         Check if
         - degree of feedback polynomial <= length of LFSR >=1
         - given intistate of LFSR is correct
         - configuration is valid
         - output sequence bit index
+        - (optional) feedback polynomial is primitive, if primitive=True, a warning is raised,
+          if it is not, since period of LFSR will be less than 2^M-1 (see is_primitive)
 
         '''
 
@@ -559,6 +770,20 @@ class LFSR():
         if self.seq_bit_index not in list(range(-np.max(self.fpoly), np.max(self.fpoly))):
             raise IndexError('Output sequence can be taken from one of the register only [%d,%d), index = %d provided: Out of bounds index' % (-np.max(self.fpoly), np.max(self.fpoly), self.seq_bit_index))
 
+        # Check length of output sequence history
+        # ------------------------
+        if self.seq_history is not None and (not isinstance(self.seq_history, (int, np.integer)) or self.seq_history < 0):
+            raise ValueError('seq_history should be None or a non-negative int')
+
+        # Check if Feedback Polynomial is primitive
+        # ------------------------
+        if primitive:
+            try:
+                if not is_primitive(self.fpoly):
+                    warnings.warn('Feedback polynomial %s is not primitive, period of LFSR is less than 2^M-1' % str(self.fpoly))
+            except ValueError as e:
+                warnings.warn('Could not check if feedback polynomial is primitive: ' + str(e))
+
     def check_state(self):
         '''
         check if current state vector is valid
@@ -610,8 +835,8 @@ class LFSR():
         param = param + ['count','state','outbit','feedbackbit','seq','counter_start_zero']
 
         for key in param:
-            if key in self.__dict__:
-                fmt = fmt+f"{key}{' '*(10-len(key))}\t=\t{self.__dict__[key]}\n"
+            if hasattr(self, key):
+                fmt = fmt+f"{key}{' '*(10-len(key))}\t=\t{getattr(self, key)}\n"
         return fmt
 
     def next(self,verbose=False):
@@ -631,7 +856,7 @@ class LFSR():
             if self.count ==0:
                 self.seq = np.array([self.state[self.seq_bit_index]])
             else:
-                self.seq  = np.append(self.seq, self.state[self.seq_bit_index])
+                self._seq.append(self.state[self.seq_bit_index])
 
         if self.conf=='fibonacci':
             b = np.logical_xor(self.state[self.fpoly[0] - 1], self.state[self.fpoly[1] - 1])
@@ -655,34 +880,248 @@ class LFSR():
             if self.count ==0:
                 self.seq = np.array([self.outbit])
             else:
-                self.seq  = np.append(self.seq, self.outbit)
+                self._seq.append(self.outbit)
 
         self.count += 1
 
         return self.outbit
 
-    def runKCycle(self, k, verbose=False):
+    def runKCycle(self, k, verbose=False, packed=False, bitorder='big'):
         '''
         Run k cycles and update all the Parameters
 
         Parameters
         ----------
         k : int
+        packed: bool, default=False, if True, output bits are packed into np.uint8 bytes, same as np.packbits
+        bitorder: str {'big','little'}, default='big', order of bits in packed bytes (see np.packbits)
 
         Returns
         -------
         tempseq : shape =(k,), output binary sequence of k cycles
+            if packed=True, shape = (ceil(k/8),), np.uint8
+
+        Note: unless verbose, cycles are excecuted with packed-integer engine or in blocks (see 'generate_bits'),
+        which produces exactly same output, state and seq as calling next() k times.
         '''
         if verbose:
             self.verbose = False
             tempseq = []
             for i in range(k):
-                ProgBar(i,k,title=f' {k}-cycles')
+                progbar(i,k,title=f' {k}-cycles')
                 tempseq.append(self.next())
-        else:
+        elif self.verbose:
             tempseq = [self.next() for _ in range(k)]
+        else:
+            return self.generate_bits(k, dtype='packed' if packed else int, bitorder=bitorder)
+        if packed:
+            return np.packbits(np.array(tempseq, dtype=np.uint8), bitorder=bitorder)
         return np.array(tempseq)
 
+    def generate_bits(self, n, dtype=np.uint8, bitorder='big'):
+        '''
+        Run n cycles in blocks and update all the Parameters
+        ----------------------------------------------------
+        Output sequence is generated many bits at a time, with word-parallel recurrence of register
+        (see _cell_sequence), instead of cycle by cycle. Block size starts with min(fpoly) bits, e.g. 18 for [23,18],
+        and doubles every time enough sequence is available, so any feedback polynomial gets wide blocks.
+        For small n (< 32 times length of state), packed-integer engine is used instead.
+
+        Final state is computed with jump(n), and output is exactly same as calling next() n times.
+
+        Parameters
+        ----------
+        n : int, number of cycles
+        dtype: np.uint8 (default), any other numpy dtype, or 'packed'
+            if 'packed', output bits are packed into bytes, as np.packbits, bits are generated and packed
+            in chunks of 2^24 bits, so memory is only n/8 bytes (+ seq, see seq_history)
+        bitorder: str {'big','little'}, default='big', order of bits in packed bytes (see np.packbits)
+
+        Returns
+        -------
+        tempseq : shape =(n,), output binary sequence of n cycles, as dtype
+            if dtype='packed', shape = (ceil(n/8),)
+        '''
+        if isinstance(dtype, str) and dtype=='packed':
+            chunk = 2**24
+            tempseq = np.empty((n + 7)//8, dtype=np.uint8)
+            for i in range(0, n, chunk):
+                bits = self._generate_bits(min(chunk, n - i))
+                tempseq[i//8:(i + len(bits) + 7)//8] = np.packbits(bits, bitorder=bitorder)
+            return tempseq
+        return self._generate_bits(n).astype(dtype, copy=False)
+
+    def _generate_bits(self, n):
+        '''
+        Run n cycles in blocks, output as np.uint8 array (see generate_bits)
+        '''
+        N = len(self.state)
+        if n < 32*N + 256:
+            tempseq = self._runPacked(n).astype(np.uint8)
+        else:
+            S = _state2int(self.state)
+            c = _cell_sequence(S, N, self.conf, self.fpoly, n + 1, cell=self.seq_bit_index)
+            tempseq = c[:n] if self.counter_start_zero else c[1:]
+            self.jump(n)
+            self._seq.extend(tempseq)
+        return tempseq
+
+    def _bits(self, k, dtype=np.uint8, bitorder='big'):
+        # output of stream (see _SeqMixin.stream), in blocks without int copy of runKCycle
+        return self.generate_bits(k, dtype=dtype, bitorder=bitorder)
+
+    def write_sequence(self, fname, n_bits, fmt='packed', chunk_size=2**24, offset=0, bitorder='big', verbose=False):
+        '''
+        Write output sequence to file
+        -----------------------------
+        Run n_bits - offset cycles and write output sequence to fname, chunk by chunk, into a memory-mapped file,
+        so memory is bounded by chunk_size. For bounded memory set seq_history=0 (see set_seq_history).
+
+        Parameters
+        ----------
+        fname: str, path of file
+        n_bits: int, total number of bits of file
+        fmt: str, {'packed','npy','ascii'}, default='packed'
+            'packed' - raw bytes, ceil(n_bits/8), packed as np.packbits with bitorder
+            'npy'    - .npy file of np.uint8 packed bytes
+            'ascii'  - n_bits characters of '0' and '1'
+        chunk_size: int, number of bits generated at once (default 2^24)
+        offset: int, number of bits already written to fname, to resume writing (default=0)
+            LFSR is expected to be at offset-th bit, (e.g. by jump(offset) from initial state)
+            for 'packed' and 'npy', offset should be multiple of 8, and if offset > 0, fname should exist
+        bitorder: str {'big','little'}, default='big', order of bits in packed bytes
+        verbose: bool, if True, show progress bar
+
+        Returns
+        -------
+        n: int, number of bits written
+
+        Example
+        -------
+        >>> L = LFSR(fpoly=[32,22,2,1], seq_history=0)
+        >>> L.write_sequence('lfsr32.bin', L.expectedPeriod)
+        >>> # resume from 2^31 bits
+        >>> L = LFSR(fpoly=[32,22,2,1], seq_history=0)
+        >>> L.jump(2**31)
+        >>> L.write_sequence('lfsr32.bin', L.expectedPeriod, offset=2**31)
+        '''
+        return _write_sequence(self.generate_bits, fname, n_bits, fmt=fmt, chunk_size=chunk_size, offset=offset,
+                               bitorder=bitorder, verbose=verbose)
+
+    def _runPacked(self, k):
+        '''
+        Run k cycles with packed-integer engine and update all the Parameters
+
+        State of LFSR is kept as an int (i-th bit as i-th register) and feedback polynomial as tap mask,
+        so each cycle is only few bitwise operations, instead of np.roll and np.logical_xor on state vector.
+
+        Parameters
+        ----------
+        k : int
+
+        Returns
+        -------
+        tempseq : shape =(k,), output binary sequence of k cycles
+        '''
+        N = len(self.state)
+        if k < 1:
+            return np.array([], dtype=int)
+
+        idx = self.seq_bit_index % N
+        S = _state2int(self.state)
+        out = bytearray(k)
+        if self.conf=='fibonacci':
+            taps = _fpoly_mask(self.fpoly, 'fibonacci')
+            full = (1 << N) - 1
+            if self.counter_start_zero:
+                for t in range(k):
+                    out[t] = (S >> idx) & 1
+                    S = ((S << 1) & full) | (_popcount(S & taps) & 1)
+            else:
+                for t in range(k):
+                    S = ((S << 1) & full) | (_popcount(S & taps) & 1)
+                    out[t] = (S >> idx) & 1
+        else:
+            # galois: feedback bit (first register) goes to last register and toggles tapped registers
+            gmask = _fpoly_mask(self.fpoly, 'galois') | (1 << (N - 1))
+            if self.counter_start_zero:
+                for t in range(k):
+                    out[t] = (S >> idx) & 1
+                    S = (S >> 1) ^ gmask if S & 1 else S >> 1
+            else:
+                for t in range(k):
+                    S = (S >> 1) ^ gmask if S & 1 else S >> 1
+                    out[t] = (S >> idx) & 1
+
+        tempseq = np.frombuffer(bytes(out), dtype=np.uint8).astype(int)
+
+        self.state = _int2state(S, N)
+        self.outbit = tempseq[-1]
+        self.feedbackbit = self.state[0] if self.conf=='fibonacci' else self.state[-1]
+        if self.counter_start_zero and self.count == 0:
+            self._seq.clear()
+        self._seq.extend(tempseq)
+        self.count += k
+        return tempseq
+
+    def jump(self, k):
+        '''
+        Jump ahead by k cycles
+        ----------------------
+        Advance the state and count of LFSR by k cycles, without running k cycles.
+
+        Using Cayley-Hamilton theorem, for transition matrix A of LFSR with characteristic polynomial q(x),
+        state after k cycles A^k.S can be computed as sum of c_i A^i.S, for i<M, where c(x) = x^k mod q(x).
+        Which takes O(M^2 log k), instead of O(k). Output bits of skipped cycles are not added to seq.
+
+        Parameters
+        ----------
+        k : int >=0, number of cycles to skip
+
+        Example
+        -------
+        >>> L = LFSR(fpoly=[23,18])
+        >>> L.jump(10**12)
+        >>> L.count
+        1000000000000
+        '''
+        k = int(k)
+        if k < 0:
+            raise ValueError('Number of cycles k should be non-negative')
+        if k == 0:
+            return
+
+        N = len(self.state)
+        mask = _fpoly_mask(self.fpoly, self.conf)
+        if self.conf=='galois':
+            mask |= 1 << (N - 1)
+        q = _charpoly(self.fpoly, N)
+
+        # states S, A.S, A^2.S, ... A^(N-1).S
+        S = _state2int(self.state)
+        Si = [S]
+        for _ in range(N - 1):
+            Si.append(_packed_step(Si[-1], N, self.conf, mask))
+
+        # state after k-1 cycles, then the last cycle is run, to get outbit and feedbackbit
+        c = _gf2_powmod(2, k - 1, q)
+        S = 0
+        for i in range(N):
+            if (c >> i) & 1:
+                S ^= Si[i]
+
+        idx = self.seq_bit_index % N
+        outbit = (S >> idx) & 1
+        S = _packed_step(S, N, self.conf, mask)
+
+        if self.counter_start_zero and self.count == 0:
+            # initial output (-1) is not a valid output bit
+            self._seq.clear()
+        self.state = _int2state(S, N)
+        self.outbit = np.int_(outbit) if self.counter_start_zero else self.state[self.seq_bit_index]
+        self.feedbackbit = self.state[0] if self.conf=='fibonacci' else self.state[-1]
+        self.count += k
+
     @deprecated('due to misnomer, use "runFullPeriod" instead')
     def runFullCycle(self):
         '''
@@ -697,29 +1136,36 @@ class LFSR():
         temp = [self.next() for _ in range(self.expectedPeriod)]
         return self.seq
 
-    def runFullPeriod(self,verbose=False):
+    def runFullPeriod(self,verbose=False,packed=False,bitorder='big'):
         '''
-        Run a full period of cycles (T = 2^M-1) on LFSR from current state
+        Run a full period of cycles (T = get_period(), 2^M-1 for primitive feedback polynomial) on LFSR from current state
+
+        Parameters
+        ----------
+        packed: bool, default=False, if True, output sequence is packed into np.uint8 bytes, same as np.packbits
+        bitorder: str {'big','little'}, default='big', order of bits in packed bytes (see np.packbits)
+
+        For large T, use packed=True with seq_history=0, to keep memory to T/8 bytes,
+        e.g. a period of 30-bit LFSR takes 128MB.
 
         Returns
         -------
         seq : binary output sequence since start: shape = (count,)
+            if seq_history is not None, output sequence of the period: shape = (T,)
+            if packed=True, packed bytes of the same
         '''
-        if verbose:
-            self.verbose = False
-            tempseq = []
-            for i in range(self.expectedPeriod):
-                ProgBar(i,self.expectedPeriod,title=f' {self.expectedPeriod}-cycles')
-                tempseq.append(self.next())
-        else:
-            temp = [self.next() for _ in range(self.expectedPeriod)]
+        tempseq = self.runKCycle(self.get_period(), verbose=verbose, packed=packed, bitorder=bitorder)
+        if self.seq_history is not None:
+            return tempseq
+        if packed:
+            return np.packbits(self.seq, bitorder=bitorder)
         return self.seq
 
     def reset(self):
         '''
         Reseting LFSR to its initial state and count
         '''
-        self.__init__(initstate=self.initstate,fpoly=self.fpoly,counter_start_zero=self.counter_start_zero,conf=self.conf,seq_bit_index=self.seq_bit_index)
+        self.__init__(initstate=self.initstate,fpoly=self.fpoly,counter_start_zero=self.counter_start_zero,conf=self.conf,seq_bit_index=self.seq_bit_index,seq_history=self.seq_history)
 
     @deprecated('Use "set_fpoly" and "set_state" instead')
     def set(self, fpoly, state='ones', enforce=False):
@@ -754,7 +1200,7 @@ class LFSR():
                 # if change in size and order was intantional, set enforce=True
                 assert len(state)==len(self.state)
 
-        self.__init__(fpoly=fpoly, initstate=state,counter_start_zero=self.counter_start_zero,conf=self.conf,seq_bit_index=self.seq_bit_index)
+        self.__init__(fpoly=fpoly, initstate=state,counter_start_zero=self.counter_start_zero,conf=self.conf,seq_bit_index=self.seq_bit_index,seq_history=self.seq_history)
 
     @deprecated('due to inconsitancy in naming, use "set_fpoly" instead')
     def changeFpoly(self, newfpoly, reset=False,enforce=False):
@@ -793,6 +1239,7 @@ class LFSR():
     def change_conf(self,conf):
         assert conf in ['fibonacci', 'galois']
         self.conf = conf
+        self._period = None
         self.check()
 
     def set_fpoly(self, fpoly, reset=False,enforce=False):
@@ -854,6 +1301,7 @@ class LFSR():
         '''
         assert conf in ['fibonacci', 'galois']
         self.conf = conf
+        self._period = None
         self.check()
         if reset: self.reset()
 
@@ -909,18 +1357,41 @@ class LFSR():
 
         self.seq_bit_index  = bit_index
 
-    def getFullPeriod(self):
+    def set_seq_history(self,seq_history):
+        '''
+        Set length of output sequence history
+        -------------------------------------
+
+        seq_history: int or None
+             : if None, whole output sequence is retained
+             : if 0, output sequence is not retained
+             : if N>0, only last N bits of output sequence are retained
+
+        Last bits of current seq are kept as per new seq_history
+        '''
+        if seq_history is not None and (not isinstance(seq_history, (int, np.integer)) or seq_history < 0):
+            raise ValueError('seq_history should be None or a non-negative int')
+        self.seq_history = seq_history
+        self.seq = self.seq
+
+    def getFullPeriod(self,packed=False,bitorder='big'):
         '''
         Get a seq of a full period from LSFR, by executing next() method T times.
-        The current state of LFSR is used to generate T bits.
+        The current state of LFSR is used to generate T bits, T = get_period() (2^M-1 for primitive feedback polynomial).
 
         Calling this function also update the count, current state and output sequence of main LFSR object
 
+        Parameters
+        ----------
+        packed: bool, default=False, if True, output sequence is packed into np.uint8 bytes, same as np.packbits
+        bitorder: str {'big','little'}, default='big', order of bits in packed bytes (see np.packbits)
+
         Returns
         -------
         seq (T bits), binary output sequence of last T bits
+            if packed=True, shape = (ceil(T/8),)
         '''
-        seq = np.array([self.next() for _ in range(self.expectedPeriod)])
+        seq = self.runKCycle(self.get_period(), packed=packed, bitorder=bitorder)
         return seq
 
     def get_fPoly(self):
@@ -940,8 +1411,84 @@ class LFSR():
         return self.seq
 
     def get_period(self):
-        '''get period of sequence'''
-        return self.T
+        '''
+        get period of sequence, computed from current state (see compute_period) and cached,
+        cache is cleared when feedback polynomial, state or configuration is set
+
+        If period can not be computed (2^M-1 can not be factorized, and period is too large for cycle detection),
+        a warning is issued and expectedPeriod (2^M-1) is returned, use compute_period with factors in that case.
+        '''
+        if getattr(self, '_period', None) is None:
+            try:
+                self._period = self.compute_period()
+            except ValueError as e:
+                warnings.warn('%s, using expectedPeriod 2^%d-1' % (e, len(self.state)))
+                self._period = self.expectedPeriod
+        return self._period
+
+    def compute_period(self, method='poly', factors=None, max_steps=2**24):
+        '''
+        Compute actual period of LFSR from current state
+        ------------------------------------------------
+        Period is same as expectedPeriod = 2^M-1 for primitive feedback polynomial, but can be smaller otherwise,
+        and can depend on state.
+
+        Parameters
+        ----------
+        method: str {'poly', 'brent'}, default='poly'
+            'poly'  : minimal polynomial mu of current state under transition of LFSR is computed (see _state_minpoly),
+                      period is the multiplicative order of x modulo mu (without factor x^e, which is only transient,
+                      for fibonacci with extra registers), computed by factorization of mu over GF(2) (see utils._gf2_order).
+                      If factors of 2^d-1 can not be found, 'brent' is used, if possible (see max_steps).
+            'brent' : Brent's cycle detection, by running LFSR (packed) from current state, O(period).
+        factors: None, list of prime factors of 2^M-1 (M = length of LFSR), or dict {d: prime factors of 2^d-1},
+            to be used instead of computing factors (see is_primitive), for large M, with no known factorization
+        max_steps: int, default=2^24, cycle detection is used only if period, which is less than 2^d (d = degree of
+            minimal polynomial, <= M), is at most max_steps, else ValueError is raised
+
+        Returns
+        -------
+        T: int, period of state (and output sequence) of LFSR
+
+        Example
+        -------
+        >>> L = LFSR(fpoly=[4,2], initstate=[0,0,0,1])
+        >>> L.compute_period(), L.expectedPeriod
+        (6, 15)
+        '''
+        if method not in ['poly','brent']:
+            raise ValueError("method should be 'poly' or 'brent'")
+        N = len(self.state)
+        S = _state2int(self.state)
+        mask = _fpoly_mask(self.fpoly, self.conf)
+        if self.conf=='galois':
+            mask |= 1 << (N - 1)
+        mu = _state_minpoly(S, N, self.conf, mask)
+        # remove x^e, transient part
+        mu >>= (mu & -mu).bit_length() - 1
+        d = mu.bit_length() - 1
+        if factors is not None and not isinstance(factors, dict):
+            factors = {N: factors}
+        if method=='poly':
+            try:
+                return _gf2_order(mu, factors=factors)
+            except ValueError as e:
+                if 2**d > max_steps:
+                    raise ValueError('%s, and period (< 2^%d) is too large for cycle detection (max_steps=%d), '
+                                     'provide prime factors of 2^%d-1 with factors=' % (e, d, max_steps, d))
+        elif 2**d > max_steps:
+            raise ValueError('Period (< 2^%d) is too large for cycle detection (max_steps=%d), use method="poly"' % (d, max_steps))
+        # Brent's cycle detection
+        power = lam = 1
+        tortoise, hare = S, _packed_step(S, N, self.conf, mask)
+        while tortoise != hare:
+            if power == lam:
+                tortoise = hare
+                power *= 2
+                lam = 0
+            hare = _packed_step(hare, N, self.conf, mask)
+            lam += 1
+        return lam
 
     def get_expectedPeriod(self):
         '''get period of sequence'''
@@ -952,16 +1499,7 @@ class LFSR():
         return self.count
 
     def _loadFpolyList(self):
-        import os
-        fname = 'primitive_polynomials_GF2_dict.txt'
-        fname = os.path.join(os.path.dirname(__file__), fname)
-        try:
-            f = open(fname, "rb")
-            lines = f.readlines()
-            f.close()
-            self.fpolyList = eval(lines[0].decode())
-        except:
-            raise Exception("File named:'{}' Not Found!!! \n try again, after downloading file from github save it in lfsr directory".format(fname))
+        self.fpolyList = _loadFpolyList()
 
     def get_fpolyList(self,m=None):
         '''
@@ -978,11 +1516,11 @@ class LFSR():
         fpoly_list: list of polynomial if m is not None else a dictionary
 
         '''
-        self._loadFpolyList()
         if m is None:
+            self._loadFpolyList()
             return self.fpolyList
         elif type(m)== int and m > 1 and m < 32:
-            return self.fpolyList[m]
+            return [list(p) for p in _loadFpolyDegree(m)]
         else:
             print('Wrong input m. m should be int 1 < m < 32 or None')
 
@@ -1011,13 +1549,15 @@ class LFSR():
             print('Not a valid form of feedback polynomial')
 
     def test_properties(self,verbose=1):
-        p1 = self.getFullPeriod()
-        p2 = self.getFullPeriod()
+        p1 = self.runKCycle(self.expectedPeriod)
+        p2 = self.runKCycle(self.expectedPeriod)
 
         r1 = np.mean(p1==p2)==1
         r2, (N1s, N0s)   = self.balance_property(p1.copy())
         r3, runs         = self.runlength_property(p1.copy(),verbose=0)
-        r4, (shift, rxx) = self.autocorr_property(p1.copy(),plot=False)
+        # full autocorrelation function is only needed for plotting
+        lags = None if verbose>1 else np.arange(1,len(p1))
+        r4, (shift, rxx) = self.autocorr_property(p1.copy(),plot=False,lags=lags)
 
         result = bool(np.prod([r1,r2,r3,r4]))
 
@@ -1046,8 +1586,8 @@ class LFSR():
                 print(' - Rxx(k): ',rxx.round(3))
                 try:
                     import matplotlib.pyplot as plt
-                except:
-                    raise('Error loading matplotlib, either install it or set verbose<2')
+                except ImportError:
+                    raise ImportError('Error loading matplotlib, either install it or set verbose<2')
                 plt.plot(shift,rxx)
                 plt.xlabel('shift (k)')
                 plt.ylabel(r'$R_{xx}(k)$')
@@ -1086,7 +1626,8 @@ class LFSR():
         '''
         r1,(N1s,N0s) = self.balance_property(p.copy())
         r2,runs = self.runlength_property(p.copy(),verbose=0)
-        r3,(shift,rxx) = self.autocorr_property(p.copy(),plot=False)
+        lags = None if verbose>1 else np.arange(1,len(p))
+        r3,(shift,rxx) = self.autocorr_property(p.copy(),plot=False,lags=lags)
         result = bool(np.prod([r1,r2,r3]))
         if verbose:
             print('1. Balance Property')
@@ -1108,8 +1649,8 @@ class LFSR():
                 print(' - Rxx(k): ',rxx.round(3))
                 try:
                     import matplotlib.pyplot as plt
-                except:
-                    raise('Error loading matplotlib, either install it or set verbose<2')
+                except ImportError:
+                    raise ImportError('Error loading matplotlib, either install it or set verbose<2')
                 plt.plot(shift,rxx)
                 plt.xlabel('shift (k)')
                 plt.ylabel(r'$R_{xx}(k)$')
@@ -1129,6 +1670,73 @@ class LFSR():
 
         return result
 
+    def test_suite(self):
+        '''
+        Test all the properties of LFSR
+        -------------------------------
+        Single pass version of test_properties, without printing:
+            (1) Periodicity
+            (2) Balance Property
+            (3) Runlength Property
+            (4) Autocorrelation Property
+
+        T + min(M,T) bits are generated once from current state with generate_bits as packed bytes (T = 2^M-1),
+        periodicity is checked from the last min(M,T) bits, which determine the rest of the sequence,
+        and all other properties are computed on the same buffer of T bits:
+        balance by popcount of bytes, runs from transitions b^(b<<1) of bytes, unpacked chunk by chunk.
+        Autocorrelation (all T shifts with FFT, see autocorr_property) needs a ±1 sequence, so only for that
+        the buffer is unpacked.
+        LFSR itself is not changed (state, count and seq are kept).
+
+        Returns
+        -------
+        result: LFSRTestResult (namedtuple)
+            (passed, periodicity, balance, runlength, autocorr, period, N1s, N0s, runs, timings)
+
+        Example
+        -------
+        >>> L = LFSR(fpoly=[23,18])
+        >>> res = L.test_suite()
+        >>> res.passed, res.timings['total']
+        '''
+        timings = {}
+        t0 = time.perf_counter()
+        T = self.expectedPeriod
+        N = len(self.state)
+
+        t = time.perf_counter()
+        L = LFSR(fpoly=self.fpoly, initstate=self.state.copy(), conf=self.conf, seq_bit_index=self.seq_bit_index,
+                 counter_start_zero=False, seq_history=0)
+        n = min(N,T)
+        s = L.generate_bits(T + n, dtype='packed')
+        timings['generate'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        head = np.unpackbits(s[:(n + 7)//8], count=n)
+        tail = np.unpackbits(s[T//8:], count=T%8 + n)[T%8:]
+        r1 = bool(np.array_equal(head, tail))
+        timings['periodicity'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        N1s = _packed_ones(s, T)
+        N0s = T - N1s
+        r2 = N1s == N0s + 1
+        timings['balance'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        runs = _packed_runs(s, T)
+        r3 = _check_runs(runs)
+        timings['runlength'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        r4, _ = self.autocorr_property(np.unpackbits(s, count=T), plot=False, lags=np.arange(1,T))
+        timings['autocorr'] = time.perf_counter() - t
+
+        timings['total'] = time.perf_counter() - t0
+        r2, r3, r4 = bool(r2), bool(r3), bool(r4)
+        return LFSRTestResult(passed=r1 and r2 and r3 and r4, periodicity=r1, balance=r2, runlength=r3, autocorr=r4,
+                              period=T, N1s=int(N1s), N0s=int(N0s), runs=runs, timings=timings)
+
     def balance_property(self,p):
         '''
         Balance Property: In a period of LFSR with a valid feedback polynomial,
@@ -1174,49 +1782,38 @@ class LFSR():
         Returns
         -------
         result:  bool, True if seq p satisfies Run Length Property else False
-        runs: list, list of runs
+        runs: list, list of runs, runs[k] is number of runs of length k+1
+
+        Since p is a period, p is rotated so that a run does not wrap around (p[0]!=p[-1]),
+        then runs are counted from the boundaries, where p[k]!=p[k+1]
         '''
+        p = np.asarray(p)
         T = len(p)
         if verbose>1: print(p)
 
-        if len(set(p))>1:
-            while p[0]==p[-1]: p = np.roll(p,1)
+        # boundary indices, where p[k]!=p[k+1]
+        bnd = np.flatnonzero(p[1:]!=p[:-1])
+        if len(bnd) and p[0]==p[-1]:
+            # rotate right, such that the last boundary become the end of p
+            r = T-1-bnd[-1]
+            p = np.roll(p,r)
+            bnd = np.flatnonzero(p[1:]!=p[:-1])
 
         if verbose>1: print(p)
-        if p[-1]==0:
-            p = np.append(p,1)
-        else:
-            p = np.append(p,0)
-        if verbose>1: print(p)
+        # last run always ends at the end of p
+        bnd = np.r_[bnd, T-1]
 
-        i=0
-        runs = np.zeros(T).astype(int)
-        for k in range(T):
-            if p[k]==p[k+1]:
-                i=i+1
-            else:
-                runs[i]=runs[i]+1
-                i=0
+        runs = np.bincount(np.diff(bnd,prepend=-1)-1)
         if verbose>1: print(runs)
-        runs = runs[:max(np.where(runs)[0])+1]
         if verbose: print('Runs : ',runs)
 
-        l = len(runs)
-        pp=0
-        for k in range(len(runs)-2):
-            if runs[k]==2*runs[k+1]:
-                pp=pp+1
-        if runs[-2]==runs[-1]: pp=pp+1
-
-        result = False
-
-        if pp==len(runs)-1: result = True
+        result = _check_runs(runs)
         if verbose>1:
             if result: print('Pass')
             else: print('Fail')
         return result, runs
 
-    def autocorr_property(self,p,plot=False):
+    def autocorr_property(self,p,plot=False,method='fft',lags=None):
         '''
         Autocorrelation Property: For sequence of period T of LSFR with valid feedback polynomial,
         the autocorrelation is a noise like, that is, 1 with zero (or T) lag (shift), -1/T (almost zero) else.
@@ -1235,29 +1832,53 @@ class LFSR():
         plot: bool (default False), if True, it will plot the autocorrelation function,
             which will require matplotlib library. Turn it of if matplotlib is not installed
 
+        method: str {'fft','direct'}, default='fft'
+            'fft'    - periodic autocorrelation of all the shifts at once, with FFT of ±1 sequence, O(T log(T))
+                       match - mismatch is an integer, which is recovered exactly by rounding
+            'direct' - for each shift, compare p with rotated p, O(T) per shift, useful with few lags
+            for a non-binary p, 'direct' is used
+
+        lags: None or array-like of int, default=None
+            if None, all 2T+1 shifts, as np.roll(p,k) for k=0...2T, are computed
+            else only given shifts k are computed, e.g. lags=range(1,T) is enough to test the property
+
         Returns
         -------
         result: bool, True if seq p satisfies Autocorrelation Property else False
+            with lags, True if all the given shifts k (k%T!=0) have -1/T
         (shift, rxx): tuple of sequence of shift corresponding autocorrelation values
+            with lags, shift = lags
         '''
+        p = np.asarray(p)
         T = len(p)
-        px = p.copy()
-        rxx = np.zeros(2*T+1)
-        for k in range(2*T+1):
-            py = np.roll(p.copy(),k)
-            r = px==py
-            rxx[k] = (np.sum(r==1) - np.sum(r==0))/T
+        K = np.arange(2*T+1) if lags is None else np.asarray(lags, dtype=np.int64).reshape(-1)
+
+        if method not in ['fft','direct']:
+            raise ValueError("method should be 'fft' or 'direct'")
+        if method=='fft' and T>0 and p.min()>=0 and p.max()<=1:
+            X = np.fft.rfft(1.0 - 2.0*p)
+            cxx = np.round(np.fft.irfft(X.real**2 + X.imag**2, n=T)).astype(np.int64)
+            rxx = cxx[K % T]/T
+        else:
+            rxx = np.zeros(len(K))
+            for i,k in enumerate(K):
+                r = p==np.roll(p,k)
+                rxx[i] = (np.sum(r==1) - np.sum(r==0))/T
 
         result = False
-        if np.prod(np.isclose(rxx[1:T],-1/T)):
-            result = True
-
-        shift = np.arange(-T,T+1)
+        if lags is None:
+            if np.prod(np.isclose(rxx[1:T],-1/T)):
+                result = True
+            shift = np.arange(-T,T+1)
+        else:
+            if np.prod(np.isclose(rxx[K % T != 0],-1/T)):
+                result = True
+            shift = K
         if plot:
             try:
                 import matplotlib.pyplot as plt
-            except:
-                raise('Error loading matplotlib, either install it or set plot=False')
+            except ImportError:
+                raise ImportError('Error loading matplotlib, either install it or set plot=False')
             plt.plot(shift,rxx)
             plt.xlabel('shift (k)')
             plt.ylabel(r'$R_{xx}(k)$')
@@ -1269,7 +1890,7 @@ class LFSR():
         return result, (shift,rxx)
 
     def getSeq(self):
-        return ''.join(self.seq.copy().astype(str))
+        return _bits2str(self.seq)
     def getState(self):
         return ''.join(self.state.copy().astype(str))
 
@@ -1305,10 +1926,365 @@ class LFSR():
              title_loc=title_loc,box_color=box_color,alpha=alpha,output_arrow_color=output_arrow_color,output_arrow_style=output_arrow_style)
         #PlotLFSR(state,fpoly,seq=seq,ob=outbit,fb=feedbit,fs=fs,ax=ax,show_labels=show_labels,title=title,title_loc=title_loc,
         #         box_color=box_color,alpha=alpha)
-        if  show: plt.show()
+        if  show:
+            import matplotlib.pyplot as plt
+            plt.show()
+
+
+class LFSRBank():
+    '''
+    Bank of LFSRs, clocked in lockstep
+    ----------------------------------
+    N LFSRs (of same length M) with different initial states and/or feedback polynomials,
+    held as (N, M) state matrix, and all of them are clocked together with one vectorized step.
+    Each register follows exactly same semantics as LFSR.next().
+
+    class LFSRBank(fpoly=[5,2], initstate='random', n=None, conf='fibonacci', seq_bit_index=-1, counter_start_zero=True)
+
+    Parameters
+    ----------
+    fpoly : list, e.g. [5,2], same feedback polynomial for all the registers,
+          : or list of N lists, e.g. [[5,2],[5,3],[5,4,3,2]], one for each register
+    initstate : (N, M) binary np.array, each row as initial state of a register,
+          : or str 'ones' or 'random', in which case n is required, and M is max degree of fpoly
+    n  : int, number of registers, required only if initstate is str
+    conf: str {'fibonacci', 'galois'}, default conf='fibonacci', configuration of all the registers
+    seq_bit_index: int, index of register for output sequence, default=-1 (see LFSR)
+    counter_start_zero: bool (default = True), (see LFSR)
+
+    Attributes
+    ----------
+    state : (N, M) np.uint8 array, current states
+    outbit : (N,) array, current output bits, -1 if no cycle has been excecuted and counter_start_zero is True
+    feedbackbit: (N,) array, current feedback bits
+    count : int
+
+    Methods
+    -------
+    next()       : run one cycle on all the registers, returns outbits, shape (N,)
+    runKCycle(k) : run k cycles, returns output block, shape (N, k)
+    reset(i=None): reset all the registers (or i-th register) to initial states
+    set_state(i, state) : set current state of i-th register
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> from pylfsr import LFSRBank
+    >>> B = LFSRBank(fpoly=[5,2], initstate='random', n=1000)
+    >>> B.state.shape
+    (1000, 5)
+    >>> seqs = B.runKCycle(100)
+    >>> seqs.shape
+    (1000, 100)
+    '''
+    def __init__(self, fpoly=[5, 2], initstate='random', n=None, conf='fibonacci', seq_bit_index=-1, counter_start_zero=True):
+        if len(fpoly) and isinstance(fpoly[0], (list, tuple, np.ndarray)):
+            self.fpoly = [sorted([int(f) for f in fp], reverse=True) for fp in fpoly]
+        else:
+            self.fpoly = sorted([int(f) for f in fpoly], reverse=True)
+        fpolys = self.fpoly if isinstance(self.fpoly[0], list) else [self.fpoly]
+        M = max([fp[0] for fp in fpolys])
+
+        if isinstance(initstate, str):
+            if n is None:
+                n = len(fpolys)
+            if initstate == 'ones':
+                initstate = np.ones([n, M])
+            elif initstate == 'random' or initstate == 'rand':
+                initstate = np.random.randint(0, 2, [n, M])
+                # all zeros state is not allowed
+                zero = initstate.sum(1)==0
+                while zero.any():
+                    initstate[zero] = np.random.randint(0, 2, [zero.sum(), M])
+                    zero = initstate.sum(1)==0
+            else:
+                raise ValueError('Unknown initial state')
+        initstate = np.array(initstate)
+        if initstate.ndim == 1:
+            initstate = initstate[None, :]
+
+        self.initstate = initstate
+        self.conf = conf
+        self.seq_bit_index = seq_bit_index
+        self.counter_start_zero = counter_start_zero
+        self.N, self.M = initstate.shape
+        self.check()
+
+        # Tap masks, as (M,) or (N, M) uint8 array
+        taps = np.zeros([len(fpolys), self.M], dtype=np.uint8)
+        for i, fp in enumerate(fpolys):
+            fp = fp if conf=='fibonacci' else fp[1:]
+            taps[i, np.array(fp, dtype=int) - 1] = 1
+        self._taps = taps[0] if len(fpolys)==1 else taps
+        self.reset()
+
+    def check(self):
+        '''
+        Check if feedback polynomials, initial states, configuration and output sequence bit index are valid
+        '''
+        fpolys = self.fpoly if isinstance(self.fpoly[0], list) else [self.fpoly]
+        for fp in fpolys:
+            if fp[0] > self.M or fp[-1] < 1 or len(fp) < 2:
+                raise ValueError('Invalid feedback polynomial: Order of feedback polynomial can not be less than 2 or greater than length of state vector. \n Polynomial also can not have negative or zeros powers')
+            if len(set(fp))!=len(fp):
+                raise ValueError('Invalid feedback polynomial: feedback polynomial vector should have unique powers')
+            if self.conf=='galois' and fp[0]!=self.M:
+                raise ValueError('Wrong length of state vector for Galois configuration. For Galois configuration, length of state vector should be same as order of feedback polynomial ')
+        if len(fpolys) not in [1, self.N]:
+            raise ValueError('Number of feedback polynomials should be 1 or same as number of registers')
+
+        if self.initstate.ndim != 2:
+            raise ValueError('Invalid Initial state: should be (N, M) array')
+        if np.sum(self.initstate==1)+np.sum(self.initstate==0) != self.initstate.size:
+            raise ValueError('Invalid Initial state vector: Initial state vector should be binary, i.e., 0s and 1s')
+        if np.any(np.sum(self.initstate, axis=1)==0):
+            raise ValueError('Invalid Initial state vector: Initial state vector can not be All Zeros')
+
+        if self.conf not in ['fibonacci','galois']:
+            raise ValueError('Not valid configuration, "conf" should be either "fibonacci" or "galois"')
+
+        if self.seq_bit_index not in list(range(-self.M, self.M)):
+            raise IndexError('Output sequence can be taken from one of the register only [%d,%d), index = %d provided: Out of bounds index' % (-self.M, self.M, self.seq_bit_index))
+
+    def reset(self, i=None):
+        '''
+        Reseting all the registers to initial states and count
+
+        Parameters
+        ----------
+        i: None, int or array of indices (default=None)
+            if None, all the registers and count are reset,
+            else only i-th register(s) are reset to initial state, count is common to all registers and kept
+        '''
+        if i is None:
+            self.state = self.initstate.astype(np.uint8)
+            self.count = 0 if self.counter_start_zero else 1
+            if self.counter_start_zero:
+                self.outbit = -np.ones(self.N, dtype=int)
+                self.feedbackbit = -np.ones(self.N, dtype=int)
+            else:
+                self.outbit = self.state[:, self.seq_bit_index].astype(int)
+                self.feedbackbit = self.state[:, self.seq_bit_index].astype(int)
+            return
+        self.state[i] = self.initstate[i]
+        self._init_bits(i)
+
+    def _init_bits(self, i):
+        # output and feedback bits of i-th register(s) as of its initial state, in new arrays,
+        # so arrays returned by earlier next() are not changed
+        self.outbit = self.outbit.copy()
+        self.feedbackbit = self.feedbackbit.copy()
+        if self.counter_start_zero:
+            self.outbit[i] = -1
+            self.feedbackbit[i] = -1
+        else:
+            self.outbit[i] = self.state[i, self.seq_bit_index]
+            self.feedbackbit[i] = self.state[i, self.seq_bit_index]
+
+    def set_state(self, i, state, return_state=False):
+        '''
+        Set current state of i-th register
+        ----------------------------------
+        Same as LFSR.set_state for one register of the bank, other registers are not changed.
+        Output and feedback bits of i-th register are set as of initial state (as by reset(i)), count is kept.
+
+        Parameters
+        ----------
+        i: int, index of register
+        state: str, list or np.array
+             : if str state='ones' or state='random'
+             : if list or np.array, it should be binary with length M
+        return_state: bool, if True, return state vector. Useful when state='random' is passed
+
+        '''
+        if isinstance(state, str):
+            if state == 'ones':
+                state = np.ones(self.M)
+            elif state == 'random':
+                state = np.random.randint(0, 2, self.M)
+                while not state.any():
+                    state = np.random.randint(0, 2, self.M)
+            else:
+                raise ValueError('Unknown state: only ones or random is allowed')
+        state = np.asarray(state)
+        if state.shape != (self.M,):
+            raise ValueError('Invalid state vector: length of state vector should be %d' % self.M)
+        if np.sum(state==1)+np.sum(state==0) != state.size:
+            raise ValueError('Invalid state vector: state vector should be binary, i.e., 0s and 1s')
+        if not state.any():
+            raise ValueError('Invalid state vector: state vector can not be All Zeros')
+        self.state[i] = state
+        self._init_bits(i)
+        if return_state: return self.state[i].copy()
+
+    def _step(self):
+        state = self.state
+        if self.conf=='fibonacci':
+            fb = (np.sum(state & self._taps, axis=1) & 1).astype(np.uint8)
+            state[:, 1:] = state[:, :-1]
+            state[:, 0] = fb
+        else:
+            fb = state[:, 0].copy()
+            state[:, :-1] = state[:, 1:]
+            state[:, -1] = fb
+            state ^= fb[:, None] & self._taps
+        return fb
+
+    def next(self):
+        '''
+        Run one cycle on all the registers and update the count, states, feedback bits and output bits
+
+        Returns
+        -------
+        outbit : shape (N,), output bits
+        '''
+        if self.counter_start_zero:
+            outbit = self.state[:, self.seq_bit_index].astype(int)
+        fb = self._step()
+        if not self.counter_start_zero:
+            outbit = self.state[:, self.seq_bit_index].astype(int)
+        self.outbit = outbit
+        self.feedbackbit = fb.astype(int)
+        self.count += 1
+        return self.outbit
+
+    def runKCycle(self, k):
+        '''
+        Run k cycles on all the registers
+
+        Parameters
+        ----------
+        k : int
+
+        Returns
+        -------
+        tempseq : shape =(N, k), output binary sequences of k cycles, one row for each register
+        '''
+        tempseq = np.empty([self.N, k], dtype=int)
+        for i in range(k):
+            tempseq[:, i] = self.next()
+        return tempseq
+
+    def getState(self, i):
+        '''get current state of i-th register as str'''
+        return ''.join(self.state[i].astype(str))
+
+
+def _generate_chunk(args):
+    '''
+    Worker of generate_parallel: generate n bits, starting from cycle 'start' of LFSR
+
+    If target is given, chunk is written directly at offset i of target, instead of returning it,
+    target = ('shm', name) for shared memory block, or ('npy', fname) for memory-mapped .npy file
+    '''
+    fpoly, state, conf, seq_bit_index, counter_start_zero, start, n, i, target = args
+    L = LFSR(fpoly=list(fpoly), initstate=state, conf=conf, seq_bit_index=seq_bit_index,
+             counter_start_zero=counter_start_zero, seq_history=0)
+    L.jump(start)
+    chunk = L.generate_bits(n)
+    if target is None:
+        return chunk
+    if target[0] == 'shm':
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(name=target[1])
+        np.ndarray((n,), dtype=np.uint8, buffer=shm.buf, offset=i)[:] = chunk
+        shm.close()
+    else:
+        seq = np.load(target[1], mmap_mode='r+')
+        seq[i:i + n] = chunk
+        seq.flush()
+        del seq
+    return n
+
+def generate_parallel(k, fpoly=[5, 2], initstate='ones', conf='fibonacci', seq_bit_index=-1, counter_start_zero=True,
+                      start=0, n_jobs=None, chunk_size=None, fname=None, verbose=False):
+    '''
+    Generate output sequence of k cycles of LFSR in parallel
+    --------------------------------------------------------
+    Range of cycles [start, start+k) is split into chunks, for each chunk, a worker process creates an LFSR,
+    jumps to the starting cycle of the chunk (see LFSR.jump) and generates the chunk. Chunks are written by workers
+    directly into one contiguous shared memory block (or .npy file), which is exactly same as the output of
+    LFSR(...).runKCycle(start+k)[start:].
+
+    Parameters
+    ----------
+    k : int, number of cycles (bits) to generate
+    fpoly, initstate, conf, seq_bit_index, counter_start_zero: same as for LFSR
+        if initstate='random', it is initialized once, so that all the chunks are from same sequence
+    start: int, default=0, first cycle of range to generate
+    n_jobs: int or None, number of worker processes, if None, number of CPUs. If 1, chunks are generated
+        in current process
+    chunk_size: int or None, number of bits in each chunk, if None, k is split equally to n_jobs chunks,
+        (upto 2^24 bits per chunk if fname is given)
+    fname: str or None, if given, output is written in .npy file (np.uint8) through memory-map, and returned as np.memmap
+    verbose: bool, if True, show progress bar of chunks
+
+    Returns
+    -------
+    seq: shape (k,), np.uint8 array (or np.memmap if fname is given)
+
+    Example
+    -------
+    >>> from pylfsr import generate_parallel, LFSR
+    >>> seq = generate_parallel(10**8, fpoly=[32,22,2,1], n_jobs=4)
+    >>> seq2 = generate_parallel(10**8, fpoly=[32,22,2,1], n_jobs=4, fname='lfsr32.npy')
+    '''
+    import os
+    L = LFSR(fpoly=list(fpoly), initstate=initstate, conf=conf, seq_bit_index=seq_bit_index,
+             counter_start_zero=counter_start_zero, seq_history=0)
+    state = L.state.copy()
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = -(-k // n_jobs) if k else 1
+        if fname is not None:
+            chunk_size = min(chunk_size, 2**24)
+    chunk_size = max(int(chunk_size), 1)
+
+    if fname is None:
+        seq = np.empty(k, dtype=np.uint8)
+    else:
+        seq = np.lib.format.open_memmap(fname, mode='w+', dtype=np.uint8, shape=(k,))
+
+    offsets = list(range(0, k, chunk_size))
+    tasks = [(L.fpoly, state, conf, seq_bit_index, counter_start_zero, start + i, min(chunk_size, k - i), i) for i in offsets]
+
+    if n_jobs == 1 or len(tasks) < 2:
+        for j, task in enumerate(tasks):
+            i, n = task[-1], task[-2]
+            seq[i:i + n] = _generate_chunk(task + (None,))
+            if verbose: progbar(j, len(tasks), title=' chunks')
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        shm = None
+        if fname is None:
+            from multiprocessing import shared_memory
+            shm = shared_memory.SharedMemory(create=True, size=k)
+            target = ('shm', shm.name)
+        else:
+            seq.flush()
+            target = ('npy', fname)
+        try:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(_generate_chunk, task + (target,)) for task in tasks]
+                for j, future in enumerate(as_completed(futures)):
+                    future.result()
+                    if verbose: progbar(j, len(tasks), title=' chunks')
+            if shm is not None:
+                seq[:] = np.ndarray((k,), dtype=np.uint8, buffer=shm.buf)
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    if fname is not None:
+        seq.flush()
+    return seq
 
 
 def drawR(ax,x=0,y=0,s=1,alpha=0.5,color='lightblue',linewidth=1, edgecolor='k',):
+    import matplotlib.patches as patches
     rect = patches.Rectangle((x-s/2, y-s/2), s, s, linewidth=linewidth, edgecolor=edgecolor, facecolor=color,alpha=alpha)
     ax.add_patch(rect)
 
@@ -1330,6 +2306,7 @@ def PlotLFSR(state,fpoly,conf='fibonacci',seq='',ob=None,fb=None,fs=25,ax=None,s
     title_loc, alignment of title, 'left', 'right', 'center', (default 'left')
     box_color: color of register box, default='lightblue'
     '''
+    import matplotlib.pyplot as plt
     M = len(state)
     ym = 3.5
     if ax is None:
@@ -1408,6 +2385,7 @@ def dispLFSR(state,fpoly,conf='fibonacci',seq='',out_bit_index=-1,
     title_loc, alignment of title, 'left', 'right', 'center', (default 'left')
     box_color: color of register box, default='lightblue'
     '''
+    import matplotlib.pyplot as plt
     M = len(state)
     ym = 3.5
 
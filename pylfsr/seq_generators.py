@@ -25,9 +25,233 @@ if sys.version_info[:2] < (3, 3):
 
 from .pylfsr import LFSR
 from .pylfsr import *
-from .utils import deprecated, progbar
+from .pylfsr import _state2int, _cell_sequence
+from .utils import deprecated, progbar, _SeqMixin, _bits2str
 
-class A5_1():
+# A5/1 registers: feedback polynomials and clocking bits (state index) of R1, R2, R3
+_A5_1_FPOLY = ([19, 18, 17, 14], [22, 21], [23, 22, 21, 8])
+_A5_1_CBITS = (8, 10, 10)
+
+# registers clocked (R1,R2,R3) for clocking bits (c1,c2,c3) as index c1<<2 | c2<<1 | c3, by majority rule
+_A5_1_CLK = [[int(c == (((i >> 2) & 1) + ((i >> 1) & 1) + (i & 1) > 1)) for c in ((i >> 2) & 1, (i >> 1) & 1, i & 1)]
+             for i in range(8)]
+
+def _a5_1_run(S, N, fpolys, k, clock_first=True):
+    '''
+    Run k cycles of A5/1 with packed registers (i-th bit as state[i])
+    ----------------------------------------------------------------
+    When clocked, each register follows its own LFSR sequence, so state[i] of a register after n clocks is
+    w[n + N-1-i], where w is the sequence of its last register (computed in blocks, see _cell_sequence).
+    Cycle by cycle, only the number of clocks of each register (n1,n2,n3) is updated, from clocking bits looked up
+    in w, and output bits w1[n1]^w2[n2]^w3[n3] are then gathered at once.
+
+    Parameters
+    ----------
+    S: (S1,S2,S3), packed states of R1, R2, R3
+    N: (N1,N2,N3), lengths of registers
+    fpolys: feedback polynomials (fibonacci) of registers
+    k: int, number of cycles
+    clock_first: bool, if False, first output bit is taken before clocking (first cycle of A5_1)
+
+    Returns
+    -------
+    out: np.uint8 array of k output bits
+    n: (n1,n2,n3), number of times each register is clocked
+    '''
+    ws = [_cell_sequence(Sk, Nk, 'fibonacci', fk, k + Nk, cell=Nk - 1) for Sk, Nk, fk in zip(S, N, fpolys)]
+    w1, w2, w3 = [w.tobytes() for w in ws]
+    o1, o2, o3 = [Nk - 1 - b for Nk, b in zip(N, _A5_1_CBITS)]
+    D = [bytes(d[r] for d in _A5_1_CLK) for r in range(3)]
+    D1, D2, D3 = D
+    clk = bytearray(k)
+    n1 = n2 = n3 = 0
+    for t in range(0 if clock_first else 1, k):
+        i = (w1[n1 + o1] << 2) | (w2[n2 + o2] << 1) | w3[n3 + o3]
+        clk[t] = i
+        n1 += D1[i]
+        n2 += D2[i]
+        n3 += D3[i]
+    clk = np.frombuffer(bytes(clk), dtype=np.uint8)
+    out = np.zeros(k, dtype=np.uint8)
+    for w, Dr in zip(ws, D):
+        inc = np.frombuffer(Dr, dtype=np.uint8)[clk]
+        if not clock_first and k:
+            inc[0] = 0
+        np.bitwise_xor(out, w[np.cumsum(inc)], out=out)
+    return out, (n1, n2, n3)
+
+def _a5_1_keybits(keys):
+    '''
+    Keys of A5/1 (initial states of R1,R2,R3 concatenated, 19+22+23 bits) as np.uint8 array of shape (n_keys, 64)
+    '''
+    if isinstance(keys, np.ndarray) and keys.ndim == 2:
+        kbits = keys.astype(np.uint8)
+    else:
+        kbits = np.array([[int(b) for b in key] if isinstance(key, str) else np.asarray(key, dtype=np.uint8)
+                          for key in keys], dtype=np.uint8)
+    if kbits.ndim != 2 or kbits.shape[1] != 64:
+        raise ValueError('Each key should have 64 bits (19+22+23), got shape %s' % (kbits.shape,))
+    return kbits
+
+def _a5_1_unslice(words, n):
+    '''
+    List of k ints of n lanes (j-th bit for j-th lane) as np.uint8 array (n, k)
+    '''
+    nb = (n + 7)//8
+    buf = b''.join(w.to_bytes(nb, 'little') for w in words)
+    bits = np.unpackbits(np.frombuffer(buf, dtype=np.uint8).reshape(len(words), nb), axis=1, bitorder='little')
+    return np.ascontiguousarray(bits[:, :n].T)
+
+class _A5_1Sliced():
+    '''
+    Bit-sliced A5/1 registers of n lanes (independent keys)
+
+    Each register of N bits is an int of N rows of n bits, row i (bits i*n to (i+1)*n-1) is state[i] of all lanes,
+    so clocking (shift by a row, feedback into row 0) of selected lanes is a few bitwise operations on the int.
+
+    kbits: binary array (n, 64), initial states of R1,R2,R3 concatenated for each lane, if None, all zeros
+    '''
+    def __init__(self, n, kbits=None):
+        self.n = n
+        self.full = (1 << n) - 1
+        self.N = [fpoly[0] for fpoly in _A5_1_FPOLY]
+        self.all = [(1 << (Nk*n)) - 1 for Nk in self.N]
+        if kbits is None:
+            self.R = [0, 0, 0]
+        else:
+            idx = np.cumsum([0] + self.N)
+            self.R = [self._pack(kbits[:, a:b].T) for a, b in zip(idx[:-1], idx[1:])]
+
+    @staticmethod
+    def _pack(rows):
+        return int.from_bytes(np.packbits(rows.reshape(-1), bitorder='little').tobytes(), 'little')
+
+    def spread(self, m, r):
+        '''lanes mask m (int of n bits) repeated in all rows of register r'''
+        rows = 1
+        while rows < self.N[r]:
+            m |= m << (rows*self.n)
+            rows *= 2
+        return m & self.all[r]
+
+    def row(self, r, i):
+        '''state[i] of register r of all lanes, as int'''
+        return (self.R[r] >> (i*self.n)) & self.full
+
+    def clock(self, maj=True, xbits=None):
+        '''
+        One cycle: registers are clocked by majority rule (each lane separately) if maj, else all are clocked.
+        xbits: None or int (of lanes), xored into state[0] of each register after clocking (key/frame loading)
+        '''
+        n, full = self.n, self.full
+        if maj:
+            c1, c2, c3 = [self.row(r, b) for r, b in enumerate(_A5_1_CBITS)]
+            m = (c1 & c2) | (c1 & c3) | (c2 & c3)
+            masks = [~(c ^ m) & full for c in (c1, c2, c3)]
+        else:
+            masks = None
+        for r, fpoly in enumerate(_A5_1_FPOLY):
+            Rk = self.R[r]
+            fb = 0
+            for f in fpoly:
+                fb ^= Rk >> ((f - 1)*n)
+            shifted = ((Rk << n) & self.all[r]) | (fb & full)
+            Rk = shifted if masks is None else Rk ^ ((Rk ^ shifted) & self.spread(masks[r], r))
+            if xbits is not None:
+                Rk ^= xbits
+            self.R[r] = Rk
+
+    def outbit(self):
+        '''output bit (xor of last registers) of all lanes, as int'''
+        return self.row(0, 18) ^ self.row(1, 21) ^ self.row(2, 22)
+
+def _gsm_keybits(key):
+    '''
+    64-bit session key Kc as np.uint8 array of bits, bit i = (key[i/8] >> (i&7)) & 1 (key loading order of GSM)
+
+    key: 8 bytes, hex str of 16 digits, int (key[0] as most significant byte) or 64 bits (in loading order)
+    '''
+    if isinstance(key, (bytes, bytearray)):
+        kbytes = bytes(key)
+    elif isinstance(key, str) and len(key) == 16:
+        kbytes = bytes.fromhex(key)
+    elif isinstance(key, (int, np.integer)) and not isinstance(key, bool):
+        kbytes = int(key).to_bytes(8, 'big')
+    else:
+        kbits = np.array([int(b) for b in key], dtype=np.uint8)
+        if kbits.shape != (64,):
+            raise ValueError('key should be 64 bits, got %d' % len(kbits))
+        return kbits
+    if len(kbytes) != 8:
+        raise ValueError('key should be 8 bytes, got %d' % len(kbytes))
+    return np.unpackbits(np.frombuffer(kbytes, dtype=np.uint8), bitorder='little')
+
+def _a5_1_gsm_setup(key, frames):
+    '''
+    GSM initialization of A5/1 for session key and frame numbers (one lane per frame), as _A5_1Sliced
+
+    Registers are zeroed, then for 64 key bits and 22 frame bits, all registers are clocked and the bit is xored
+    into state[0] of each register, then registers are clocked 100 times by majority rule (output discarded).
+    Key loading is same for all frames, so it is done once and copied to all lanes.
+    '''
+    frames = np.atleast_1d(np.asarray(frames, dtype=np.int64))
+    if frames.ndim != 1 or np.any(frames < 0) or np.any(frames >= 1 << 22):
+        raise ValueError('frame number should be 22-bit int (0 <= frame < 2^22)')
+    kbits = _gsm_keybits(key)
+    A5 = _A5_1Sliced(1)
+    for b in kbits:
+        A5.clock(maj=False, xbits=int(b))
+    state = [(Rk >> i) & 1 for Rk, Nk in zip(A5.R, A5.N) for i in range(Nk)]
+    A5n = _A5_1Sliced(len(frames), np.tile(np.array(state, dtype=np.uint8), (len(frames), 1)))
+    for i in range(22):
+        fbits = ((frames >> i) & 1).astype(np.uint8)
+        A5n.clock(maj=False, xbits=_A5_1Sliced._pack(fbits))
+    for _ in range(100):
+        A5n.clock()
+    return A5n
+
+def a5_1_keystream(keys, k, packed=False, bitorder='big'):
+    '''
+    A5/1 output sequence of many keys in parallel (bit-sliced)
+    ----------------------------------------------------------
+    Bit i of registers of all keys is kept in a single word (j-th bit for j-th key), e.g. 64 keys in a 64-bit word,
+    and all words of a register in a single int (see _A5_1Sliced), so one cycle of A5/1 (majority clocking of
+    R1,R2,R3) for all keys is a few bitwise operations. Output of each key is same as A5_1(key=key).runKCycle(k)
+
+    Parameters
+    ----------
+    keys: list of keys, each as binary str of 64 bits, list or array (initial states of R1,R2,R3 concatenated, as A5_1 key),
+        or 2D binary array of shape (n_keys, 64)
+    k: int, number of output bits of each key
+    packed: bool, default=False, if True, output bits are packed into np.uint8 bytes, same as np.packbits
+    bitorder: str {'big','little'}, default='big', order of bits in packed bytes (see np.packbits)
+
+    Returns
+    -------
+    seq: np.uint8 array of shape (n_keys, k), output sequence of each key,
+        if packed=True, shape = (n_keys, ceil(k/8))
+
+    Example
+    -------
+    >>> keys = np.random.randint(0,2,(64,64))
+    >>> seq = a5_1_keystream(keys, 1000)
+    >>> np.array_equal(seq[5], A5_1(key=keys[5]).runKCycle(1000))
+    True
+    '''
+    kbits = _a5_1_keybits(keys)
+    n = kbits.shape[0]
+    A5 = _A5_1Sliced(n, kbits)
+    words = []
+    for t in range(k):
+        if t:
+            A5.clock()
+        words.append(A5.outbit())
+    seq = _a5_1_unslice(words, n) if k > 0 else np.zeros([n, 0], dtype=np.uint8)
+    if packed:
+        return np.packbits(seq, axis=1, bitorder=bitorder)
+    return seq
+
+class A5_1(_SeqMixin):
 	'''
 	A5/1 GSM Stream Cipher
 	----------------------
@@ -62,12 +286,21 @@ class A5_1():
 	A5.runKCycle(1000)
 	A5.getSeq()
 
+	# GSM: session key and frame number loading, and keystream of many frames at once
+	A5 = A5_1.from_key_frame(key='1223456789ABCDEF', frame=0x134)
+	bursts = A5_1.gsm_bursts(key='1223456789ABCDEF', frames=np.arange(1000))
+
+	seq_history: int or None, default=None, number of last output bits retained in seq (of A5/1 and of R1, R2, R3)
+	   : if None, whole output sequence is retained, if 0, none, if N>0, only last N bits
+	   : check LFSR doc for details
+
 	'''
-	def __init__(self,key='random',k1='ones',k2='random',k3='ones',counter_start_zero=True):
+	def __init__(self,key='random',k1='ones',k2='random',k3='ones',counter_start_zero=True,seq_history=None):
 
 	    self.M1,self.M2,self.M3 =19,22,23
 	    self.M = self.M1+self.M2+self.M3
 	    self.counter_start_zero = counter_start_zero
+	    self.seq_history = seq_history
 
 
 	    if key is not None:
@@ -91,9 +324,9 @@ class A5_1():
 	        self.key = ''.join([''.join(k.copy().astype(str)) for k in [self.k1, self.k2, self.k3]])
 
 
-	    self.R1 = LFSR(initstate=self.k1, fpoly = [19,18,17,14],counter_start_zero=counter_start_zero)
-	    self.R2 = LFSR(initstate=self.k2, fpoly = [22,21],counter_start_zero=counter_start_zero)
-	    self.R3 = LFSR(initstate=self.k3, fpoly = [23,22,21,8],counter_start_zero=counter_start_zero)
+	    self.R1 = LFSR(initstate=self.k1, fpoly = [19,18,17,14],counter_start_zero=counter_start_zero,seq_history=seq_history)
+	    self.R2 = LFSR(initstate=self.k2, fpoly = [22,21],counter_start_zero=counter_start_zero,seq_history=seq_history)
+	    self.R3 = LFSR(initstate=self.k3, fpoly = [23,22,21,8],counter_start_zero=counter_start_zero,seq_history=seq_history)
 	    self.state = np.r_[self.R1.state, self.R2.state,self.R3.state]
 
 	    # clocking bits
@@ -108,6 +341,7 @@ class A5_1():
 
 
 
+
 	def key_frmt(self,n,ktype):
 		if isinstance(ktype, str):
 		    if ktype == 'ones':
@@ -125,6 +359,78 @@ class A5_1():
 		else:
 		    raise Exception('Unknown key type one of [binary string, list, np.array]')
 
+	@classmethod
+	def from_key_frame(cls, key, frame, counter_start_zero=True, seq_history=None):
+	    '''
+	    A5/1 initialized with GSM session key and frame number
+	    ------------------------------------------------------
+	    Instead of loading key directly as content of R1,R2,R3, registers are zeroed, then 64 key bits and 22 frame bits
+	    are loaded (all registers clocked, and bit xored into state[0] of each register), and registers are clocked
+	    100 times by majority rule (output discarded). Output sequence (next(), runKCycle) is then the keystream of
+	    the frame, first 114 bits for A->B direction and next 114 bits for B->A (see gsm_bursts).
+
+	    Parameters
+	    ----------
+	    key: 64-bit session key Kc, as 8 bytes, hex str of 16 digits, int (key[0] as most significant byte),
+	        or 64 bits in loading order (bit i = (key[i/8] >> (i&7)) & 1)
+	    frame: int, 22-bit frame number
+	    counter_start_zero, seq_history: see A5_1
+
+	    Returns
+	    -------
+	    A5: A5_1 object, with attribute 'frame', and 'key' as initial content of R1,R2,R3
+
+	    Example
+	    -------
+	    >>> A5 = A5_1.from_key_frame('1223456789ABCDEF', 0x134)
+	    >>> np.packbits(A5.runKCycle(114)).tobytes().hex().upper()
+	    '534EAA582FE8151AB6E1855A728C00'
+	    '''
+	    A5n = _a5_1_gsm_setup(key, [frame])
+	    # first next() of A5_1 gives output without clocking, while each keystream bit is taken after clocking
+	    A5n.clock()
+	    state = np.array([A5n.row(r, i) for r, Nk in enumerate(A5n.N) for i in range(Nk)], dtype=int)
+	    A5 = cls(key=state, counter_start_zero=counter_start_zero, seq_history=seq_history)
+	    A5.frame = int(frame)
+	    return A5
+
+	@staticmethod
+	def gsm_bursts(key, frames, split=True):
+	    '''
+	    GSM keystream of 228 bits for each of many frames with same session key (bit-sliced)
+	    ------------------------------------------------------------------------------------
+	    All frames are initialized and run in parallel, one frame per lane (see a5_1_keystream), and key loading,
+	    same for all frames, is done once. Keystream of each frame is same as of A5_1.from_key_frame(key, frame).
+
+	    Parameters
+	    ----------
+	    key: 64-bit session key Kc (see from_key_frame)
+	    frames: int or list/array of 22-bit frame numbers
+	    split: bool, default=True, if True, 114-bit bursts of A->B and B->A are packed separately (each in 15 bytes,
+	        last 6 bits zero), else 228 bits are packed together in 29 bytes
+
+	    Returns
+	    -------
+	    bursts: np.uint8 array of shape (n_frames, 2, 15), packed bits (as np.packbits, most significant bit first),
+	        if split=False, shape = (n_frames, 29)
+
+	    Example
+	    -------
+	    >>> bursts = A5_1.gsm_bursts('1223456789ABCDEF', [0x134, 0x135])
+	    >>> bursts[0,1].tobytes().hex().upper()
+	    '24FD35A35D5FB6526D32F906DF1AC0'
+	    '''
+	    A5n = _a5_1_gsm_setup(key, frames)
+	    n = A5n.n
+	    words = []
+	    for _ in range(228):
+	        A5n.clock()
+	        words.append(A5n.outbit())
+	    bits = _a5_1_unslice(words, n)
+	    if split:
+	        return np.packbits(bits.reshape(n, 2, 114), axis=-1)
+	    return np.packbits(bits, axis=1)
+
 	def next(self):
 		'''
 		#TODO check the output sequence
@@ -139,7 +445,7 @@ class A5_1():
 		self.state = np.r_[self.R1.state, self.R2.state,self.R3.state]
 		self.outbit = np.logical_xor(np.logical_xor(self.R1.state[-1],self.R2.state[-1]),self.R3.state[-1])*1
 
-		self.seq  = np.append(self.seq, self.outbit).astype(int)
+		self._seq.append(self.outbit)
 
 		self.count+=1
 
@@ -154,27 +460,155 @@ class A5_1():
 	def getCbits(self):
 	    return [self.R1.state[8],self.R2.state[10],self.R3.state[10]]
 	def getSeq(self):
-	    return ''.join(self.seq.copy().astype(str))
+	    return _bits2str(self.seq)
 	def getState(self):
 	    return ''.join(self.state.copy().astype(str))
 	def arr2str(self,arr):
 		return ''.join(arr.copy().astype(str))
-	def runKCycle(self, k):
+	def runKCycle(self, k, packed=False, bitorder='big'):
 	    '''
 	    Run k cycles and update all the Parameters
 
 	    Parameters
 	    ----------
 	    k : int
+	    packed: bool, default=False, if True, output bits are packed into np.uint8 bytes, same as np.packbits
+	    bitorder: str {'big','little'}, default='big', order of bits in packed bytes (see np.packbits)
 
 	    Returns
 	    -------
 	    tempseq : shape =(k,), output binary sequence of k cycles
+	        if packed=True, shape = (ceil(k/8),), np.uint8
+
+	    Note: cycles are excecuted with packed-integer engine (registers as ints, see _a5_1_run), and R1, R2, R3
+	    are then run for the number of times each one was clocked, which produces exactly same output, state and
+	    seq as calling next() k times. For many keys at once, see a5_1_keystream.
 	    '''
-	    tempseq = [self.next() for i in range(k)]
-	    return np.array(tempseq)
+	    Rs = [self.R1, self.R2, self.R3]
+	    if k < 1 or any(R.conf != 'fibonacci' for R in Rs):
+	        tempseq = np.array([self.next() for i in range(k)], dtype=int)
+	    else:
+	        S = [_state2int(R.state) for R in Rs]
+	        out, nclk = _a5_1_run(S, [len(R.state) for R in Rs], [R.fpoly for R in Rs], k, clock_first=self.count > 0)
+	        for R, n in zip(Rs, nclk):
+	            if n: R.runKCycle(n)
+	        tempseq = out.astype(int)
+
+	        self.state = np.r_[self.R1.state, self.R2.state,self.R3.state]
+	        self.outbit = tempseq[-1]
+	        self._seq.extend(tempseq)
+	        self.count += k
+	        self.c1 = self.R1.state[8]
+	        self.c2 = self.R2.state[10]
+	        self.c3 = self.R3.state[10]
+	        self.clock_bit = (self.c1+self.c2+self.c3 > 1)*1
+	    if packed:
+	        return np.packbits(tempseq, bitorder=bitorder)
+	    return tempseq
+
+
+def _peek_bits(R, m):
+    '''
+    Next m output bits of LFSR R (as m calls of next() would give), without changing R, as np.uint8 array
+    '''
+    c = _cell_sequence(_state2int(R.state), len(R.state), R.conf, R.fpoly, m + 1, cell=R.seq_bit_index)
+    return c[:m] if R.counter_start_zero else c[1:]
+
+def _clock_bits(R, L, skip):
+    '''
+    Last register of LFSR R for L cycles, clocked before each of them, except the first one if skip=0, as np.uint8 array
+
+    Sequence of last register (see _cell_sequence) is computed once, and R is advanced by L-1+skip cycles
+    with jump, adding output bits of those cycles to its seq, so R is same as by calling next() L-1+skip times.
+    '''
+    N = len(R.state)
+    k = L - 1 + skip
+    c = _cell_sequence(_state2int(R.state), N, R.conf, R.fpoly, L + skip, cell=-1)
+    if k:
+        out = None
+        if R._seq.maxlen != 0:
+            if R.seq_bit_index % N == N - 1:
+                out = c[:k] if R.counter_start_zero else c[1:k + 1]
+            else:
+                out = _peek_bits(R, k)
+        R.jump(k)
+        if out is not None:
+            R._seq.extend(out)
+    return c[skip:]
+
+class _BlockGenerator(_SeqMixin):
+    '''
+    Base of keystream generators built from LFSRs, running in blocks
+    ----------------------------------------------------------------
+    A construction sets 'LFSR_list' and implements _generate(L), returning next L output bits (np.uint8 array)
+    and advancing its LFSRs accordingly (e.g. with generate_bits and _cell_sequence), all the rest, next() and
+    runKCycle here, seq, stream and write_sequence from _SeqMixin, is common, so there is no per-bit next() to write.
+    Geffe and Geffe3 keep their own per-cycle next() (of earlier versions), used instead of blocks while any of
+    their LFSRs is verbose.
+    '''
+    block_size = 2**20
+    # True for constructions with their own per-cycle next() (Geffe, Geffe3)
+    _per_cycle_next = False
+
+    def _init_seq(self, seq_history):
+        self.seq_history = seq_history
+        if seq_history is not None:
+            _ = [R.set_seq_history(seq_history) for R in self.LFSR_list]
+        self.count = 0
+        self.outbit = -1
+        self.seq = []
+
+
+    @property
+    def state(self):
+        '''states of all LFSRs, concatenated'''
+        return np.hstack([R.state for R in self.LFSR_list])
+
+    def next(self):
+        '''Run one cycle, returns output bit'''
+        return self.runKCycle(1)[0]
+
+    def _stepwise(self):
+        '''True, if cycles should be run one at a time with own next() of a construction, to print states of verbose LFSRs'''
+        return self._per_cycle_next and any(R.verbose for R in self.LFSR_list)
+
+    def runKCycle(self, k, packed=False, bitorder='big'):
+        '''
+        Run k cycles and update all the Parameters, in blocks of upto block_size (2^20) cycles
+
+        Parameters
+        ----------
+        k : int
+        packed: bool, default=False, if True, output bits are packed into np.uint8 bytes, same as np.packbits
+        bitorder: str {'big','little'}, default='big', order of bits in packed bytes (see np.packbits)
 
-class Geffe():
+        Returns
+        -------
+        tempseq : shape =(k,), output binary sequence of k cycles
+            if packed=True, shape = (ceil(k/8),), np.uint8
+        '''
+        if self._stepwise():
+            tempseq = np.array([self.next() for _ in range(max(k, 0))], dtype=np.uint8)
+        else:
+            tempseq = np.empty(max(k, 0), dtype=np.uint8)
+            for t in range(0, k, self.block_size):
+                L = min(self.block_size, k - t)
+                tempseq[t:t+L] = self._generate(L)
+                self.count += L
+            if k > 0:
+                self.outbit = int(tempseq[-1])
+                self._seq.extend(tempseq)
+        if packed:
+            return np.packbits(tempseq, bitorder=bitorder)
+        return tempseq.astype(int)
+
+    def getSeq(self):
+        return _bits2str(self.seq)
+    def getState(self):
+        return ''.join(self.state.copy().astype(str))
+
+
+class Geffe(_BlockGenerator):
 	'''
 	Geffe Generator
 	---------------
@@ -187,6 +621,9 @@ class Geffe():
 
 	kLFSR_list: list of K LFSR, output of one of these is choosen at any time, depending on cLFSR
 	cLFSR: clocking LFSR
+	seq_history: int or None, default=None, number of last output bits retained in seq
+	   : if None, whole output sequence is retained, if 0, none, if N>0, only last N bits
+	   : if not None, it is also set to all the K+1 LFSRs (see LFSR.set_seq_history)
 
 	K should be power of 2. 2,4,8,... 128
 
@@ -215,7 +652,9 @@ class Geffe():
 	GG.runKCycle(1000)
 	GG.getSeq()
 	'''
-	def __init__(self,kLFSR_list,cLFSR):
+	_per_cycle_next = True
+
+	def __init__(self,kLFSR_list,cLFSR,seq_history=None):
 
 	    self.K = len(kLFSR_list)
 	    assert isinstance(cLFSR,LFSR)
@@ -228,23 +667,31 @@ class Geffe():
 
 	    self.kLFSR_list = kLFSR_list
 	    self.cLFSR = cLFSR
+	    self.LFSR_list = self.kLFSR_list+[self.cLFSR]
+	    self._init_seq(seq_history)
 
-	    self.count=0
 	    self.m_count =0
-	    self.seq =np.array([])
-	    self.outbit = -1
 	    self.sel_k = -1
 	    self.outbit_k = [Rk.state[-1] for Rk in self.kLFSR_list]
-	    self.state = np.hstack([R.state for R in self.kLFSR_list+[self.cLFSR]])
-	    self.state_k = np.hstack([R.state for R in self.kLFSR_list])
-	    self.state_c = self.cLFSR.state
+	    # weights of selector bits, first bit as most significant
+	    self._sel_w = 1 << np.arange(self.m)[::-1]
 
 
+
+	@property
+	def state_k(self):
+	    '''states of K LFSRs, concatenated'''
+	    return np.hstack([R.state for R in self.kLFSR_list])
+
+	@property
+	def state_c(self):
+	    '''state of clocking LFSR'''
+	    return self.cLFSR.state
+
 	def getSel(self):
 	    sel =  self.cLFSR.runKCycle(self.m)
 	    self.m_count+=self.m
-	    sel = ''.join(sel.astype(str))
-	    return int(sel, 2)
+	    return int(np.dot(sel, self._sel_w))
 	def next(self):
 	    if self.count:
 	        _ = [Rk.next() for Rk in self.kLFSR_list]
@@ -253,56 +700,63 @@ class Geffe():
 	    self.sel_k = self.getSel()
 	    self.outbit = self.outbit_k[self.sel_k]
 
-	    self.seq = np.append(self.seq,self.outbit).astype(int)
-
-	    self.state = np.hstack([R.state for R in self.kLFSR_list+[self.cLFSR]])
-	    self.state_k = np.hstack([R.state for R in self.kLFSR_list])
-	    self.state_c = self.cLFSR.state
+	    self._seq.append(self.outbit)
 
 	    self.count+=1
 	    return self.outbit
 
-	def getSeq(self):
-	    return ''.join(self.seq.copy().astype(str))
-	def getState(self):
-	    return ''.join(self.state.copy().astype(str))
-	def arr2str(self,arr):
-		return ''.join(arr.copy().astype(str))
-
-	def runKCycle(self, k):
+	def _generate(self, L):
 	    '''
-	    Run k cycles and update all the Parameters
+	    Next L output bits, in a block
+	    ------------------------------
+	    Last register of each of K LFSRs for L cycles is computed at once, as an array of shape (K, L) (see _clock_bits),
+	    and selector for L cycles, from m*L output bits of clocking LFSR, as bits (L, m) @ [2^(m-1),...,2,1].
+	    Output is then picked with fancy indexing, streams[sel, arange(L)]. All K+1 LFSRs are run for same
+	    number of cycles as by next(), so output, state and seq are same.
+	    '''
+	    skip = 1 if self.count else 0
+	    streams = np.empty([self.K, L], dtype=np.uint8)
+	    for i, Rk in enumerate(self.kLFSR_list):
+	        streams[i] = _clock_bits(Rk, L, skip)
+	    sel = self.cLFSR.generate_bits(self.m*L).reshape(L, self.m) @ self._sel_w
+	    self.m_count += self.m*L
+	    self.sel_k = int(sel[-1])
+	    self.outbit_k = [Rk.state[-1] for Rk in self.kLFSR_list]
+	    return streams[sel, np.arange(L)]
 
-	    Parameters
-	    ----------
-	    k : int
+	def arr2str(self,arr):
+		return ''.join(arr.copy().astype(str))
 
-	    Returns
-	    -------
-	    tempseq : shape =(k,), output binary sequence of k cycles
-	    '''
-	    tempseq = [self.next() for i in range(k)]
-	    return np.array(tempseq)
 
-class Geffe3():
+class Geffe3(_BlockGenerator):
     '''
     Geffe Generator
     ---------------
     Combining three LFSR in non-linear manner
-    linear complexity: If the LFSRs have lengths n1, n2, and n3, respectively, then the linear
-    complexity of the generator is  = (n1 + 1)n2 + n1n3
+    linear complexity: If the LFSRs have pairwise coprime lengths n1, n2, and n3, respectively (with primitive
+    feedback polynomials), then the linear complexity of the generator is  = n1n2 + (n1 + 1)n3
 
     output bit at any time is
 
-    b = (r1 ^ r2) • ((¬ r1) ^ r3)
+    b = (r1 • r2) ⊕ ((¬ r1) • r3)
+
+    where r1,r2,r3 are the outbit (last register) of three LFSRs respectively, that is, r1 selects r2 (if 1) or r3 (if 0),
+    computed as b = r3 ^ (r1 & (r2 ^ r3)).
+
+    Note: earlier versions (<=1.0.7) computed (r1 • r2) ⊕ ((¬ r1) • r2), which is always r2, so output of same
+    LFSRs is different now.
 
-    where r1,r2,r3 are the outbit of three LFSRs respectively
+    seq_history: int or None, default=None, number of last output bits retained in seq
+       : if None, whole output sequence is retained, if 0, none, if N>0, only last N bits
+       : if not None, it is also set to R1, R2 and R3 (see LFSR.set_seq_history)
 
     Ref: Schneier, Bruce. Applied cryptography: protocols, algorithms, and source code in C. john wiley & sons, 2007.
     Chaper 16
 
     '''
-    def __init__(self,R1,R2,R3):
+    _per_cycle_next = True
+
+    def __init__(self,R1,R2,R3,seq_history=None):
 
         assert isinstance(R1,LFSR)
         assert isinstance(R2,LFSR)
@@ -311,9 +765,8 @@ class Geffe3():
         self.R1 = R1
         self.R2 = R2
         self.R3 = R3
-        self.count=0
-        self.seq =[]
-        self.state = np.r_[self.R1.state, self.R2.state,self.R3.state]
+        self.LFSR_list = [self.R1, self.R2, self.R3]
+        self._init_seq(seq_history)
         self.next()
 
     def next(self):
@@ -326,35 +779,304 @@ class Geffe3():
         self.r3 = self.R3.state[-1]
 
         b1 = np.logical_and(self.r1,self.r2)
-        b2 = np.logical_and(not(self.r1),self.r2)
+        b2 = np.logical_and(not(self.r1),self.r3)
         self.outbit = np.logical_xor(b1,b2)*1
 
-        self.seq = np.append(self.seq,self.outbit).astype(int)
+        self._seq.append(self.outbit)
 
-        self.state = np.r_[self.R1.state, self.R2.state,self.R3.state]
         self.count+=1
         return self.outbit
-    def getSeq(self):
-        return ''.join(self.seq.copy().astype(str))
-    def getState(self):
-        return ''.join(self.state.copy().astype(str))
-    def arr2str(self,arr):
-    	return ''.join(arr.copy().astype(str))
 
-    def runKCycle(self, k):
+    def _generate(self, L):
         '''
-        Run k cycles and update all the Parameters
+        Next L output bits, in a block: last register of each of R1, R2, R3 for L cycles (see _clock_bits),
+        combined as r3 ^ (r1 & (r2 ^ r3)) on whole arrays
+        '''
+        skip = 1 if self.count else 0
+        r1, r2, r3 = [_clock_bits(R, L, skip) for R in self.LFSR_list]
+        self.r1, self.r2, self.r3 = [R.state[-1] for R in self.LFSR_list]
+        return r3 ^ (r1 & (r2 ^ r3))
 
-        Parameters
-        ----------
-        k : int
+    def arr2str(self,arr):
+    	return ''.join(arr.copy().astype(str))
 
-        Returns
-        -------
-        tempseq : shape =(k,), output binary sequence of k cycles
-        '''
-        tempseq = [self.next() for i in range(k)]
-        return np.array(tempseq)
+
+def _compile_boolfunc(n, table=None, anf=None):
+    '''
+    Boolean function of n inputs, given as truth table or ANF, compiled to a lookup table
+    ------------------------------------------------------------------------------------
+    table: truth table, list/array of 2^n bits, or int (x-th bit as f(x)), where input x = x_0 + 2 x_1 + 4 x_2 ...
+    anf: algebraic normal form, list of monomials, each as tuple of input indices, e.g. [(0,1),(2,),(0,2)] for
+         x_0 x_1 + x_2 + x_0 x_2, and () for constant 1
+
+    Returns
+    -------
+    table: np.uint8 array of 2^n bits, truth table (ANF is converted with Mobius transform), None if n > 16
+    monomials: list of monomials as masks of inputs (ANF of function), only if table is None, else None
+    '''
+    if (table is None) == (anf is None):
+        raise ValueError('Boolean function should be given either as table or as anf')
+    if table is not None:
+        if n > 16:
+            raise ValueError('truth table is supported upto 16 inputs, for more use anf')
+        if isinstance(table, (int, np.integer)):
+            table = [(int(table) >> x) & 1 for x in range(2**n)]
+        table = np.asarray(table).astype(np.uint8)
+        if table.shape != (2**n,) or np.any(table > 1):
+            raise ValueError('truth table should have 2^%d binary values' % n)
+        return table, None
+    masks = []
+    for mono in anf:
+        mono = [int(i) for i in mono]
+        if any(i < 0 or i >= n for i in mono):
+            raise ValueError('monomial %s has input out of range 0..%d' % (mono, n - 1))
+        masks.append(sum(1 << i for i in set(mono)))
+    if n > 16:
+        # monomials appearing twice cancel
+        return None, [mk for mk in set(masks) if masks.count(mk) % 2]
+    coef = np.zeros(2**n, dtype=np.uint8)
+    for mk in masks:
+        coef[mk] ^= 1
+    # Mobius transform: f(x) = XOR of coef[m] for all m subset of x
+    for i in range(n):
+        c = coef.reshape(-1, 2, 2**i)
+        c[:, 1, :] ^= c[:, 0, :]
+    return coef, None
+
+def _eval_boolfunc(table, monomials, bits):
+    '''
+    Evaluate compiled Boolean function (see _compile_boolfunc) on list of n input bit arrays
+    '''
+    if table is not None:
+        dtype = np.uint8 if len(bits) <= 8 else np.uint16
+        x = np.zeros(len(bits[0]), dtype=dtype)
+        for i, b in enumerate(bits):
+            x |= b.astype(dtype) << dtype(i)
+        return table[x]
+    out = np.zeros(len(bits[0]), dtype=np.uint8)
+    for mk in monomials:
+        term = np.ones(len(bits[0]), dtype=np.uint8)
+        for i, b in enumerate(bits):
+            if (mk >> i) & 1:
+                term &= b
+        out ^= term
+    return out
+
+class Combiner(_BlockGenerator):
+    '''
+    Nonlinear Combiner Generator
+    ----------------------------
+    Combining n LFSRs with a Boolean function f: output bit at any time is f(x_0, x_1, ..., x_{n-1}),
+    where x_i is output bit of i-th LFSR (all LFSRs are clocked once per cycle).
+
+    Boolean function is given as truth table or ANF, and compiled once into a lookup table of 2^n bits, so
+    a block of output is a single table lookup with index x_0 + 2 x_1 + 4 x_2 ... of whole arrays of output bits
+    of LFSRs (generate_bits). For n > 16, ANF (required) is evaluated directly on arrays.
+
+    Parameters
+    ----------
+    LFSR_list: list of n LFSRs
+    table: truth table, list/array of 2^n bits, or int (x-th bit as f(x)), where x = x_0 + 2 x_1 + 4 x_2 ...
+    anf: algebraic normal form, list of monomials, each as tuple of input indices,
+         e.g. [(0,1),(2,),(0,2)] for x_0 x_1 + x_2 + x_0 x_2 (Geffe), () for constant 1
+    seq_history: int or None, default=None, number of last output bits retained in seq
+       : if not None, it is also set to all the LFSRs (see LFSR.set_seq_history)
+
+    Other constructions (FilterGenerator, ShrinkingGenerator, SelfShrinkingGenerator, AlternatingStepGenerator)
+    share the block engine (runKCycle, stream, write_sequence), each only implementing _generate(L).
+
+    Example
+    --------
+    import numpy as np
+    from pylfsr import LFSR, Combiner
+
+    R = [LFSR(fpoly=[23,18],initstate='random'), LFSR(fpoly=[29,2],initstate='random'), LFSR(fpoly=[31,3],initstate='random')]
+
+    # Geffe function x0 x1 + x2 + x0 x2, as ANF, or as truth table (x0 selects x1 or x2)
+    C = Combiner(R, anf=[(0,1),(2,),(0,2)])
+    C = Combiner(R, table=[0,0,0,1,1,0,1,1])
+
+    seq = C.runKCycle(10**6)
+
+    # majority function of 5 LFSRs
+    C = Combiner([LFSR(initstate='random') for _ in range(5)], table=[int(bin(x).count('1')>2) for x in range(32)])
+    '''
+    def __init__(self, LFSR_list, table=None, anf=None, seq_history=None):
+        assert all(isinstance(R, LFSR) for R in LFSR_list)
+        assert len(LFSR_list) > 0
+        self.LFSR_list = list(LFSR_list)
+        self.n = len(self.LFSR_list)
+        self.table, self.monomials = _compile_boolfunc(self.n, table=table, anf=anf)
+        self._init_seq(seq_history)
+
+    def _generate(self, L):
+        bits = [R.generate_bits(L) for R in self.LFSR_list]
+        return _eval_boolfunc(self.table, self.monomials, bits)
+
+class FilterGenerator(_BlockGenerator):
+    '''
+    Nonlinear Filter Generator
+    --------------------------
+    Single LFSR, with output bit f(state[taps[0]], state[taps[1]], ...) of a Boolean function f of some of its
+    registers, taken before each cycle (then LFSR is clocked).
+
+    Sequences of tapped registers for a block are computed at once (see _cell_sequence) and f is a lookup of
+    compiled truth table (see Combiner for table and anf).
+
+    Parameters
+    ----------
+    R: LFSR
+    taps: list of register indices (of state) as inputs x_0, x_1, ... of f
+    table, anf: Boolean function of len(taps) inputs (see Combiner)
+    seq_history: int or None, default=None, number of last output bits retained in seq
+
+    Example
+    --------
+    from pylfsr import LFSR, FilterGenerator
+
+    F = FilterGenerator(LFSR(fpoly=[31,3],initstate='random'), taps=[0,5,11,17,30], anf=[(0,1),(2,3,4),(1,),(4,)])
+    seq = F.runKCycle(10**6)
+    '''
+    def __init__(self, R, taps, table=None, anf=None, seq_history=None):
+        assert isinstance(R, LFSR)
+        N = len(R.state)
+        self.taps = [int(i) % N for i in taps]
+        self.R = R
+        self.LFSR_list = [R]
+        self.n = len(self.taps)
+        self.table, self.monomials = _compile_boolfunc(self.n, table=table, anf=anf)
+        self._init_seq(seq_history)
+
+    def _generate(self, L):
+        R = self.R
+        S, N = _state2int(R.state), len(R.state)
+        bits = [_cell_sequence(S, N, R.conf, R.fpoly, L, cell=i) for i in self.taps]
+        R.generate_bits(L)
+        return _eval_boolfunc(self.table, self.monomials, bits)
+
+class ShrinkingGenerator(_BlockGenerator):
+    '''
+    Shrinking Generator
+    -------------------
+    Two LFSRs A and S clocked together, output bit of A is output only when output bit of S is 1
+    (else it is discarded), so each output bit takes 2 cycles of A and S on average.
+
+    In a block, selection bits of S are looked ahead (without clocking, see _peek_bits) to find how many
+    cycles give the required number of output bits, then A and S are run for exactly that many cycles.
+
+    Parameters
+    ----------
+    A: LFSR, data LFSR
+    S: LFSR, selection LFSR
+    seq_history: int or None, default=None, number of last output bits retained in seq
+
+    Example
+    --------
+    from pylfsr import LFSR, ShrinkingGenerator
+
+    G = ShrinkingGenerator(LFSR(fpoly=[23,18],initstate='random'), LFSR(fpoly=[29,2],initstate='random'))
+    seq = G.runKCycle(10**6)
+    '''
+    def __init__(self, A, S, seq_history=None):
+        assert isinstance(A, LFSR) and isinstance(S, LFSR)
+        if not np.any(S.state):
+            raise ValueError('selection LFSR S should not be in all zero state')
+        self.A, self.S = A, S
+        self.LFSR_list = [A, S]
+        self._init_seq(seq_history)
+
+    def _generate(self, L):
+        out = []
+        need = L
+        while need:
+            m = 2*need + 64
+            idx = np.flatnonzero(_peek_bits(self.S, m))
+            if len(idx) >= need:
+                m, idx = idx[need - 1] + 1, idx[:need]
+            a = self.A.generate_bits(m)
+            self.S.generate_bits(m)
+            out.append(a[idx])
+            need -= len(idx)
+        return np.concatenate(out)
+
+class SelfShrinkingGenerator(_BlockGenerator):
+    '''
+    Self-Shrinking Generator
+    ------------------------
+    Single LFSR, with output bits taken in pairs (x0, x1), x1 is output if x0 is 1, else pair is discarded,
+    so each output bit takes 4 cycles of LFSR on average.
+
+    Parameters
+    ----------
+    R: LFSR
+    seq_history: int or None, default=None, number of last output bits retained in seq
+
+    Example
+    --------
+    from pylfsr import LFSR, SelfShrinkingGenerator
+
+    G = SelfShrinkingGenerator(LFSR(fpoly=[31,3],initstate='random'))
+    seq = G.runKCycle(10**6)
+    '''
+    def __init__(self, R, seq_history=None):
+        assert isinstance(R, LFSR)
+        self.R = R
+        self.LFSR_list = [R]
+        self._init_seq(seq_history)
+
+    def _generate(self, L):
+        out = []
+        need = L
+        while need:
+            m = 2*need + 64
+            idx = np.flatnonzero(_peek_bits(self.R, 2*m)[0::2])
+            if len(idx) >= need:
+                m, idx = idx[need - 1] + 1, idx[:need]
+            x = self.R.generate_bits(2*m)
+            out.append(x[2*idx + 1])
+            need -= len(idx)
+        return np.concatenate(out)
+
+class AlternatingStepGenerator(_BlockGenerator):
+    '''
+    Alternating Step Generator
+    --------------------------
+    Three LFSRs, C controls clocking of R1 and R2: at each cycle C is clocked, if its output bit is 1, R1 is clocked,
+    else R2 is clocked, and output bit is XOR of last output bits of R1 and R2 (0 before first clock).
+
+    In a block, with control bits c of C, the number of clocks of R1 and R2 upto each cycle are cumsum(c) and
+    cumsum(1-c), so outputs of R1 and R2 (generate_bits) are gathered with these as indices.
+
+    Parameters
+    ----------
+    C: LFSR, control LFSR
+    R1, R2: LFSRs
+    seq_history: int or None, default=None, number of last output bits retained in seq
+
+    Example
+    --------
+    from pylfsr import LFSR, AlternatingStepGenerator
+
+    G = AlternatingStepGenerator(LFSR(fpoly=[19,6],initstate='random'), LFSR(fpoly=[23,18],initstate='random'),
+                                 LFSR(fpoly=[29,2],initstate='random'))
+    seq = G.runKCycle(10**6)
+    '''
+    def __init__(self, C, R1, R2, seq_history=None):
+        assert isinstance(C, LFSR) and isinstance(R1, LFSR) and isinstance(R2, LFSR)
+        self.C, self.R1, self.R2 = C, R1, R2
+        self.LFSR_list = [C, R1, R2]
+        # last output bits of R1 and R2
+        self.r1, self.r2 = 0, 0
+        self._init_seq(seq_history)
+
+    def _generate(self, L):
+        c = self.C.generate_bits(L)
+        n1 = int(c.sum())
+        a = np.r_[np.uint8(self.r1), self.R1.generate_bits(n1)]
+        b = np.r_[np.uint8(self.r2), self.R2.generate_bits(L - n1)]
+        out = a[np.cumsum(c)] ^ b[np.cumsum(1 - c)]
+        self.r1, self.r2 = int(a[-1]), int(b[-1])
+        return out
 
 if __name__ == '__main__':
 	import doctest
@@ -9,7 +9,7 @@ Contact: n.bajaj@qmul.ac.uk
 '''
 from __future__ import absolute_import, division, print_function
 name = "PyLFSR | utils"
-import sys
+import sys, os
 import numpy as np
 import functools, inspect, warnings
 
@@ -26,6 +26,13 @@ if sys.version_info[:2] < (3, 3):
 
 string_types = (type(b''), type(u''))
 
+try:
+    _popcount = int.bit_count
+except AttributeError:
+    # python < 3.10
+    def _popcount(x):
+        return bin(x).count('1')
+
 def deprecated(reason):
     """
     This is a decorator which can be used to mark functions
@@ -142,20 +149,373 @@ def pretty_print(List,n=3,sep='|\t',show_index=True,trimLength=None):
     if k+n<len(L):
         print(sep.join([L[ki] for ki in range(k+n,len(L))]))
 
-def _loadFpolyList():
-    import os
-    fname = 'primitive_polynomials_GF2_dict.txt'
-    fname = os.path.join(os.path.dirname(__file__), fname)
+class SeqBuffer():
+    '''
+    Growable buffer for output sequence
+    -----------------------------------
+    Storage of output sequence with amortized O(1) append, by doubling the capacity
+    when full, instead of copying the whole history with np.append at every cycle.
+
+    Parameters
+    ----------
+    data: array-like, optional, initial sequence
+    dtype: dtype of buffer (default int)
+    capacity: int, initial capacity (default 64)
+    maxlen: int or None (default None)
+        if None, whole sequence is kept,
+        if int, only last maxlen bits are kept (maxlen=0 keeps none). Memory of buffer is bounded
+        to 2*maxlen bits, last maxlen bits are moved to the start of buffer, when buffer is full.
+
+    Views returned by view() stay valid: once a view is handed out, memory is not overwritten
+    (moving bits, clear), a new buffer is used instead (copy-on-write).
+
+    Methods
+    -------
+    append(bit): append one bit
+    extend(bits): append a block of bits
+    clear(): remove all the bits
+    view(): zero-copy view of sequence as np.array, not changed by later appends
+    '''
+    def __init__(self, data=None, dtype=int, capacity=64, maxlen=None):
+        if maxlen is not None:
+            if maxlen < 0:
+                raise ValueError('maxlen should be None or a non-negative int')
+            capacity = min(capacity, 2*maxlen)
+        self.maxlen = maxlen
+        self._buf = np.empty(max(int(capacity), 1), dtype=dtype)
+        self._n = 0
+        self._shared = False
+        if data is not None:
+            self.extend(data)
+
+    def __len__(self):
+        return self._n if self.maxlen is None else min(self._n, self.maxlen)
+
+    def _reserve(self, n):
+        if n > len(self._buf):
+            cap = max(2*len(self._buf), n)
+            if self.maxlen is not None:
+                cap = min(cap, 2*self.maxlen)
+            buf = np.empty(cap, dtype=self._buf.dtype)
+            buf[:self._n] = self._buf[:self._n]
+            self._buf = buf
+            self._shared = False
+
+    def _release(self):
+        # new buffer, if memory of buffer is referenced by a view
+        if self._shared:
+            self._buf = np.empty_like(self._buf)
+            self._shared = False
+
+    def _make_room(self, k):
+        # for bounded buffer, keep only last (maxlen-k) bits, before adding k (<=maxlen) bits
+        if self.maxlen is not None and self._n + k > 2*self.maxlen:
+            keep = self.maxlen - k
+            old = self._buf[self._n - keep:self._n]
+            self._release()
+            self._buf[:keep] = old
+            self._n = keep
+        self._reserve(self._n + k)
+
+    def append(self, bit):
+        if self.maxlen == 0:
+            return
+        if self._n == len(self._buf):
+            self._make_room(1)
+        self._buf[self._n] = bit
+        self._n += 1
+
+    def extend(self, bits):
+        bits = np.asarray(bits).reshape(-1)
+        if self.maxlen is not None:
+            if self.maxlen == 0:
+                return
+            if len(bits) >= self.maxlen:
+                bits = bits[len(bits) - self.maxlen:]
+                self._release()
+                self._n = 0
+        self._make_room(len(bits))
+        n = self._n + len(bits)
+        self._buf[self._n:n] = bits
+        self._n = n
+
+    def clear(self):
+        self._release()
+        self._n = 0
+
+    def view(self):
+        self._shared = True
+        if self.maxlen is not None and self._n > self.maxlen:
+            return self._buf[self._n - self.maxlen:self._n]
+        return self._buf[:self._n]
+
+def _bits2str(arr):
+    '''
+    Binary array as str of 0s and 1s, e.g. np.array([1,0,1]) -> '101'
+    '''
+    arr = np.asarray(arr)
+    if arr.size and (arr.min() < 0 or arr.max() > 1):
+        return ''.join(arr.copy().astype(str))
+    return (arr.astype(np.uint8) + ord('0')).tobytes().decode()
+
+def _stream(run, chunk_size, n=None):
+    '''
+    Generator of output sequence in chunks of chunk_size, using run(k) to generate k bits.
+    If n is None, chunks are generated indefinitely, else total of n bits (last chunk can be smaller)
+    '''
+    chunk_size = int(chunk_size)
+    if chunk_size < 1:
+        raise ValueError('chunk_size should be a positive int')
+    while n is None or n > 0:
+        k = chunk_size if n is None else min(chunk_size, n)
+        yield run(k)
+        if n is not None:
+            n -= k
+
+def _write_sequence(run, fname, n_bits, fmt='packed', chunk_size=2**24, offset=0, bitorder='big', verbose=False):
+    '''
+    Write n_bits of output sequence to file fname, using run(k) to generate k bits (as np.uint8).
+    File is memory-mapped and filled chunk by chunk, so memory is bounded by chunk_size.
+
+    fmt: 'packed' - raw bytes, ceil(n_bits/8), bits packed as np.packbits with bitorder
+         'npy'    - .npy file of np.uint8 packed bytes, same as 'packed' with header,
+                    np.unpackbits(np.load(fname), count=n_bits, bitorder=bitorder) to unpack
+         'ascii'  - n_bits bytes of characters '0' and '1'
+    offset: number of bits already written to fname, writing resumes from offset,
+            run should be positioned at offset-th bit of sequence.
+            For fmt='packed' and 'npy', offset should be a multiple of 8.
+            If offset > 0, fname should exist (FileNotFoundError, else).
+    '''
+    n_bits, offset = int(n_bits), int(offset)
+    if fmt not in ['packed', 'npy', 'ascii']:
+        raise ValueError("fmt should be one of 'packed', 'npy' or 'ascii'")
+    if not 0 <= offset <= n_bits:
+        raise ValueError('offset should be in range [0, n_bits]')
+    per_byte = 1 if fmt == 'ascii' else 8
+    if offset % per_byte:
+        raise ValueError('offset should be a multiple of 8 for packed formats')
+    chunk_size = int(chunk_size) // per_byte * per_byte
+    if chunk_size < 1:
+        raise ValueError('chunk_size should be a positive int (multiple of 8 for packed formats)')
+
+    if offset > 0 and not os.path.exists(fname):
+        raise FileNotFoundError('Resuming from offset=%d, but file %s does not exist' % (offset, fname))
+
+    shape = ((n_bits + per_byte - 1) // per_byte,)
+    mode = 'r+' if offset > 0 else 'w+'
+    if shape[0] == 0:
+        if fmt == 'npy':
+            np.save(fname, np.zeros(0, dtype=np.uint8))
+        elif mode == 'w+':
+            open(fname, 'wb').close()
+        return 0
+    if fmt == 'npy':
+        out = np.lib.format.open_memmap(fname, mode=mode, dtype=np.uint8, shape=shape if mode == 'w+' else None)
+        if out.shape != shape or out.dtype != np.uint8:
+            raise ValueError('Existing file ' + str(fname) + ' does not match shape/dtype of n_bits packed bytes')
+    else:
+        if mode == 'r+' and os.path.getsize(fname) != shape[0]:
+            raise ValueError('Existing file ' + str(fname) + ' does not match size of n_bits')
+        out = np.memmap(fname, dtype=np.uint8, mode=mode, shape=shape)
+
+    nchunks = (n_bits - offset + chunk_size - 1) // chunk_size
+    for j, i in enumerate(range(offset, n_bits, chunk_size)):
+        bits = run(min(chunk_size, n_bits - i))
+        if fmt == 'ascii':
+            out[i:i + len(bits)] = bits + ord('0')
+        else:
+            out[i//8:(i + len(bits) + 7)//8] = np.packbits(bits, bitorder=bitorder)
+        if verbose:
+            progbar(j, nchunks, title='Writing to ' + str(fname))
+    out.flush()
+    del out
+    return n_bits - offset
+
+class _SeqMixin():
+    '''
+    Output sequence of a generator, common to LFSR and keystream generators
+    -----------------------------------------------------------------------
+    seq (kept in a SeqBuffer, bounded by seq_history), iteration, stream and write_sequence.
+    A class using it sets seq_history before assigning seq, and implements next() and runKCycle(k, packed, bitorder).
+    '''
+    # dtype of seq, as np.append(...).astype(int) of earlier versions
+    _seq_dtype = int
+
+    @property
+    def seq(self):
+        '''output sequence, as a view of sequence buffer'''
+        return self._seq.view()
+
+    @seq.setter
+    def seq(self, seq):
+        self._seq = SeqBuffer(seq, dtype=self._seq_dtype, maxlen=self.seq_history)
+
+    def __iter__(self):
+        '''Iterate over output bits, one cycle (next()) at a time, indefinitely'''
+        while True:
+            yield self.next()
+
+    def _bits(self, k, dtype=np.uint8, bitorder='big'):
+        '''
+        Run k cycles, output as dtype, or packed bytes if dtype='packed' (as LFSR.generate_bits), using runKCycle
+        '''
+        if isinstance(dtype, str) and dtype=='packed':
+            return self.runKCycle(k, packed=True, bitorder=bitorder)
+        return self.runKCycle(k).astype(dtype, copy=False)
+
+    def stream(self, chunk_size=2**16, n=None, dtype=np.uint8, bitorder='big'):
+        '''
+        Stream of output sequence
+        -------------------------
+        Generator of output sequence, yielding chunks of chunk_size bits, generated in blocks
+        (runKCycle, or generate_bits for LFSR). For constant memory with unbounded stream, set seq_history=0.
+
+        Parameters
+        ----------
+        chunk_size: int, number of bits in each chunk (default 2^16)
+        n: int or None, total number of bits, if None (default) stream is unbounded,
+           else last chunk can be smaller than chunk_size
+        dtype: np.uint8 (default), any other numpy dtype, or 'packed', (chunk_size bits packed into bytes)
+        bitorder: str {'big','little'}, default='big', order of bits, if dtype='packed'
+
+        Yields
+        ------
+        chunk: np.array of chunk_size bits
+
+        Example
+        -------
+        >>> L = LFSR(fpoly=[23,18], seq_history=0)
+        >>> for chunk in L.stream(chunk_size=2**20, n=10**8, dtype='packed'):
+        >>>     f.write(chunk.tobytes())
+        '''
+        return _stream(lambda k: self._bits(k, dtype=dtype, bitorder=bitorder), chunk_size, n)
+
+    def write_sequence(self, fname, n_bits, fmt='packed', chunk_size=2**20, offset=0, bitorder='big', verbose=False):
+        '''
+        Write output sequence to file, chunk by chunk into a memory-mapped file, using runKCycle
+        For bounded memory, set seq_history=0
+
+        Parameters
+        ----------
+        fname: str, path of file
+        n_bits: int, total number of bits of file
+        fmt: str, {'packed','npy','ascii'}, default='packed' (see LFSR.write_sequence)
+        chunk_size: int, number of bits generated at once (default 2^20)
+        offset: int, number of bits already written to fname, to resume writing (default=0),
+           generator is expected to be at offset-th bit, and if offset > 0, fname should exist
+        bitorder: str {'big','little'}, default='big', order of bits in packed bytes
+        verbose: bool, if True, show progress bar
+
+        Returns
+        -------
+        n: int, number of bits written
+        '''
+        return _write_sequence(self._bits, fname, n_bits, fmt=fmt, chunk_size=chunk_size,
+                               offset=offset, bitorder=bitorder, verbose=verbose)
+
+_FPOLY_TXT = 'primitive_polynomials_GF2_dict.txt'
+_FPOLY_NPZ = 'primitive_polynomials_GF2.npz'
+
+# process-wide cache of primitive polynomials per degree, and degrees of npz index (read once)
+_fpolyCache = {}
+_fpolyIndex = []
+
+def _loadFpolyTxt():
+    '''
+    Dictionary of primitive polynomials from text file, {m: [[m,...,k],...]}
+    '''
+    import ast
+    fname = os.path.join(os.path.dirname(__file__), _FPOLY_TXT)
     try:
-        f = open(fname, "rb")
-        lines = f.readlines()
-        f.close()
-        fpolyList = eval(lines[0].decode())
-    except:
+        with open(fname, "rb") as f:
+            fpolyList = ast.literal_eval(f.read().decode())
+    except OSError:
         raise Exception("File named:'{}' Not Found!!! \n try again, after downloading file from github save it in lfsr directory".format(fname))
-
     return fpolyList
 
+def _saveFpolyIndex(fpolyList, fname=None):
+    '''
+    Save dictionary of primitive polynomials {m: [[m,...,k],...]} as npz index, used by get_fpolyList
+
+    For each degree m, terms of all polynomials are concatenated in 'd<m>_terms' with polynomial i as
+    terms[indptr[i]:indptr[i+1]] ('d<m>_indptr'), so only arrays of requested degree are read.
+    '''
+    if fname is None:
+        fname = os.path.join(os.path.dirname(__file__), _FPOLY_NPZ)
+    arrays = {'degrees': np.array(sorted(fpolyList), dtype=np.int32)}
+    for m, polys in fpolyList.items():
+        arrays['d%d_terms' % m] = np.array([f for p in polys for f in p], dtype=np.int32)
+        arrays['d%d_indptr' % m] = np.cumsum([0] + [len(p) for p in polys], dtype=np.int64)
+    np.savez(fname, **arrays)
+
+def _readFpolyIndex(ms=None):
+    '''
+    Read primitive polynomials of degrees ms (all, if None) from npz index into cache
+
+    Only arrays of given degrees are read, and file is closed after reading.
+    Returns list of degrees in the index, None if index is not available.
+    '''
+    try:
+        with np.load(os.path.join(os.path.dirname(__file__), _FPOLY_NPZ)) as index:
+            degrees = index['degrees'].tolist()
+            for m in (degrees if ms is None else ms):
+                if m in _fpolyCache:
+                    continue
+                if m in degrees:
+                    terms = index['d%d_terms' % m].tolist()
+                    indptr = index['d%d_indptr' % m].tolist()
+                    _fpolyCache[m] = tuple(tuple(terms[i:j]) for i, j in zip(indptr[:-1], indptr[1:]))
+                else:
+                    _fpolyCache[m] = None
+    except OSError:
+        return None
+    return degrees
+
+def _loadFpolyTxtCache():
+    '''
+    Read all the primitive polynomials from text file into cache, if npz index is not available
+    '''
+    fpolyList = _loadFpolyTxt()
+    for k in fpolyList:
+        _fpolyCache[k] = tuple(tuple(p) for p in fpolyList[k])
+    return sorted(fpolyList)
+
+def _loadFpolyDegree(m):
+    '''
+    Primitive polynomials of degree m as tuple of tuples, None if not in the table
+
+    Read from npz index (only arrays of degree m) on first call, and cached for the process,
+    if index is not available, text file is used.
+    '''
+    if m in _fpolyCache:
+        return _fpolyCache[m]
+    if _fpolyIndex and _fpolyIndex[0] is None:
+        _fpolyCache.setdefault(m, None)
+        return _fpolyCache[m]
+    degrees = _readFpolyIndex([m])
+    if degrees is None:
+        _loadFpolyTxtCache()
+        _fpolyCache.setdefault(m, None)
+        _fpolyIndex.append(None)
+    elif not _fpolyIndex:
+        _fpolyIndex.append(degrees)
+    return _fpolyCache[m]
+
+def _loadFpolyList():
+    '''
+    Dictionary of all primitive polynomials in the table, {m: [[m,...,k],...]}
+    '''
+    if _fpolyIndex and _fpolyIndex[0] is None:
+        degrees = [k for k in _fpolyCache if _fpolyCache[k] is not None]
+    else:
+        degrees = _readFpolyIndex()
+        if degrees is None:
+            degrees = _loadFpolyTxtCache()
+            _fpolyIndex.append(None)
+        elif not _fpolyIndex:
+            _fpolyIndex.append(degrees)
+    return {m: [list(p) for p in _fpolyCache[m]] for m in sorted(degrees)}
+
 def get_fpolyList(m=None):
     '''
     Get the list of primitive polynomials as feedback polynomials for m-bit LFSR.
@@ -170,14 +530,15 @@ def get_fpolyList(m=None):
     -------
     fpoly_list: list of polynomial if m is not None else a dictionary
 
+    Table is read from a binary index (primitive_polynomials_GF2.npz), only for requested degree m,
+    and cached for the process, so repeated calls take microseconds.
     '''
-    fpolyList = _loadFpolyList()
     if m is None:
-        return fpolyList
+        return _loadFpolyList()
     elif type(m)== int and m > 1 and m < 32:
-        return fpolyList[m]
+        return [list(p) for p in _loadFpolyDegree(m)]
     else:
-        print('Wrong input m. m should be int 1 < m < 32 or None. For greater than 32 order, please check following refrences')
+        print('Wrong input m. m should be int 1 < m < 32 or None. For greater than 32 order, use search_fpoly(m) or check following refrences')
         #Ref: List of some primitive polynomial over GF(2)can be found at
         print(" - http://www.partow.net/programming/polynomials/index.html")
         print(" - http://www.ams.org/journals/mcom/1962-16-079/S0025-5718-1962-0148256-1/S0025-5718-1962-0148256-1.pdf")
@@ -206,6 +567,108 @@ def get_Ifpoly(fpoly):
     else:
         print('Not a valid form of feedback polynomial')
 
+def _lz_input(seq, packed=False, bitorder='big'):
+    '''
+    Sequence for Lempel-Ziv, as np.uint8 array of binary bits if possible, else as str
+    '''
+    if packed:
+        return np.unpackbits(np.asarray(seq, dtype=np.uint8), bitorder=bitorder)
+    if isinstance(seq, str):
+        if seq.strip('01') == '':
+            return np.frombuffer(seq.encode(), dtype=np.uint8) - ord('0')
+        return seq
+    seq = np.asarray(seq)
+    if seq.dtype.kind in 'biu' and (seq.size == 0 or (seq.min() >= 0 and seq.max() <= 1)):
+        return seq.astype(np.uint8, copy=False).reshape(-1)
+    return ''.join(seq.copy().astype(str))
+
+def _lz78_count(seq):
+    '''
+    Number of phrases of LZ78 parsing of binary np.uint8 array, using a binary trie (node ids as list index)
+    '''
+    child = ([0], [0])
+    node = count = 0
+    for b in seq.tolist():
+        nxt = child[b][node]
+        if nxt:
+            node = nxt
+        else:
+            count += 1
+            child[b][node] = count
+            child[0].append(0)
+            child[1].append(0)
+            node = 0
+    return count
+
+def _lz76_count(seq):
+    '''
+    Lempel-Ziv (1976) complexity of sequence, as of Kaspar and Schuster algorithm, using a suffix automaton
+
+    Each new phrase is the shortest substring, starting after previous phrase, which does not occur before,
+    (overlapping occurrence is allowed), last phrase is counted, even if it occurs before.
+    Suffix automaton of the prefix before current position is extended one symbol at a time, while
+    current phrase is matched on it, so time is O(n).
+    '''
+    n = len(seq)
+    if n < 2:
+        return n
+    if isinstance(seq, str):
+        alphabet = {ch: i for i, ch in enumerate(sorted(set(seq)))}
+        seq = [alphabet[ch] for ch in seq]
+        A = len(alphabet)
+    else:
+        seq = seq.tolist()
+        A = 2
+    # suffix automaton: transitions nxt[symbol][state], suffix link and length of each state
+    nxt = [[-1] for _ in range(A)]
+    link, length = [-1], [0]
+    last = 0
+
+    def extend(ch):
+        nonlocal last
+        cur = len(length)
+        length.append(length[last] + 1)
+        link.append(0)
+        for t in nxt:
+            t.append(-1)
+        p = last
+        while p != -1 and nxt[ch][p] == -1:
+            nxt[ch][p] = cur
+            p = link[p]
+        if p != -1:
+            q = nxt[ch][p]
+            if length[p] + 1 == length[q]:
+                link[cur] = q
+            else:
+                clone = len(length)
+                length.append(length[p] + 1)
+                link.append(link[q])
+                for t in nxt:
+                    t.append(t[q])
+                while p != -1 and nxt[ch][p] == q:
+                    nxt[ch][p] = clone
+                    p = link[p]
+                link[q] = link[cur] = clone
+        last = cur
+
+    extend(seq[0])
+    c, state, L = 1, 0, 0
+    for j in range(1, n):
+        ch = seq[j]
+        t = nxt[ch][state]
+        extend(ch)
+        if t != -1:
+            # current phrase still occurs before, state is fixed, if it was cloned by extend
+            state, L = t, L + 1
+            while L <= length[link[state]]:
+                state = link[state]
+            if j == n - 1:
+                c += 1
+        else:
+            c += 1
+            state, L = 0, 0
+    return c
+
 def lempel_ziv_patterns(seq):
     r"""Lempel-Ziv patterns.
     It is defined as a set of different patterns exists in a given sequence.
@@ -213,26 +676,28 @@ def lempel_ziv_patterns(seq):
     As an example:
     s = '1001111011000010'
     patterns ==> 1, 0, 01, 11, 10, 110, 00, 010
-    """
 
-    if isinstance(seq, (list,np.ndarray)):
-        seq = ''.join(seq.copy().astype(str))
+    Patterns are found by LZ78 parsing, with a trie of patterns, in linear time.
+    """
+    seq = _lz_input(seq)
+    if not isinstance(seq, str):
+        seq = _bits2str(seq)
 
     patterns = set()
-    n = len(seq)
-
-    i,k = 0, 1
-    while i + k<=len(seq):
-        pattern = seq[i: i + k]
-        if pattern in patterns:
-            k += 1
+    trie = {}
+    node, pattern = 0, ''
+    for ch in seq:
+        pattern += ch
+        nxt = trie.get((node, ch))
+        if nxt is not None:
+            node = nxt
         else:
             patterns.add(pattern)
-            i += k
-            k = 1
+            trie[(node, ch)] = len(patterns)
+            node, pattern = 0, ''
     return patterns
 
-def lempel_ziv_complexity(seq):
+def lempel_ziv_complexity(seq, method='lz78', packed=False, bitorder='big'):
     r"""Lempel-Ziv Complexity.
     It is defined as the number of different patterns exists in a given stream.
 
@@ -240,8 +705,965 @@ def lempel_ziv_complexity(seq):
     s = '1001111011000010'
     patterns ==> 1, 0, 01, 11, 10, 110, 00, 010
     #patterns = 8
+
+    Parameters
+    ----------
+    seq: str, list or np.array of sequence, binary array (e.g. np.uint8) is used directly, without converting to str
+    method: str {'lz78','lz76'}, default='lz78'
+        'lz78' - number of patterns of LZ78 parsing (see lempel_ziv_patterns), with a binary trie
+        'lz76' - Lempel-Ziv (1976) complexity, as of Kaspar and Schuster algorithm, with a suffix automaton
+        both are linear time, a 10^7 bit sequence takes a few seconds with 'lz78'
+    packed: bool, default=False, if True, seq is np.uint8 array of packed bits (as np.packbits),
+        all 8*len(seq) bits are used
+    bitorder: str {'big','little'}, default='big', order of bits of packed seq
     """
-    return len(lempel_ziv_patterns(seq))
+    if method not in ['lz78','lz76']:
+        raise ValueError("method should be 'lz78' or 'lz76'")
+    seq = _lz_input(seq, packed=packed, bitorder=bitorder)
+    if method == 'lz76':
+        return _lz76_count(seq)
+    if isinstance(seq, str):
+        return len(lempel_ziv_patterns(seq))
+    return _lz78_count(seq)
+
+class BerlekampMassey():
+    '''
+    Berlekamp-Massey algorithm (incremental)
+    ----------------------------------------
+    Linear complexity L and connection polynomial C(x) = 1 + c_1 x + ... + c_L x^L of the shortest LFSR that
+    generates the sequence s seen so far, s_n = XOR c_i s_(n-i), for i = 1...L.
+
+    C is kept as an int, reversed at degree L (c_i as (L-i)-th bit), so that the discrepancy of each new bit
+    is parity of C & window of last L+1 bits, with int operations on L bits, and no numpy call per bit.
+    Time is O(n L/w), for n bits.
+
+    Only the bits that a discrepancy can still need are kept, packed into bytes: last max(L, n-L)+1 bits,
+    since a change of length at bit n' makes it n'+1-L and then reaches back to s_L. For a stream of unbounded
+    length, give max_L, then only last max_L+1 bits are kept, so memory and time per bit are bounded.
+
+    Parameters
+    ----------
+    seq: None or array-like/str of binary bits, to start with (see extend)
+    max_L: int or None, default=None, maximum linear complexity to track,
+       : if given, ValueError is raised when linear complexity exceeds max_L (sequence is not generated by any
+       : LFSR of length <= max_L), bits before the one raising it are kept, as if given alone
+
+    Attributes
+    ----------
+    L: int, linear complexity of sequence so far
+    n: int, number of bits so far
+    fpoly: list or None, feedback polynomial as used in LFSR, e.g. [5,2] for C(x) = 1 + x^2 + x^5 (see berlekamp_massey)
+
+    Example
+    -------
+    >>> bm = BerlekampMassey()
+    >>> bm.extend([1,1,1,0,0,1,0,1,1,1])
+    array([1, 1, 1, 3, 3, 3, 3, 3, 3, 3])
+    >>> bm.L, bm.fpoly
+    (3, [3, 2])
+    >>> bm.update(0)
+    3
+    >>> bm.update(1)
+    9
+
+    >>> # linear complexity of a stream, in bounded memory
+    >>> bm = BerlekampMassey(max_L=64)
+    >>> for chunk in LFSR(fpoly=[23,18], initstate='random', seq_history=0).stream(n=10**6):
+    >>>     _ = bm.extend(chunk)
+    >>> bm.L, bm.fpoly
+    (23, [23, 18])
+    '''
+    def __init__(self, seq=None, max_L=None):
+        if max_L is not None and max_L < 0:
+            raise ValueError('max_L should be None or a non-negative int')
+        self.n = 0
+        self.L = 0
+        self.max_L = max_L
+        # bits s_lo ... s_(n-1), packed (little bitorder), lo is multiple of 8
+        self._buf = bytearray()
+        self._lo = 0
+        # C and B reversed at degree L and LB
+        self._C = 1
+        self._B = 1
+        if seq is not None:
+            self.extend(seq)
+
+    def update(self, bit):
+        '''
+        Add a bit to sequence, returns linear complexity L
+        '''
+        bit = int(bit)
+        if bit not in (0, 1):
+            raise ValueError('Sequence should be binary, i.e., 0s and 1s')
+        return self._run((bit,))[0]
+
+    def extend(self, seq):
+        '''
+        Add bits to sequence
+
+        Parameters
+        ----------
+        seq: array-like or str of binary bits, e.g. [1,0,1], np.array([1,0,1]) or '101'
+
+        Returns
+        -------
+        profile: np.array of int, linear complexity after each bit of seq (linear complexity profile)
+        '''
+        if isinstance(seq, str):
+            seq = np.frombuffer(seq.encode(), dtype=np.uint8) - ord('0')
+        seq = np.asarray(seq).astype(np.uint8).reshape(-1)
+        if np.any(seq > 1):
+            raise ValueError('Sequence should be binary, i.e., 0s and 1s')
+        return np.array(self._run(seq.tolist()), dtype=np.int64)
+
+    def _run(self, bits):
+        '''
+        Add bits (iterable of int 0/1) to sequence, returns linear complexity profile as list
+        '''
+        buf, lo, n, L, C, B, max_L = self._buf, self._lo, self.n, self.L, self._C, self._B, self.max_L
+        profile = []
+        try:
+            for b in bits:
+                r = (n - lo) & 7
+                if r:
+                    buf[-1] |= b << r
+                else:
+                    buf.append(b)
+                # window of bits s_(n-L) ... s_n
+                i = n - L - lo
+                w = int.from_bytes(buf[i >> 3:], 'little') >> (i & 7)
+                if _popcount(C & w) & 1:
+                    if 2*L <= n:
+                        L1 = n + 1 - L
+                        if max_L is not None and L1 > max_L:
+                            if r:
+                                buf[-1] &= ~(1 << r)
+                            else:
+                                del buf[-1]
+                            raise ValueError('Linear complexity %d at bit %d exceeds max_L=%d' % (L1, n, max_L))
+                        C, B = (C << (L1 - L)) ^ B, C
+                        L = L1
+                    else:
+                        C ^= B << (2*L - n - 1)
+                n += 1
+                profile.append(L)
+                # drop bits before s_start, once they are half of the buffer
+                start = min(L, n - L) if max_L is None else max(min(L, n - L), n - max_L)
+                dead = (start - lo) >> 3
+                if dead > 8 and 2*dead > len(buf):
+                    del buf[:dead]
+                    lo += 8*dead
+        finally:
+            self._lo, self.n, self.L, self._C, self._B = lo, n, L, C, B
+        return profile
+
+    @property
+    def fpoly(self):
+        '''
+        feedback polynomial of connection polynomial as list, e.g. [5,2] for 1 + x^2 + x^5 (see berlekamp_massey),
+        None if C(x) has less than two terms besides 1 (e.g. L <= 1, or C(x) = 1 + x^L), which LFSR does not accept
+        '''
+        C, L = self._C, self.L
+        fpoly = [L - k for k in range(L) if (C >> k) & 1]
+        return fpoly if len(fpoly) > 1 else None
+
+def berlekamp_massey(seq, profile=False):
+    '''
+    Linear complexity of a binary sequence, with Berlekamp-Massey algorithm
+    -----------------------------------------------------------------------
+    Linear complexity L is length of the shortest LFSR which generates the sequence.
+    Connection polynomial C(x) = 1 + c_1 x + ... + c_L x^L of it is returned as feedback polynomial fpoly,
+    as used in LFSR, since s_n = XOR s_(n-f), for f in fpoly, for n>=L.
+
+    The sequence can be regenerated as output sequence of fibonacci LFSR, with initial state as first L bits reversed
+    >>> L, fpoly = berlekamp_massey(seq)
+    >>> np.array_equal(LFSR(fpoly=fpoly, initstate=seq[:L][::-1]).runKCycle(len(seq)), seq)
+    True
+    If max(fpoly) < L (c_L = 0), the first L - max(fpoly) bits are not generated by the recurrence,
+    and initial state is of length L.
+
+    Parameters
+    ----------
+    seq: array-like or str of binary bits, e.g. np.array([1,0,1]), [1,0,1], '101'
+    profile: bool, default=False, if True, linear complexity profile is also returned
+
+    Returns
+    -------
+    L: int, linear complexity
+    fpoly: list, feedback polynomial, e.g. [5,2] for C(x) = 1 + x^2 + x^5
+         : None, if C(x) has less than two terms besides 1, which LFSR does not accept as fpoly, that is, when
+         : L <= 1 (e.g. '0000' gives L=0, '1000' gives L=1 with C(x) = 1), or C(x) = 1 + x^k, s_n = s_(n-k),
+         : (e.g. '10000100001' gives L=5, C(x) = 1 + x^5)
+    profile: np.array, (if profile=True), linear complexity after each bit
+
+    Notes
+    -----
+    Time is O(n L/w) with n bits, with L small (as of LFSR-based sequences), 10^6 bits take a second or so,
+    for random like sequences (L ~ n/2) it grows as n^2.
+
+    Example
+    -------
+    >>> from pylfsr import LFSR
+    >>> seq = LFSR(fpoly=[5,2], initstate='random').runKCycle(100)
+    >>> berlekamp_massey(seq)
+    (5, [5, 2])
+
+    See Also
+    --------
+    BerlekampMassey: incremental version
+    '''
+    bm = BerlekampMassey()
+    prof = bm.extend(seq)
+    if profile:
+        return bm.L, bm.fpoly, prof
+    return bm.L, bm.fpoly
+
+def _spread4(v):
+    '''
+    Spread 4 bits of v to even positions of a byte, e.g. 0b1011 -> 0b01000101
+    '''
+    return sum(((v >> i) & 1) << (2*i) for i in range(4))
+
+_SQR_LO = bytes(_spread4(v & 15) for v in range(256))
+_SQR_HI = bytes(_spread4(v >> 4) for v in range(256))
+
+def _gf2_sqr(a):
+    '''
+    Square of polynomial a over GF(2), (spreading the bits of a to even positions, using byte tables)
+    '''
+    b = a.to_bytes((a.bit_length() + 7)//8, 'little')
+    out = bytearray(2*len(b))
+    out[0::2] = b.translate(_SQR_LO)
+    out[1::2] = b.translate(_SQR_HI)
+    return int.from_bytes(out, 'little')
+
+def _gf2_mul(a, b):
+    '''
+    Product of polynomials a*b over GF(2) (carry-less multiplication, 4 bits of b at a time)
+    '''
+    if a.bit_length() < b.bit_length():
+        a, b = b, a
+    if b < 16:
+        r = 0
+        while b:
+            if b & 1:
+                r ^= a
+            b >>= 1
+            a <<= 1
+        return r
+    tab = [0, a, a << 1, (a << 1) ^ a]
+    tab = tab + [(a << 2) ^ t for t in tab]
+    tab = tab + [(a << 3) ^ t for t in tab]
+    r = 0
+    for i in range((b.bit_length() + 3)//4*4 - 4, -1, -4):
+        r = (r << 4) ^ tab[(b >> i) & 15]
+    return r
+
+def _gf2_divmod(a, b):
+    '''
+    Quotient and remainder of polynomials a/b over GF(2)
+    '''
+    q, db = 0, b.bit_length()
+    while a.bit_length() >= db:
+        s = a.bit_length() - db
+        q ^= 1 << s
+        a ^= b << s
+    return q, a
+
+def _gf2_gcd(a, b):
+    '''
+    Greatest common divisor of polynomials a and b over GF(2)
+    '''
+    while b:
+        a, b = b, _gf2_divmod(a, b)[1]
+    return a
+
+class _GF2Mod():
+    '''
+    Arithmetic of polynomials modulo f over GF(2)
+
+    Polynomials are represented as int, with i-th bit as coefficient of x^i,
+    e.g. x^5 + x^2 + 1 as 0b100101. Reduction mod f (of degree M) is done either by folding
+    the part above x^M with the lower terms g of f (f = x^M + g), which is fast for sparse f with low deg(g),
+    or by a table of v*x^M mod f for all bytes v, reducing 8 bits at a time.
+    '''
+    def __init__(self, f):
+        self.f = f
+        self.M = M = f.bit_length() - 1
+        self.mask = (1 << M) - 1
+        g = f ^ (1 << M)
+        self.taps = [i for i in range(g.bit_length()) if (g >> i) & 1]
+        # cost (number of int operations) to reduce M bits, by folding and by byte table
+        step = M - (g.bit_length() - 1) if g else M
+        self.use_table = M >= 8 and -(-M//step)*(len(self.taps) + 2) > 3*(M//8 + 1)
+        if self.use_table:
+            B = [g]
+            for i in range(7):
+                B.append(self.mulx(B[-1]))
+            R = [0]*256
+            for v in range(1, 256):
+                R[v] = R[v & (v - 1)] ^ B[(v & -v).bit_length() - 1]
+            self.table = R
+
+    def mulx(self, a):
+        '''
+        a*x mod f
+        '''
+        a <<= 1
+        if a >> self.M:
+            a ^= self.f
+        return a
+
+    def reduce(self, r):
+        '''
+        r mod f
+        '''
+        M = self.M
+        if self.use_table:
+            R = self.table
+            n = r.bit_length() - M
+            while n > 0:
+                s = max(n - 8, 0)
+                v = r >> (M + s)
+                r ^= (v << (M + s)) ^ (R[v] << s)
+                n = r.bit_length() - M
+            return r
+        mask, taps = self.mask, self.taps
+        while r >> M:
+            h = r >> M
+            r &= mask
+            for t in taps:
+                r ^= h << t
+        return r
+
+    def mul(self, a, b):
+        '''
+        a*b mod f
+        '''
+        return self.reduce(_gf2_mul(a, b))
+
+    def sqr(self, a):
+        '''
+        a^2 mod f
+        '''
+        return self.reduce(_gf2_sqr(a))
+
+    def pow(self, a, e):
+        '''
+        a^e mod f, by square and multiply (multiply by x is a shift, for a = x)
+        '''
+        a = self.reduce(a)
+        r = self.reduce(1)
+        for bit in bin(e)[2:]:
+            r = self.sqr(r)
+            if bit == '1':
+                r = self.mulx(r) if a == 2 else self.mul(r, a)
+        return r
+
+@functools.lru_cache(maxsize=64)
+def _gf2_modulus(f):
+    return _GF2Mod(f)
+
+def _gf2_mulmod(a, b, f):
+    '''
+    Product of polynomials a*b mod f over GF(2)
+
+    Polynomials are represented as int, with i-th bit as coefficient of x^i,
+    e.g. x^5 + x^2 + 1 as 0b100101.
+    '''
+    return _gf2_modulus(f).mul(a, b)
+
+def _gf2_powmod(a, e, f):
+    '''
+    a^e mod f over GF(2), by square and multiply, polynomials represented as int (see _gf2_mulmod)
+    '''
+    return _gf2_modulus(f).pow(a, e)
+
+def _fpoly2int(fpoly):
+    '''
+    Feedback polynomial as int, e.g. [5,2] for x^5 + x^2 + 1 as 0b100101
+    '''
+    f = 1
+    for p in fpoly:
+        f |= 1 << int(p)
+    return f
+
+def _primes_below(n):
+    '''
+    Primes p < n (sieve of Eratosthenes)
+    '''
+    sieve = np.ones(n, dtype=bool)
+    sieve[:2] = False
+    for p in range(2, int(n**0.5) + 1):
+        if sieve[p]:
+            sieve[p*p::p] = False
+    return np.flatnonzero(sieve).tolist()
+
+_SMALL_PRIMES = _primes_below(1000)
+
+def _is_probable_prime(n):
+    '''
+    Miller-Rabin test, with first 20 primes as bases (deterministic for n < 3.3*10^24)
+    '''
+    if n < 2:
+        return False
+    for p in _SMALL_PRIMES[:20]:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d//2, s + 1
+    for a in _SMALL_PRIMES[:20]:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x*x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _pollard_brent(n, max_iter=2**18):
+    '''
+    A non-trivial factor of composite n, by Pollard-Brent rho method, None if not found in max_iter steps
+    '''
+    from math import gcd
+    if n % 2 == 0:
+        return 2
+    for c in range(1, 20):
+        y, r, q, g, it = 2, 1, 1, 1, 0
+        while g == 1 and it < max_iter:
+            x = y
+            for _ in range(r):
+                y = (y*y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(128, r - k)):
+                    y = (y*y + c) % n
+                    q = q*abs(x - y) % n
+                g = gcd(q, n)
+                k += 128
+            it += r
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys*ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if 1 < g < n:
+            return g
+        if it >= max_iter:
+            return None
+    return None
+
+# Known prime factors of Fermat numbers 2^(2^k)+1, k=7...10, out of reach of rho method,
+# (2^M-1 for M = 256, 512, 1024, 2048), remaining cofactors are primes
+_KNOWN_PRIMES = [59649589127497217, 1238926361552897, 2424833,
+                 7455602825647884208337395736200454918783366342657,
+                 45592577, 6487031809, 4659775785220018543264560743076778192897]
+
+def _divisors(n):
+    return [d for d in range(1, n + 1) if n % d == 0]
+
+def _mobius(n):
+    m, p = 1, 2
+    while p*p <= n:
+        if n % p == 0:
+            n //= p
+            if n % p == 0:
+                return 0
+            m = -m
+        p += 1
+    return -m if n > 1 else m
+
+def _cyclotomic2(d):
+    '''
+    Cyclotomic value Phi_d(2), 2^M-1 = prod Phi_d(2) for d|M
+    '''
+    num, den = 1, 1
+    for e in _divisors(d):
+        mu = _mobius(d//e)
+        if mu == 1:
+            num *= 2**e - 1
+        elif mu == -1:
+            den *= 2**e - 1
+    return num//den
+
+_MERSENNE_NPZ = 'mersenne_factors.npz'
+
+# prime factors of Phi_d(2) from table (d <= 1024), loaded on first use
+_phiFactors = {}
+
+def _saveMersenneFactors(primes, fname=None, maxd=1024):
+    '''
+    Save table of prime factors of Phi_d(2) for d <= maxd (so of 2^M-1 for M <= maxd), as npz
+
+    primes: list of known primes, e.g. prime factors of Cunningham tables (2,n- and 2,n+), only primes dividing
+    Phi_d(2) are used, and only d for which Phi_d(2) is completely factored are saved.
+    Primes are stored as little-endian bytes, concatenated in 'prime_bytes', prime i as
+    prime_bytes[prime_indptr[i]:prime_indptr[i+1]], and primes of 'degrees'[j] are primes d_indptr[j] to d_indptr[j+1].
+
+    Returns
+    -------
+    missing: list of d <= maxd, for which Phi_d(2) is not completely factored by primes
+    '''
+    if fname is None:
+        fname = os.path.join(os.path.dirname(__file__), _MERSENNE_NPZ)
+    primes = sorted(set(int(p) for p in primes))
+    degrees, groups, missing = [], [], []
+    for d in range(1, maxd + 1):
+        n = _cyclotomic2(d)
+        # prime factors of Phi_d(2) are 1 mod d, or divide d
+        fs = []
+        for p in primes:
+            if p > n:
+                break
+            if ((p - 1) % d == 0 or d % p == 0) and n % p == 0:
+                fs.append(p)
+                while n % p == 0:
+                    n //= p
+        if n > 1 and _is_probable_prime(n):
+            fs.append(n)
+            n = 1
+        if n > 1:
+            missing.append(d)
+            continue
+        degrees.append(d)
+        groups.append(sorted(fs))
+    flat = [p for g in groups for p in g]
+    pbytes = [p.to_bytes((p.bit_length() + 7)//8, 'little') for p in flat]
+    np.savez(fname, degrees=np.array(degrees, dtype=np.int32),
+             d_indptr=np.cumsum([0] + [len(g) for g in groups], dtype=np.int64),
+             prime_bytes=np.frombuffer(b''.join(pbytes), dtype=np.uint8),
+             prime_indptr=np.cumsum([0] + [len(b) for b in pbytes], dtype=np.int64))
+    return missing
+
+def _loadMersenneFactors():
+    '''
+    Table of prime factors of Phi_d(2), {d: (p1, p2, ...)}, read once and cached
+    '''
+    if not _phiFactors:
+        fname = os.path.join(os.path.dirname(__file__), _MERSENNE_NPZ)
+        try:
+            with np.load(fname) as z:
+                degrees, d_indptr = z['degrees'].tolist(), z['d_indptr'].tolist()
+                pbytes, p_indptr = z['prime_bytes'].tobytes(), z['prime_indptr'].tolist()
+        except OSError:
+            degrees = []
+        else:
+            flat = [int.from_bytes(pbytes[i:j], 'little') for i, j in zip(p_indptr[:-1], p_indptr[1:])]
+            for d, i, j in zip(degrees, d_indptr[:-1], d_indptr[1:]):
+                _phiFactors[d] = tuple(flat[i:j])
+        # marks table as loaded, even if empty
+        _phiFactors[0] = ()
+    return _phiFactors
+
+@functools.lru_cache(maxsize=None)
+def _mersenne_factors(M):
+    '''
+    Distinct prime factors of 2^M-1
+
+    2^M-1 is split into cyclotomic values Phi_d(2), for d|M. Factors of Phi_d(2) are read from table (mersenne_factors.npz,
+    for d <= 1024, from Cunningham tables), if available, else prime factors of Phi_d(2), which are 1 mod d (except
+    of the largest prime factor of d), are found by trial division, known factors and Pollard-Brent rho.
+    Raises ValueError, if a factor is not found
+    '''
+    table = _loadMersenneFactors()
+    primes = set()
+    for d in _divisors(M):
+        if d in table:
+            primes.update(table[d])
+            continue
+        n = _cyclotomic2(d)
+        for p in _SMALL_PRIMES:
+            if p*p > n:
+                break
+            while n % p == 0:
+                primes.add(p)
+                n //= p
+        # candidates q = kd+1 (d>1)
+        if d > 1:
+            q = d + 1
+            while q < 2**16 and q*q <= n:
+                while n % q == 0:
+                    primes.add(q)
+                    n //= q
+                q += d
+        for p in _KNOWN_PRIMES:
+            if n % p == 0:
+                primes.add(p)
+                n //= p
+        stack = [n] if n > 1 else []
+        while stack:
+            n = stack.pop()
+            if _is_probable_prime(n):
+                primes.add(n)
+                continue
+            # budget of rho steps, lower for larger n, since each step is slower
+            p = _pollard_brent(n, max_iter=2**26//n.bit_length())
+            if p is None:
+                raise ValueError('Could not factorize 2^%d-1, (composite factor %d), provide prime factors with "factors"' % (M, n))
+            stack += [p, n//p]
+    return tuple(sorted(primes))
+
+def _check_factors(factors, M):
+    '''
+    Distinct prime factors of 2^M-1 given by user, sorted, raise ValueError if not complete
+    '''
+    factors = sorted(set(int(p) for p in factors))
+    n = 2**M - 1
+    for p in factors:
+        if p < 2 or n % p:
+            raise ValueError('%d is not a factor of 2^%d-1' % (p, M))
+        while n % p == 0:
+            n //= p
+    if n != 1:
+        raise ValueError('factors are not complete, 2^%d-1 has remaining factor %d' % (M, n))
+    return factors
+
+def _prime_factors(n):
+    ps, p = [], 2
+    while p*p <= n:
+        if n % p == 0:
+            ps.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        ps.append(n)
+    return ps
+
+def is_irreducible(fpoly):
+    '''
+    Check if feedback polynomial is irreducible over GF(2)
+    ------------------------------------------------------
+    Rabin's test: polynomial f of degree M is irreducible iff x^(2^M) = x mod f and
+    gcd(x^(2^(M/r)) - x, f) = 1 for each prime r dividing M. Computed with M squarings mod f.
+
+    Parameters
+    ----------
+    fpoly: polynomial as list e.g. [5,2] for x^5 + x^2 + 1
+
+    Returns
+    -------
+    result: bool, True if fpoly is irreducible
+
+    Example
+    -------
+    >>> is_irreducible([5,2])
+    True
+    >>> is_irreducible([4,2])
+    False
+    '''
+    return _gf2_is_irreducible(_fpoly2int(fpoly))
+
+def _gf2_is_irreducible(f):
+    '''
+    Rabin's irreducibility test of polynomial f (as int), see is_irreducible
+    '''
+    M = f.bit_length() - 1
+    if M < 1:
+        return False
+    F = _gf2_modulus(f)
+    x = F.reduce(2)
+    checks = {M//r: None for r in _prime_factors(M)}
+    r = x
+    for k in range(1, M + 1):
+        r = F.sqr(r)
+        if k in checks:
+            if _gf2_gcd(f, r ^ x) != 1:
+                return False
+    return r == x
+
+def is_primitive(fpoly, factors=None):
+    '''
+    Check if feedback polynomial is primitive over GF(2)
+    ----------------------------------------------------
+    A primitive polynomial of degree M gives maximum period of 2^M-1 to LFSR (for any non-zero state).
+    Polynomial f is primitive iff it is irreducible (see is_irreducible) and x^((2^M-1)/p) != 1 mod f for
+    each prime factor p of 2^M-1, that is, order of x mod f is 2^M-1.
+
+    Prime factors of 2^M-1 are computed and cached (see notes), or can be provided.
+
+    Parameters
+    ----------
+    fpoly: polynomial as list e.g. [5,2] for x^5 + x^2 + 1
+    factors: None or list of distinct prime factors of 2^M-1, (default=None)
+        if None, factors are read from the bundled table (Cunningham project, M <= 1024), else 2^M-1 is factorized,
+        which can fail (ValueError) for large M, for such M factors can be taken from the tables of Cunningham project
+
+    Returns
+    -------
+    result: bool, True if fpoly is primitive
+
+    Notes
+    -----
+    for Mersenne prime 2^M-1 (M = 2,3,5,7,13,17,19,31,61,89,107,127,521,607,1279,...) primitivity is same as irreducibility.
+
+    Example
+    -------
+    >>> is_primitive([5,2])
+    True
+    >>> is_primitive([6,3])
+    False
+    '''
+    f = _fpoly2int(fpoly)
+    M = f.bit_length() - 1
+    if not is_irreducible(fpoly):
+        return False
+    T = 2**M - 1
+    factors = _mersenne_factors(M) if factors is None else _check_factors(factors, M)
+    F = _gf2_modulus(f)
+    return all(F.pow(2, T//p) != 1 for p in factors)
+
+def _gf2_deriv(f):
+    '''
+    Derivative of polynomial f over GF(2), (x^i)' = x^(i-1) for odd i, else 0
+    '''
+    even = ((1 << (2*(f.bit_length()//2 + 1))) - 1)//3
+    return (f >> 1) & even
+
+def _gf2_sqrt(f):
+    '''
+    Square root of polynomial f over GF(2), f should be a square (only even powers)
+    '''
+    r = 0
+    for i in range(0, f.bit_length(), 2):
+        if (f >> i) & 1:
+            r |= 1 << (i//2)
+    return r
+
+def _gf2_sqf(f):
+    '''
+    Square-free factorization of polynomial f over GF(2)
+
+    Returns list of (g, e), with square-free g, such that f = prod g^e
+    '''
+    out = []
+    c = _gf2_gcd(f, _gf2_deriv(f))
+    w = _gf2_divmod(f, c)[0]
+    i = 1
+    while w != 1:
+        y = _gf2_gcd(w, c)
+        z = _gf2_divmod(w, y)[0]
+        if z != 1:
+            out.append((z, i))
+        i += 1
+        w = y
+        c = _gf2_divmod(c, y)[0]
+    if c != 1:
+        # remaining c is a square (only even powers)
+        out += [(g, 2*e) for g, e in _gf2_sqf(_gf2_sqrt(c))]
+    return out
+
+def _gf2_ddf(f):
+    '''
+    Distinct-degree factorization of square-free polynomial f over GF(2)
+
+    Returns list of (d, g), where g is the product of all irreducible factors of f of degree d
+    '''
+    out = []
+    d = 1
+    w = _gf2_divmod(2, f)[1]
+    while f.bit_length() - 1 >= 2*d:
+        w = _GF2Mod(f).sqr(w)
+        g = _gf2_gcd(f, w ^ 2)
+        if g != 1:
+            out.append((d, g))
+            f = _gf2_divmod(f, g)[0]
+            w = _gf2_divmod(w, f)[1]
+        d += 1
+    if f.bit_length() > 1:
+        out.append((f.bit_length() - 1, f))
+    return out
+
+def _gf2_order(f, factors=None):
+    '''
+    Multiplicative order of x modulo polynomial f over GF(2), that is smallest T>0 with f | x^T - 1 (f(0) should be 1)
+
+    For f = prod g_i^e_i, with irreducible g_i of degree d_i, order of x mod g_i^e_i is ord(g_i)*2^ceil(log2(e_i)),
+    where ord(g_i) divides 2^d_i - 1, and order mod f is lcm of those. Factors g_i are grouped by degree with
+    square-free and distinct-degree factorization. Raises ValueError, if 2^d-1 can not be factorized (see is_primitive).
+
+    factors: None or dict {d: prime factors of 2^d-1}, used instead of computing factors for those degrees
+    '''
+    from math import gcd
+    if not f & 1:
+        raise ValueError('x is not invertible modulo f, f(0) should be 1')
+    T = 1
+    for h, e in _gf2_sqf(f):
+        t = (e - 1).bit_length()
+        parts = [(h.bit_length() - 1, h)] if _gf2_is_irreducible(h) else _gf2_ddf(h)
+        for d, g in parts:
+            F = _GF2Mod(g)
+            o = 2**d - 1
+            ps = _check_factors(factors[d], d) if factors and d in factors else _mersenne_factors(d)
+            for p in ps:
+                while o % p == 0 and F.pow(2, o//p) == 1:
+                    o //= p
+            o <<= t
+            T = T*o//gcd(T, o)
+    return T
+
+_FPOLY_SEARCH_CACHE = 'primitive_polynomials_search.json'
+
+def _searchCacheFile(cache):
+    '''
+    Path of on-disk cache of search_fpoly, None if cache is disabled
+    '''
+    if cache is False or cache is None:
+        return None
+    if isinstance(cache, string_types):
+        return cache
+    root = os.environ.get('PYLFSR_CACHE_DIR')
+    if root is None:
+        root = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'pylfsr')
+    return os.path.join(root, _FPOLY_SEARCH_CACHE)
+
+def _readSearchCache(fname):
+    import json
+    try:
+        with open(fname, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _writeSearchCache(fname, m, key, polys, complete):
+    '''
+    Add search result to cache file, read again before writing, so entries added by other processes are kept.
+    Cache is written to a temporary file and moved in place, and failure to write is ignored.
+    '''
+    import json
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(fname)), exist_ok=True)
+        data = _readSearchCache(fname)
+        data.setdefault(str(m), {})[key] = {'polys': polys, 'complete': complete}
+        tmp = '%s.%d.tmp' % (fname, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(data, f, sort_keys=True)
+        os.replace(tmp, fname)
+    except OSError:
+        pass
+
+def _fpoly_candidates(m, weight, method='min', seed=None):
+    '''
+    Candidate feedback polynomials [m,...,k] of degree m with given weight (3 or 5) (number of non-zero terms)
+
+    method='min': in increasing order of terms, x^m + x^k + 1 for k=1,2,.. and x^m + x^a + x^b + x^c + 1
+    ordered by (a,b,c), 'random': in random order, without repetitions
+    '''
+    if method == 'min':
+        if weight == 3:
+            for k in range(1, m):
+                yield [m, k]
+        else:
+            for a in range(3, m):
+                for b in range(2, a):
+                    for c in range(1, b):
+                        yield [m, a, b, c]
+    else:
+        import random
+        rng = random.Random(seed)
+        if weight == 3:
+            ks = list(range(1, m))
+            rng.shuffle(ks)
+            for k in ks:
+                yield [m, k]
+        else:
+            total, seen = (m - 1)*(m - 2)*(m - 3)//6, set()
+            while len(seen) < total:
+                p = tuple(sorted(rng.sample(range(1, m), 3), reverse=True))
+                if p not in seen:
+                    seen.add(p)
+                    yield [m] + list(p)
+
+def search_fpoly(m, n=1, weight=None, method='min', seed=None, factors=None, cache=False):
+    '''
+    Search primitive polynomials of degree m (any m > 1), to be used as feedback polynomials
+    ------------------------------------------------------------------------------------------
+    Table of get_fpolyList has degree m < 32 only, for larger m, sparse (trinomials and pentanomials)
+    primitive polynomials are searched, each candidate is verified with is_primitive.
+
+    Parameters
+    ----------
+    m: int > 1, degree of polynomial (length of LFSR)
+    n: int, number of polynomials to return (default=1)
+    weight: None, 3 or 5, number of non-zero terms of polynomial, (default=None)
+        3 : trinomials x^m + x^k + 1, there is no primitive trinomial for some m (e.g. m multiple of 8)
+        5 : pentanomials x^m + x^a + x^b + x^c + 1
+        None: with method='min', trinomials then pentanomials (minimum weight first), with 'random', pentanomials
+    method: 'min' or 'random' (default='min')
+        'min' : smallest terms first, e.g. [64,4,3,1] for m=64
+        'random': random order of candidates, reproducible with seed
+    seed: int or None, seed for method='random'
+    factors: None or list of distinct prime factors of 2^m-1, (see is_primitive)
+    cache: bool or str, (default=False)
+        if False, nothing is read from or written to disk,
+        if True, results of reproducible searches (method='min' or method='random' with seed) are stored in
+        and read from '~/.cache/pylfsr/primitive_polynomials_search.json' (PYLFSR_CACHE_DIR can set directory),
+        if str, path of json file to use as cache. If cache file can not be written, result is returned all the same.
+
+    Returns
+    -------
+    fpoly_list: list of polynomials as [m,...,k], e.g. [[64,4,3,1]], fewer than n, if there are no more
+    primitive polynomials of given weight
+
+    Notes
+    -----
+    Primitivity test needs prime factors of 2^m-1, read from the bundled table for m <= 1024, else computed
+    (and cached for the process), for some large m, factorization can fail (ValueError), factors can be provided,
+    taken from the tables of Cunningham project.
+
+    Example
+    -------
+    >>> search_fpoly(64)
+    [[64, 4, 3, 1]]
+    >>> search_fpoly(127, n=2, weight=3)
+    [[127, 1], [127, 7]]
+    >>> from pylfsr import LFSR
+    >>> L = LFSR(fpoly=search_fpoly(521)[0])
+    >>> # search of degree 1000 takes a few seconds, keep result on disk
+    >>> search_fpoly(1000, cache=True)
+    [[1000, 16, 3, 2]]
+    '''
+    if type(m) != int or m < 2:
+        raise ValueError('m should be int > 1')
+    if method not in ['min', 'random']:
+        raise ValueError("method should be 'min' or 'random'")
+    if weight is None:
+        weights = [3, 5] if method == 'min' else [5]
+    elif weight in [3, 5]:
+        weights = [weight]
+    else:
+        raise ValueError('weight should be None, 3 or 5')
+    weights = [w for w in weights if w == 3 or m > 4]
+    if not weights:
+        raise ValueError('There is no pentanomial of degree %d' % m)
+
+    key = method + ''.join(map(str, weights)) + ('' if seed is None else '_%s' % seed)
+    fname = _searchCacheFile(cache) if (method == 'min' or seed is not None) else None
+    if fname is not None:
+        entry = _readSearchCache(fname).get(str(m), {}).get(key)
+        if entry is not None and (len(entry['polys']) >= n or entry['complete']):
+            return [list(p) for p in entry['polys'][:n]]
+
+    if factors is None:
+        factors = _mersenne_factors(m)
+    polys = []
+    for w in weights:
+        for fpoly in _fpoly_candidates(m, w, method=method, seed=seed):
+            if is_primitive(fpoly, factors=factors):
+                polys.append(fpoly)
+                if len(polys) == n:
+                    break
+        if len(polys) == n:
+            break
+    if fname is not None:
+        _writeSearchCache(fname, m, key, polys, len(polys) < n)
+    return polys
 
 if __name__ == '__main__':
 	import doctest
@@ -0,0 +1,49 @@
+'''
+Shared fixtures of tests: LFSRs with same random initial states (for generator under test and for reference),
+and per-bit reference of combining generators with LFSR.next()
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR
+
+
+@pytest.fixture
+def make_registers():
+    '''
+    make_registers(fpolys, seed) returns a function, each call of which gives fresh LFSRs of fpolys,
+    with same random nonzero initial states
+    '''
+    def factory(fpolys, seed=0):
+        rng = np.random.default_rng(seed)
+        states = []
+        for fp in fpolys:
+            s = rng.integers(0, 2, fp[0])
+            s[0] = 1
+            states.append(s)
+        return lambda: [LFSR(fpoly=fp, initstate=s) for fp, s in zip(fpolys, states)]
+    return factory
+
+
+def _combine_reference(Rs, f, n, lagged=False):
+    out = []
+    for t in range(n):
+        if lagged:
+            if t:
+                _ = [R.next() for R in Rs]
+            x = [int(R.state[-1]) for R in Rs]
+        else:
+            x = [int(R.next()) for R in Rs]
+        out.append(int(f(x)))
+    return out
+
+
+@pytest.fixture
+def combine_reference():
+    '''
+    combine_reference(Rs, f, n, lagged=False): n output bits, each cycle every LFSR of Rs is clocked once
+    with next() and f is applied to list of their output bits.
+    With lagged=True (Geffe, Geffe3), bits are last registers (state[-1]), and LFSRs are clocked before
+    each output bit, except the first one.
+    '''
+    return _combine_reference
@@ -0,0 +1,122 @@
+'''
+Tests for A5/1: published GSM test vector, a port of the reference C implementation (Briceno, Goldberg, Wagner),
+and fast engines (runKCycle, a5_1_keystream, gsm_bursts) against per-cycle next()
+'''
+import numpy as np
+import pytest
+
+from pylfsr import A5_1, a5_1_keystream
+
+KEY = '1223456789ABCDEF'
+FRAME = 0x134
+A_TO_B = '534EAA582FE8151AB6E1855A728C00'
+B_TO_A = '24FD35A35D5FB6526D32F906DF1AC0'
+
+
+class RefA51:
+    '''A5/1 of the reference C code (a5.c), registers as ints'''
+    MASK = (0x07FFFF, 0x3FFFFF, 0x7FFFFF)
+    MID = (0x000100, 0x000400, 0x000400)
+    TAPS = (0x072000, 0x300000, 0x700080)
+    OUT = (0x040000, 0x200000, 0x400000)
+
+    def __init__(self, key, frame):
+        self.R = [0, 0, 0]
+        for i in range(64):
+            self.clock_all()
+            self.load((key[i//8] >> (i & 7)) & 1)
+        for i in range(22):
+            self.clock_all()
+            self.load((frame >> i) & 1)
+        for _ in range(100):
+            self.clock()
+
+    @staticmethod
+    def parity(x):
+        return bin(x).count('1') & 1
+
+    def load(self, bit):
+        self.R = [r ^ bit for r in self.R]
+
+    def step(self, j):
+        self.R[j] = ((self.R[j] << 1) & self.MASK[j]) | self.parity(self.R[j] & self.TAPS[j])
+
+    def clock_all(self):
+        for j in range(3):
+            self.step(j)
+
+    def clock(self):
+        bits = [int(self.R[j] & self.MID[j] != 0) for j in range(3)]
+        maj = int(sum(bits) >= 2)
+        for j in range(3):
+            if bits[j] == maj:
+                self.step(j)
+
+    def getbit(self):
+        return self.parity(self.R[0] & self.OUT[0]) ^ self.parity(self.R[1] & self.OUT[1]) ^ \
+            self.parity(self.R[2] & self.OUT[2])
+
+    def keystream(self, n=228):
+        out = []
+        for _ in range(n):
+            self.clock()
+            out.append(self.getbit())
+        return np.array(out, dtype=np.uint8)
+
+
+def hexbits(bits):
+    return np.packbits(bits).tobytes().hex().upper()
+
+
+def test_reference_port_gives_test_vector():
+    s = RefA51(bytes.fromhex(KEY), FRAME).keystream()
+    assert (hexbits(s[:114]), hexbits(s[114:])) == (A_TO_B, B_TO_A)
+
+
+@pytest.mark.parametrize('key', [KEY, bytes.fromhex(KEY), int(KEY, 16)])
+def test_from_key_frame_test_vector(key):
+    s = A5_1.from_key_frame(key, FRAME).runKCycle(228)
+    assert (hexbits(s[:114]), hexbits(s[114:])) == (A_TO_B, B_TO_A)
+
+
+def test_from_key_frame_next_and_runKCycle_agree():
+    A = A5_1.from_key_frame(KEY, FRAME)
+    B = A5_1.from_key_frame(KEY, FRAME)
+    assert [int(A.next()) for _ in range(300)] == B.runKCycle(300).tolist()
+    assert np.array_equal(A.state, B.state) and A.count == B.count
+
+
+def test_gsm_bursts_match_reference():
+    rng = np.random.default_rng(1)
+    key = rng.integers(0, 256, 8, dtype=np.uint8).tobytes()
+    frames = [0, 1, FRAME, 0x3FFFFF] + rng.integers(0, 1 << 22, 60).tolist()
+    bursts = A5_1.gsm_bursts(key, frames)
+    joined = A5_1.gsm_bursts(key, frames, split=False)
+    assert bursts.shape == (len(frames), 2, 15) and joined.shape == (len(frames), 29)
+    for i, f in enumerate(frames):
+        s = RefA51(key, f).keystream()
+        assert np.array_equal(bursts[i, 0], np.packbits(s[:114]))
+        assert np.array_equal(bursts[i, 1], np.packbits(s[114:]))
+        assert np.array_equal(joined[i], np.packbits(s))
+
+
+@pytest.mark.parametrize('k', [1, 64, 1000])
+def test_runKCycle_matches_next(k):
+    np.random.seed(k)
+    A = A5_1(key='random')
+    B = A5_1(key=A.key)
+    out = np.r_[A.runKCycle(k), A.runKCycle(17)]
+    assert out.tolist() == [int(B.next()) for _ in range(k + 17)]
+    assert np.array_equal(A.state, B.state)
+    assert (A.count, int(A.outbit)) == (B.count, int(B.outbit))
+
+
+def test_keystream_of_many_keys():
+    rng = np.random.default_rng(2)
+    keys = rng.integers(0, 2, (70, 64))
+    seq = a5_1_keystream(keys, 300)
+    packed = a5_1_keystream(keys, 300, packed=True, bitorder='little')
+    assert seq.shape == (70, 300)
+    for i in [0, 1, 33, 63, 64, 69]:
+        assert np.array_equal(seq[i], A5_1(key=keys[i]).runKCycle(300))
+        assert np.array_equal(np.unpackbits(packed[i], count=300, bitorder='little'), seq[i])
@@ -0,0 +1,81 @@
+'''
+Tests for LFSRBank: each register follows LFSR.next(), reset(i) and set_state(i, state) as for LFSR
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR, LFSRBank
+
+FPOLYS = [[5, 2], [5, 3], [5, 4, 3, 2], [5, 4, 2, 1]]
+
+
+def registers(B):
+    fps = B.fpoly if isinstance(B.fpoly[0], list) else [B.fpoly]*B.N
+    return [LFSR(fpoly=list(fp), initstate=B.initstate[i], conf=B.conf, seq_bit_index=B.seq_bit_index,
+                 counter_start_zero=B.counter_start_zero) for i, fp in enumerate(fps)]
+
+
+@pytest.mark.parametrize('conf', ['fibonacci', 'galois'])
+@pytest.mark.parametrize('counter_start_zero', [True, False])
+def test_bank_matches_lfsr(conf, counter_start_zero):
+    np.random.seed(5)
+    B = LFSRBank(fpoly=FPOLYS, initstate='random', conf=conf, counter_start_zero=counter_start_zero)
+    Ls = registers(B)
+    out = B.runKCycle(40)
+    for i, L in enumerate(Ls):
+        assert out[i].tolist() == [L.next() for _ in range(40)]
+        assert np.array_equal(B.state[i], L.state)
+
+
+def test_reset_one_register():
+    B = LFSRBank(fpoly=[7, 1], initstate='random', n=6)
+    init = B.state.copy()
+    B.runKCycle(13)
+    after = B.state.copy()
+    B.reset(3)
+    assert np.array_equal(B.state[3], init[3])
+    assert np.array_equal(np.delete(B.state, 3, 0), np.delete(after, 3, 0))
+    assert B.outbit[3] == -1 and B.count == 13
+
+    B.reset([0, 5])
+    assert np.array_equal(B.state[[0, 5]], init[[0, 5]])
+
+    B.reset()
+    assert np.array_equal(B.state, init) and B.count == 0
+    assert (B.outbit == -1).all()
+
+
+def test_set_state_continues_as_lfsr():
+    B = LFSRBank(fpoly=[5, 2], initstate='ones', n=3)
+    B.runKCycle(4)
+    B.set_state(1, [0, 1, 1, 0, 1])
+    L = LFSR(fpoly=[5, 2], initstate=[0, 1, 1, 0, 1])
+    assert B.runKCycle(20)[1].tolist() == L.runKCycle(20).tolist()
+
+    s = B.set_state(2, 'random', return_state=True)
+    assert np.array_equal(B.state[2], s) and s.any()
+
+
+@pytest.mark.parametrize('counter_start_zero', [True, False])
+def test_reset_and_set_state_keep_returned_bits(counter_start_zero):
+    # output bits returned by next() before reset(i)/set_state(i) are not changed by them
+    B = LFSRBank(fpoly=[5, 2], initstate='random', n=4, counter_start_zero=counter_start_zero)
+    B.runKCycle(3)
+    out = B.next()
+    held = out.copy()
+    B.reset(1)
+    assert np.array_equal(out, held)
+    out = B.next()
+    held = out.copy()
+    B.set_state(2, [1, 0, 0, 1, 0])
+    assert np.array_equal(out, held)
+    expected = -1 if counter_start_zero else 0
+    assert B.outbit[2] == expected and B.feedbackbit[2] == expected
+    assert np.array_equal(np.delete(B.outbit, 2), np.delete(held, 2))
+
+
+@pytest.mark.parametrize('state', [[0, 0, 0, 0, 0], [1, 0, 1], [1, 2, 0, 1, 1]])
+def test_set_state_invalid(state):
+    B = LFSRBank(fpoly=[5, 2], initstate='ones', n=2)
+    with pytest.raises(ValueError):
+        B.set_state(0, state)
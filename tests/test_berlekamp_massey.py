@@ -0,0 +1,125 @@
+'''
+Tests for Berlekamp-Massey linear complexity (berlekamp_massey, BerlekampMassey)
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR, berlekamp_massey, BerlekampMassey
+
+
+def bm_textbook(s):
+    '''Berlekamp-Massey as in Massey (1969), with lists, returns L and linear complexity profile'''
+    n = len(s)
+    C, B = [1] + [0]*n, [1] + [0]*n
+    L, m = 0, -1
+    profile = []
+    for N in range(n):
+        d = s[N]
+        for i in range(1, L + 1):
+            d ^= C[i] & s[N - i]
+        if d:
+            T = C[:]
+            for i in range(N - m, n + 1):
+                C[i] ^= B[i - N + m]
+            if 2*L <= N:
+                L, m, B = N + 1 - L, N, T
+        profile.append(L)
+    return L, profile
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_profile_matches_textbook(seed):
+    rng = np.random.default_rng(seed)
+    s = rng.integers(0, 2, 300).tolist()
+    L, fpoly, profile = berlekamp_massey(s, profile=True)
+    L_ref, profile_ref = bm_textbook(s)
+    assert L == L_ref
+    assert profile.tolist() == profile_ref
+    # random sequence: L close to n/2
+    assert abs(L - 150) <= 10
+
+
+@pytest.mark.parametrize('fpoly', [[5, 2], [9, 4], [17, 3], [23, 18], [16, 15, 13, 4]])
+def test_recovers_feedback_polynomial(fpoly):
+    seq = LFSR(fpoly=fpoly, initstate='random').runKCycle(4*fpoly[0] + 10)
+    L, fp = berlekamp_massey(seq)
+    assert (L, fp) == (fpoly[0], fpoly)
+    # sequence is regenerated by LFSR from fpoly and first L bits
+    R = LFSR(fpoly=fp, initstate=seq[:L][::-1])
+    assert np.array_equal(R.runKCycle(len(seq)), seq)
+
+
+def test_incremental_equals_batch():
+    rng = np.random.default_rng(11)
+    s = rng.integers(0, 2, 500)
+    bm = BerlekampMassey()
+    parts = [bm.extend(s[:7]), bm.extend(s[7:8]), bm.extend(s[8:333]), bm.extend(s[333:])]
+    L, fpoly, profile = berlekamp_massey(s, profile=True)
+    assert np.array_equal(np.concatenate(parts), profile)
+    assert (bm.L, bm.fpoly, bm.n) == (L, fpoly, 500)
+    assert bm.update(1) in (L, 501 - L)
+
+
+def test_input_types_and_edges():
+    assert berlekamp_massey('0000')[0] == 0
+    assert berlekamp_massey([0, 0, 0, 1])[0] == 4
+    assert berlekamp_massey('1110010111') == berlekamp_massey(np.array([1, 1, 1, 0, 0, 1, 0, 1, 1, 1]))
+    with pytest.raises(ValueError):
+        berlekamp_massey([0, 1, 2])
+
+
+def test_stream_bounded_memory():
+    # 10^5 bits, one at a time: L and fpoly are of the LFSR, and only last max_L+1 bits are kept
+    seq = LFSR(fpoly=[23, 18], initstate='random', seq_history=0).generate_bits(10**5).tolist()
+    bm = BerlekampMassey(max_L=64)
+    longest = 0
+    for t, b in enumerate(seq):
+        L = bm.update(b)
+        longest = max(longest, len(bm._buf))
+        if t >= 2*23:
+            assert (L, bm.fpoly) == (23, [23, 18])
+    assert bm.n == 10**5
+    assert longest <= 2*(64 + 1)//8 + 16
+    # without max_L, last max(L, n-L)+1 bits are kept
+    bm = BerlekampMassey()
+    profile = bm.extend(seq)
+    assert (bm.L, bm.fpoly) == (23, [23, 18]) and profile[-1] == 23
+    assert len(bm._buf) <= (10**5 - 23)//8 + 16
+
+
+def test_update_matches_extend_with_max_L():
+    rng = np.random.default_rng(3)
+    s = rng.integers(0, 2, 400).tolist()
+    L_ref, profile_ref = bm_textbook(s)
+    bm = BerlekampMassey(max_L=300)
+    assert [bm.update(b) for b in s] == profile_ref
+    assert bm.L == L_ref
+
+
+def test_max_L_exceeded():
+    rng = np.random.default_rng(5)
+    s = rng.integers(0, 2, 200)
+    L, fpoly, profile = berlekamp_massey(s, profile=True)
+    bm = BerlekampMassey(max_L=20)
+    with pytest.raises(ValueError):
+        bm.extend(s)
+    # bits before the one exceeding max_L are kept, as if given alone
+    n = bm.n
+    assert profile[n] > 20 and profile[n - 1] <= 20
+    assert (bm.L, bm.fpoly) == berlekamp_massey(s[:n])
+    with pytest.raises(ValueError):
+        BerlekampMassey(max_L=-1)
+
+
+@pytest.mark.parametrize('seq, L', [('', 0), ('0000', 0), ('1', 1), ('1000', 1), ('01', 2), ('1000010000100001', 5)])
+def test_fpoly_none_if_not_lfsr_ready(seq, L):
+    # C(x) with less than two terms besides 1 is not a valid fpoly of LFSR
+    assert berlekamp_massey(seq) == (L, None)
+    assert BerlekampMassey(seq).fpoly is None
+
+
+@pytest.mark.parametrize('seq', ['11011011011011', '1100110011001100', '0010111001011100'])
+def test_fpoly_is_lfsr_ready(seq):
+    L, fpoly = berlekamp_massey(seq)
+    s = np.array(list(seq), dtype=int)
+    assert np.array_equal(LFSR(fpoly=fpoly, initstate=s[:L][::-1]).runKCycle(len(s)), s)
@@ -0,0 +1,171 @@
+'''
+Tests for block-based combiner framework (Combiner, FilterGenerator, ShrinkingGenerator, SelfShrinkingGenerator,
+AlternatingStepGenerator), each against a per-bit reference with LFSR.next(), and compiled Boolean functions
+'''
+import itertools
+import numpy as np
+import pytest
+
+from pylfsr import (LFSR, Combiner, FilterGenerator, ShrinkingGenerator, SelfShrinkingGenerator,
+                    AlternatingStepGenerator)
+from pylfsr.seq_generators import _compile_boolfunc, _eval_boolfunc
+
+FPOLYS = [[5, 2], [7, 1], [9, 4], [10, 3], [11, 2], [6, 1], [13, 4, 3, 1], [12, 6, 4, 1]]
+
+
+def anf_eval(anf, x):
+    return sum(all(x[i] for i in mono) for mono in anf) % 2
+
+
+# per-bit references, n output bits (for combiner, see combine_reference in conftest)
+
+def filter_ref(R, taps, f, n):
+    out = []
+    for _ in range(n):
+        out.append(f([int(R.state[i]) for i in taps]))
+        R.next()
+    return out
+
+
+def shrinking_ref(A, S, n):
+    out = []
+    while len(out) < n:
+        a, s = A.next(), S.next()
+        if s:
+            out.append(int(a))
+    return out
+
+
+def self_shrinking_ref(R, n):
+    out = []
+    while len(out) < n:
+        x0, x1 = R.next(), R.next()
+        if x0:
+            out.append(int(x1))
+    return out
+
+
+def asg_ref(C, R1, R2, n):
+    out, r1, r2 = [], 0, 0
+    for _ in range(n):
+        if C.next():
+            r1 = int(R1.next())
+        else:
+            r2 = int(R2.next())
+        out.append(r1 ^ r2)
+    return out
+
+
+def run_in_parts(G, n, block_size=None):
+    if block_size:
+        G.block_size = block_size
+    return np.r_[G.runKCycle(n//3), G.next(), G.runKCycle(n - n//3 - 1)].tolist()
+
+
+def same_states(Rs, Gs):
+    return all(np.array_equal(R.state, G.state) for R, G in zip(Rs, Gs))
+
+
+@pytest.mark.parametrize('n_in', [2, 3, 5])
+def test_combiner_table(n_in, make_registers, combine_reference):
+    regs = make_registers(FPOLYS[:n_in], n_in)
+    table = np.random.default_rng(n_in).integers(0, 2, 2**n_in)
+    G = Combiner(regs(), table=table)
+    Rs = regs()
+    ref = combine_reference(Rs, lambda x: int(table[sum(b << i for i, b in enumerate(x))]), 3000)
+    assert run_in_parts(G, 3000, block_size=256) == ref
+    assert same_states(Rs, G.LFSR_list)
+
+
+def test_combiner_geffe_anf_equals_table(make_registers):
+    regs = make_registers(FPOLYS[:3], 7)
+    a = Combiner(regs(), anf=[(0, 1), (2,), (0, 2)]).runKCycle(2000)
+    b = Combiner(regs(), table=[0, 0, 0, 1, 1, 0, 1, 1]).runKCycle(2000)
+    x = [R.runKCycle(2000) for R in regs()]
+    assert np.array_equal(a, b)
+    assert np.array_equal(a, np.where(x[0] == 1, x[1], x[2]))
+
+
+def test_combiner_many_inputs_anf(make_registers, combine_reference):
+    # more than 16 inputs: ANF evaluated directly
+    regs = make_registers([FPOLYS[i % len(FPOLYS)] for i in range(18)], 3)
+    anf = [(0, 17), (5,), (3, 4, 5), (5,), (1, 2, 9, 16)]
+    G = Combiner(regs(), anf=anf)
+    assert G.table is None and sorted(G.monomials) == sorted([1 | 1 << 17, 8 | 16 | 32, 2 | 4 | 512 | 1 << 16])
+    assert run_in_parts(G, 500) == combine_reference(regs(), lambda x: anf_eval(anf, x), 500)
+
+
+def test_filter_generator(make_registers):
+    taps = [0, 3, 7, 12]
+    anf = [(0, 1), (2, 3), (1,), (0, 2, 3)]
+    regs = make_registers([[13, 4, 3, 1]], 4)
+    G = FilterGenerator(regs()[0], taps=taps, anf=anf)
+    R = regs()[0]
+    assert run_in_parts(G, 2500, block_size=100) == filter_ref(R, taps, lambda x: anf_eval(anf, x), 2500)
+    assert np.array_equal(G.state, R.state)
+
+
+@pytest.mark.parametrize('conf', ['fibonacci', 'galois'])
+def test_filter_generator_galois_negative_taps(conf):
+    R0 = LFSR(fpoly=[11, 2], initstate='random', conf=conf)
+    init = R0.state.copy()
+    taps, table = [-1, 4, 2], [0, 1, 1, 0, 1, 0, 0, 1]
+    G = FilterGenerator(R0, taps=taps, table=table)
+    R = LFSR(fpoly=[11, 2], initstate=init, conf=conf)
+    ref = filter_ref(R, [10, 4, 2], lambda x: table[x[0] + 2*x[1] + 4*x[2]], 700)
+    assert G.runKCycle(700).tolist() == ref
+
+
+def test_shrinking_generator(make_registers):
+    regs = make_registers([[9, 4], [7, 1]], 5)
+    G = ShrinkingGenerator(*regs())
+    A, S = regs()
+    assert run_in_parts(G, 3000, block_size=128) == shrinking_ref(A, S, 3000)
+    assert same_states([A, S], G.LFSR_list) and A.count == G.A.count
+
+
+def test_self_shrinking_generator(make_registers):
+    regs = make_registers([[10, 3]], 6)
+    G = SelfShrinkingGenerator(regs()[0])
+    R = regs()[0]
+    assert run_in_parts(G, 2000, block_size=100) == self_shrinking_ref(R, 2000)
+    assert np.array_equal(G.R.state, R.state) and G.R.count == R.count
+
+
+def test_alternating_step_generator(make_registers):
+    regs = make_registers([[5, 2], [9, 4], [11, 2]], 8)
+    G = AlternatingStepGenerator(*regs())
+    C, R1, R2 = regs()
+    assert run_in_parts(G, 3000, block_size=64) == asg_ref(C, R1, R2, 3000)
+    assert same_states([C, R1, R2], G.LFSR_list)
+
+
+def test_shrinking_zero_selection():
+    with pytest.raises(ValueError):
+        A, S = LFSR(fpoly=[5, 2]), LFSR(fpoly=[5, 2])
+        S.state = np.zeros(5, dtype=int)
+        ShrinkingGenerator(A, S)
+
+
+@pytest.mark.parametrize('n', [1, 2, 4, 6])
+def test_compiled_anf_matches_truth_table(n):
+    rng = np.random.default_rng(n)
+    monos = [tuple(np.flatnonzero(rng.integers(0, 2, n))) for _ in range(3*n)]
+    table, _ = _compile_boolfunc(n, anf=monos)
+    for x in itertools.product([0, 1], repeat=n):
+        assert table[sum(b << i for i, b in enumerate(x))] == anf_eval(monos, x)
+    bits = [rng.integers(0, 2, 50).astype(np.uint8) for _ in range(n)]
+    direct = [anf_eval(monos, col) for col in zip(*bits)]
+    assert _eval_boolfunc(table, None, bits).tolist() == direct
+
+
+def test_compile_errors():
+    with pytest.raises(ValueError):
+        _compile_boolfunc(2)
+    with pytest.raises(ValueError):
+        _compile_boolfunc(2, table=[0, 1, 1], anf=[(0,)])
+    with pytest.raises(ValueError):
+        _compile_boolfunc(2, table=[0, 1, 2, 0])
+    with pytest.raises(ValueError):
+        _compile_boolfunc(2, anf=[(0, 2)])
+    assert _compile_boolfunc(2, table=0b0110)[0].tolist() == [0, 1, 1, 0]
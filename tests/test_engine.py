@@ -0,0 +1,87 @@
+'''
+Tests for the fast engines of LFSR (packed-integer stepping, block generation of generate_bits, packed output):
+all must give exactly the same output, state, count and seq as calling next() cycle by cycle
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR
+
+CASES = [
+    # fpoly, conf, seq_bit_index, counter_start_zero
+    ([5, 2], 'fibonacci', -1, True),
+    ([5, 2], 'galois', -1, True),
+    ([7, 6, 5, 4], 'fibonacci', 2, False),
+    ([8, 6, 5, 4], 'galois', 0, False),
+    ([23, 18], 'fibonacci', -1, True),
+    ([12, 6, 4, 1], 'galois', 5, True),
+]
+
+
+def make(fpoly, conf, idx, csz, initstate):
+    return LFSR(fpoly=list(fpoly), initstate=initstate, conf=conf, seq_bit_index=idx, counter_start_zero=csz)
+
+
+def reference(L, k):
+    '''k cycles of next(), output bits'''
+    return np.array([L.next() for _ in range(k)], dtype=int)
+
+
+def same_lfsr(A, B):
+    assert np.array_equal(A.state, B.state)
+    assert A.count == B.count
+    assert int(A.outbit) == int(B.outbit)
+    assert int(A.feedbackbit) == int(B.feedbackbit)
+    assert np.array_equal(A.seq, B.seq)
+
+
+@pytest.mark.parametrize('fpoly, conf, idx, csz', CASES)
+@pytest.mark.parametrize('k', [1, 3, 40, 1000, 5000])
+def test_runKCycle_matches_next(fpoly, conf, idx, csz, k):
+    rng = np.random.default_rng(k + fpoly[0])
+    init = rng.integers(0, 2, fpoly[0])
+    init[0] = 1
+    A, B = make(fpoly, conf, idx, csz, init), make(fpoly, conf, idx, csz, init)
+    # in two calls, so second call continues from the state left by the first
+    out = np.r_[A.runKCycle(k), A.runKCycle(k//2 + 1)]
+    ref = reference(B, k + k//2 + 1)
+    assert np.array_equal(out, ref)
+    same_lfsr(A, B)
+
+
+@pytest.mark.parametrize('bitorder', ['big', 'little'])
+def test_packed_output(bitorder):
+    A = LFSR(fpoly=[9, 4], initstate='ones')
+    B = LFSR(fpoly=[9, 4], initstate='ones')
+    for k in [5, 8, 13, 3001]:
+        packed = A.runKCycle(k, packed=True, bitorder=bitorder)
+        bits = B.runKCycle(k)
+        assert packed.dtype == np.uint8 and len(packed) == (k + 7)//8
+        assert np.array_equal(np.unpackbits(packed, count=k, bitorder=bitorder), bits)
+
+
+def test_generate_bits_dtypes():
+    L = LFSR(fpoly=[11, 2], initstate='random')
+    init = L.state.copy()
+    a = L.generate_bits(10000, dtype=np.uint8)
+    L = LFSR(fpoly=[11, 2], initstate=init)
+    b = L.generate_bits(10000, dtype='packed', bitorder='little')
+    assert a.dtype == np.uint8
+    assert np.array_equal(np.unpackbits(b, count=10000, bitorder='little'), a)
+
+
+def test_run_full_period_is_m_sequence():
+    L = LFSR(fpoly=[10, 3], initstate='ones', seq_history=0)
+    p = L.runFullPeriod()
+    assert len(p) == 2**10 - 1
+    assert p.sum() == 2**9
+    assert np.array_equal(L.state, np.ones(10))
+    # period is exact: next period is the same
+    assert np.array_equal(L.runFullPeriod(), p)
+
+
+def test_verbose_register_uses_next(capsys):
+    A = LFSR(fpoly=[5, 2], initstate='ones', verbose=True)
+    B = LFSR(fpoly=[5, 2], initstate='ones')
+    assert np.array_equal(A.runKCycle(10), B.runKCycle(10))
+    assert 'S: ' in capsys.readouterr().out
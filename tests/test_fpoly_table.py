@@ -0,0 +1,54 @@
+'''
+Tests for the table of primitive polynomials: npz index (built by tools/build_tables.py fpoly) vs text table
+'''
+import os
+import numpy as np
+import pytest
+
+import pylfsr.utils as utils
+from pylfsr.utils import get_fpolyList, is_primitive
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(utils, '_fpolyCache', {})
+    monkeypatch.setattr(utils, '_fpolyIndex', [])
+
+
+def test_npz_index_matches_text_table(tmp_path):
+    txt = utils._loadFpolyTxt()
+    fname = str(tmp_path / 'index.npz')
+    utils._saveFpolyIndex(txt, fname)
+    shipped = os.path.join(os.path.dirname(utils.__file__), utils._FPOLY_NPZ)
+    with np.load(fname) as built, np.load(shipped) as z:
+        assert sorted(built.files) == sorted(z.files)
+        for k in z.files:
+            assert np.array_equal(built[k], z[k]), k
+
+
+def test_loaded_list_matches_text_table(fresh_cache):
+    assert utils._loadFpolyList() == utils._loadFpolyTxt()
+
+
+def test_text_fallback_without_npz(fresh_cache, monkeypatch):
+    monkeypatch.setattr(utils, '_FPOLY_NPZ', 'no_such_index.npz')
+    assert get_fpolyList(7) == utils._loadFpolyTxt()[7]
+    assert utils._fpolyIndex == [None]
+    assert sorted(get_fpolyList()) == sorted(utils._loadFpolyTxt())
+
+
+def test_npz_is_closed_after_reading(fresh_cache, recwarn):
+    import gc
+    get_fpolyList(13)
+    get_fpolyList()
+    gc.collect()
+    assert not [w for w in recwarn if issubclass(w.category, ResourceWarning)]
+    assert all(isinstance(d, int) for d in utils._fpolyIndex[0])
+
+
+@pytest.mark.parametrize('m', [2, 5, 16, 31])
+def test_table_polynomials_are_primitive(m):
+    fl = get_fpolyList(m)
+    assert fl and all(f[0] == m for f in fl)
+    for f in fl[:: max(1, len(fl)//8)]:
+        assert is_primitive(f)
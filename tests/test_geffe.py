@@ -0,0 +1,79 @@
+'''
+Tests for Geffe generator (K LFSRs selected by clocking LFSR), block mode against a per-bit reference
+'''
+import numpy as np
+import pytest
+
+from pylfsr import Geffe
+
+FPOLYS = [[5, 2], [7, 1], [6, 1], [9, 4], [10, 3], [11, 2], [3, 2], [4, 3]]
+CLOCK = [13, 4, 3, 1]
+
+
+def selector(cLFSR, m):
+    '''f of Geffe: each cycle, m output bits of clocking LFSR (first as most significant) select one of K bits'''
+    def f(x):
+        sel = 0
+        for _ in range(m):
+            sel = 2*sel + int(cLFSR.next())
+        return x[sel]
+    return f
+
+
+def geffe(Rs):
+    '''Geffe of K LFSRs and clocking LFSR, Rs[-1]'''
+    return Geffe(Rs[:-1], Rs[-1])
+
+
+def geffe_reference(Rs, n, combine_reference):
+    '''Rs: K LFSRs and clocking LFSR'''
+    return combine_reference(Rs[:-1], selector(Rs[-1], int(np.log2(len(Rs) - 1))), n, lagged=True)
+
+
+@pytest.mark.parametrize('K', [2, 4, 8])
+@pytest.mark.parametrize('n', [1, 10, 3000])
+def test_runKCycle_matches_reference(K, n, make_registers, combine_reference):
+    regs = make_registers(FPOLYS[:K] + [CLOCK], 10*K + n)
+    Rs = regs()
+    G = geffe(regs())
+    out = np.r_[G.runKCycle(n), G.runKCycle(5)]
+    assert out.tolist() == geffe_reference(Rs, n + 5, combine_reference)
+    assert np.array_equal(G.state_k, np.hstack([R.state for R in Rs[:-1]]))
+    assert np.array_equal(G.state_c, Rs[-1].state)
+    # registers are advanced by jump, seq of each is same as by next()
+    assert all(np.array_equal(R.seq, Rr.seq) for R, Rr in zip(G.LFSR_list, Rs))
+    assert all(R.count == Rr.count for R, Rr in zip(G.LFSR_list, Rs))
+    assert G.count == n + 5 and G.m_count == (n + 5)*int(np.log2(K))
+
+
+def test_next_matches_runKCycle(make_registers):
+    regs = make_registers(FPOLYS[:4] + [CLOCK], 1)
+    A, B = geffe(regs()), geffe(regs())
+    assert [int(A.next()) for _ in range(200)] == B.runKCycle(200).tolist()
+    assert np.array_equal(A.seq, B.seq)
+    assert A.sel_k == B.sel_k
+
+
+def test_small_block_size(make_registers):
+    regs = make_registers(FPOLYS + [CLOCK], 2)
+    A, B = geffe(regs()), geffe(regs())
+    A.block_size = 64
+    assert np.array_equal(A.runKCycle(1000), B.runKCycle(1000))
+    assert np.array_equal(A.state, B.state)
+
+
+def test_K_must_be_power_of_2(make_registers):
+    Rs = make_registers(FPOLYS[:4] + [CLOCK], 3)()
+    with pytest.raises(AssertionError):
+        Geffe(Rs[:3], Rs[-1])
+
+
+def test_seq_of_registers_with_other_output_register(make_registers, combine_reference):
+    # seq_bit_index of a register is not the last one (selected bit), its seq is still as by next()
+    regs = make_registers(FPOLYS[:2] + [CLOCK], 4)
+    Rs, Rr = regs(), regs()
+    for R in Rs[:-1] + Rr[:-1]:
+        R.set_seq_bit_index(0)
+    G = geffe(Rs)
+    assert G.runKCycle(700).tolist() == geffe_reference(Rr, 700, combine_reference)
+    assert all(np.array_equal(R.seq, Q.seq) for R, Q in zip(Rs, Rr))
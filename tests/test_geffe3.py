@@ -0,0 +1,77 @@
+'''
+Tests for Geffe3: combining function f(x1,x2,x3) = x1 x2 + (1+x1) x3, (x2 if x1 else x3)
+'''
+import itertools
+import numpy as np
+import pytest
+
+from pylfsr import LFSR, Geffe3
+from pylfsr.utils import berlekamp_massey
+
+FPOLYS = ([5, 2], [7, 1], [11, 2])
+
+
+def geffe3(x):
+    return x[1] if x[0] else x[2]
+
+
+@pytest.mark.parametrize('x1, x2, x3', list(itertools.product([0, 1], repeat=3)))
+def test_truth_table(x1, x2, x3):
+    # first output is from last bit of initial state of each register
+    G = Geffe3(*[LFSR(fpoly=[2, 1], initstate=[1, x]) for x in (x1, x2, x3)])
+    assert int(G.outbit) == (x1 & x2) ^ ((1 - x1) & x3)
+
+
+@pytest.mark.parametrize('n', [1, 2, 500, 5000])
+def test_runKCycle_matches_reference(n, make_registers, combine_reference):
+    regs = make_registers(FPOLYS, n)
+    G = Geffe3(*regs())
+    ref = combine_reference(regs(), geffe3, n + 7, lagged=True)
+    # first output is computed in __init__, as next() of count 0
+    out = [int(G.outbit)] + G.runKCycle(n + 6).tolist()
+    assert out == ref
+
+
+def test_next_matches_runKCycle(make_registers):
+    regs = make_registers(FPOLYS, 4)
+    A, B = Geffe3(*regs()), Geffe3(*regs())
+    assert [int(A.next()) for _ in range(300)] == B.runKCycle(300).tolist()
+    assert np.array_equal(A.state, B.state) and A.count == B.count
+    assert np.array_equal(A.seq, B.seq)
+
+
+def test_small_block_size_and_verbose(make_registers):
+    regs = make_registers(FPOLYS, 6)
+    A, B, C = Geffe3(*regs()), Geffe3(*regs()), Geffe3(*regs())
+    A.block_size = 50
+    # verbose register: cycles are run with next(), printing its state
+    C.R2.verbose = True
+    out = B.runKCycle(400).tolist()
+    assert A.runKCycle(400).tolist() == out
+    assert C.runKCycle(400).tolist() == out
+    for G in (A, C):
+        assert np.array_equal(G.state, B.state) and np.array_equal(G.seq, B.seq)
+        assert all(np.array_equal(R.seq, Rb.seq) for R, Rb in zip(G.LFSR_list, B.LFSR_list))
+
+
+def test_correlation_with_x2_and_x3(make_registers):
+    # output agrees with x2 and with x3 in about 3/4 of the bits (basis of correlation attack on Geffe)
+    regs = make_registers(([13, 4, 3, 1], [14, 5, 3, 1], [15, 1]), 5)
+    n = 2**14
+    G = Geffe3(*regs())
+    out = np.r_[G.outbit, G.runKCycle(n - 1)]
+    x = [R.runKCycle(n) for R in regs()]
+    assert abs(np.mean(out == x[1]) - 0.75) < 0.02
+    assert abs(np.mean(out == x[2]) - 0.75) < 0.02
+    assert np.array_equal(out[x[0] == 1], x[1][x[0] == 1])
+    assert np.array_equal(out[x[0] == 0], x[2][x[0] == 0])
+
+
+@pytest.mark.parametrize('fpolys', [([2, 1], [3, 2], [5, 2]), ([3, 2], [4, 3], [5, 3]), ([4, 3], [3, 2], [5, 2]),
+                                    ([7, 1], [5, 2], [3, 2]), ([5, 2], [7, 1], [11, 2])])
+def test_linear_complexity(fpolys, make_registers):
+    # x1 x2 + x3 + x1 x3 of m-sequences of pairwise coprime lengths: n1 n2 + (n1 + 1) n3
+    n1, n2, n3 = [fp[0] for fp in fpolys]
+    G = Geffe3(*make_registers(fpolys, 1)())
+    out = np.r_[G.outbit, G.runKCycle(599)]
+    assert berlekamp_massey(out)[0] == n1*n2 + (n1 + 1)*n3
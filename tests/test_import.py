@@ -0,0 +1,40 @@
+'''
+Tests for lazy import of matplotlib: importing pylfsr (and using it without plots) does not import matplotlib
+'''
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(code):
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''), MPLBACKEND='Agg')
+    return subprocess.check_output([sys.executable, '-c', code], env=env).decode().split()
+
+
+def test_import_does_not_load_matplotlib():
+    out = run("import sys, pylfsr; print('matplotlib' in sys.modules)")
+    assert out == ['False']
+
+
+def test_no_plot_usage_does_not_load_matplotlib():
+    code = ("import sys\n"
+            "from pylfsr import LFSR\n"
+            "L = LFSR(fpoly=[7,1])\n"
+            "L.test_properties(verbose=0)\n"
+            "L.autocorr_property(L.runFullPeriod(), plot=False)\n"
+            "print('matplotlib' in sys.modules)")
+    assert run(code) == ['False']
+
+
+def test_plot_imports_matplotlib_when_needed():
+    pytest.importorskip('matplotlib')
+    code = ("import sys\n"
+            "from pylfsr import LFSR\n"
+            "L = LFSR(fpoly=[5,2])\n"
+            "L.Viz(show=False)\n"
+            "print('matplotlib' in sys.modules)")
+    assert run(code) == ['True']
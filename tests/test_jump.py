@@ -0,0 +1,53 @@
+'''
+Tests for LFSR.jump, jump ahead of k cycles over GF(2), against running next() k times
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR
+
+
+@pytest.mark.parametrize('conf', ['fibonacci', 'galois'])
+@pytest.mark.parametrize('counter_start_zero', [True, False])
+@pytest.mark.parametrize('k', [1, 2, 7, 31, 100, 777])
+def test_jump_matches_next(conf, counter_start_zero, k):
+    kw = dict(fpoly=[7, 4, 3, 2], initstate=[1, 0, 0, 1, 1, 0, 1], conf=conf, counter_start_zero=counter_start_zero)
+    A, B = LFSR(**kw), LFSR(**kw)
+    A.jump(k)
+    for _ in range(k):
+        B.next()
+    assert np.array_equal(A.state, B.state)
+    assert (A.count, int(A.outbit), int(A.feedbackbit)) == (B.count, int(B.outbit), int(B.feedbackbit))
+    # and both continue the same
+    assert np.array_equal(A.runKCycle(50), B.runKCycle(50))
+
+
+def test_jump_full_period_and_huge_k():
+    L = LFSR(fpoly=[23, 18], initstate='random')
+    S = L.state.copy()
+    L.jump(L.expectedPeriod)
+    assert np.array_equal(L.state, S)
+
+    # k = 10^12 = q*T + r, same as jumping r
+    T = L.expectedPeriod
+    A, B = LFSR(fpoly=[23, 18], initstate=S), LFSR(fpoly=[23, 18], initstate=S)
+    A.jump(10**12)
+    B.jump(10**12 % T)
+    assert np.array_equal(A.state, B.state)
+    assert A.count == 10**12
+
+
+def test_jump_non_primitive():
+    # x^6 + x^3 + 1 is not primitive, period of state 100000 is 9
+    L = LFSR(fpoly=[6, 3], initstate=[1, 0, 0, 0, 0, 0])
+    S = L.state.copy()
+    L.jump(9)
+    assert np.array_equal(L.state, S)
+
+
+def test_jump_zero_and_negative():
+    L = LFSR()
+    L.jump(0)
+    assert L.count == 0
+    with pytest.raises(ValueError):
+        L.jump(-1)
@@ -0,0 +1,94 @@
+'''
+Tests for Lempel-Ziv complexity: LZ78 (trie) and LZ76 (suffix automaton) against direct parsing
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR, lempel_ziv_complexity, lempel_ziv_patterns
+
+
+def lz78_patterns_slicing(s):
+    '''LZ78 parsing with substring lookups, as in earlier versions of lempel_ziv_patterns'''
+    patterns = set()
+    i, k = 0, 1
+    while i + k <= len(s):
+        if s[i:i + k] in patterns:
+            k += 1
+        else:
+            patterns.add(s[i:i + k])
+            i += k
+            k = 1
+    return patterns
+
+
+def lz76_kaspar_schuster(s):
+    '''LZ76 complexity, Kaspar and Schuster (1987) algorithm, O(n^2)'''
+    n = len(s)
+    if n < 2:
+        return n
+    c, l, i, k, k_max = 1, 1, 0, 1, 1
+    while True:
+        if s[i + k - 1] == s[l + k - 1]:
+            k += 1
+            if l + k > n:
+                c += 1
+                break
+        else:
+            k_max = max(k, k_max)
+            i += 1
+            if i == l:
+                c += 1
+                l += k_max
+                if l + 1 > n:
+                    break
+                i, k, k_max = 0, 1, 1
+            else:
+                k = 1
+    return c
+
+
+def test_docstring_example():
+    s = '1001111011000010'
+    assert lempel_ziv_patterns(s) == {'1', '0', '01', '11', '10', '110', '00', '010'}
+    assert lempel_ziv_complexity(s) == 8
+
+
+@pytest.mark.parametrize('n', [1, 2, 17, 256, 3001])
+def test_lz78_matches_slicing(n):
+    rng = np.random.default_rng(n)
+    bits = rng.integers(0, 2, n).astype(np.uint8)
+    s = ''.join(map(str, bits))
+    ref = lz78_patterns_slicing(s)
+    assert lempel_ziv_patterns(s) == ref
+    assert lempel_ziv_patterns(bits) == ref
+    assert lempel_ziv_complexity(bits) == len(ref)
+    assert lempel_ziv_complexity(list(bits)) == len(ref)
+
+
+@pytest.mark.parametrize('s', ['0', '01', '0001101001000101', '1010101010', '1111111111',
+                               '0110100110010110', '10011110110000101'])
+def test_lz76_known_strings(s):
+    assert lempel_ziv_complexity(s, method='lz76') == lz76_kaspar_schuster(s)
+
+
+def test_lz76_random_and_lfsr():
+    rng = np.random.default_rng(3)
+    for n in [50, 333, 2000]:
+        bits = rng.integers(0, 2, n).astype(np.uint8)
+        assert lempel_ziv_complexity(bits, method='lz76') == lz76_kaspar_schuster(bits.tolist())
+    seq = LFSR(fpoly=[9, 4], initstate='ones').runKCycle(1500).astype(np.uint8)
+    assert lempel_ziv_complexity(seq, method='lz76') == lz76_kaspar_schuster(seq.tolist())
+
+
+@pytest.mark.parametrize('method', ['lz78', 'lz76'])
+@pytest.mark.parametrize('bitorder', ['big', 'little'])
+def test_packed_input(method, bitorder):
+    bits = np.random.default_rng(9).integers(0, 2, 800).astype(np.uint8)
+    packed = np.packbits(bits, bitorder=bitorder)
+    assert lempel_ziv_complexity(packed, method=method, packed=True, bitorder=bitorder) == \
+        lempel_ziv_complexity(bits, method=method)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        lempel_ziv_complexity('0101', method='lz77')
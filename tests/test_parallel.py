@@ -0,0 +1,24 @@
+'''
+Tests for generate_parallel: chunks generated by worker processes (each from jump) form the serial sequence
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR, generate_parallel
+
+
+@pytest.mark.parametrize('n_jobs, chunk_size', [(1, 1000), (2, None), (3, 777)])
+def test_generate_parallel_matches_serial(n_jobs, chunk_size):
+    kw = dict(fpoly=[17, 3], initstate='ones')
+    seq = generate_parallel(10000, start=123, n_jobs=n_jobs, chunk_size=chunk_size, **kw)
+    ref = LFSR(**kw).runKCycle(10123)[123:]
+    assert seq.dtype == np.uint8
+    assert np.array_equal(seq, ref)
+
+
+def test_generate_parallel_to_npy(tmp_path):
+    fname = str(tmp_path / 'seq.npy')
+    seq = generate_parallel(5000, fpoly=[11, 2], n_jobs=2, chunk_size=1024, fname=fname)
+    ref = LFSR(fpoly=[11, 2], initstate='ones').runKCycle(5000)
+    assert np.array_equal(np.load(fname), ref)
+    assert np.array_equal(seq, ref)
@@ -0,0 +1,80 @@
+'''
+Tests for period of LFSR (get_period, compute_period)
+'''
+import time
+import warnings
+import numpy as np
+import pytest
+
+import pylfsr.utils as utils
+from pylfsr import LFSR
+
+
+def brute_period(L):
+    '''period of state, by running LFSR until a state repeats (small N only)'''
+    seen = {}
+    S = L.state.copy()
+    t = 0
+    while S.tobytes() not in seen:
+        seen[S.tobytes()] = t
+        L.next()
+        S = L.state.copy()
+        t += 1
+    return t - seen[S.tobytes()]
+
+
+@pytest.mark.parametrize('fpoly', [[4, 2], [6, 3], [6, 4, 3, 1], [5, 2], [8, 6, 5, 4], [7, 5, 4, 2]])
+@pytest.mark.parametrize('conf', ['fibonacci', 'galois'])
+def test_compute_period_matches_brute_force(fpoly, conf):
+    rng = np.random.default_rng(len(fpoly)*31 + fpoly[0])
+    for _ in range(4):
+        state = rng.integers(0, 2, fpoly[0])
+        if not state.any():
+            state[0] = 1
+        L = LFSR(fpoly=list(fpoly), initstate=state, conf=conf)
+        T = brute_period(LFSR(fpoly=list(fpoly), initstate=state, conf=conf))
+        assert L.compute_period() == T
+        assert L.compute_period(method='brent') == T
+        assert L.get_period() == T
+
+
+def test_primitive_period_is_expected():
+    L = LFSR(fpoly=[127, 1])
+    assert L.get_period() == 2**127 - 1
+
+
+def test_large_M_without_factors_does_not_hang(monkeypatch):
+    # factorization of 2^M-1 not available: no cycle detection over ~2^M states
+    def no_factors(M):
+        raise ValueError('Could not factorize 2^%d-1' % M)
+    monkeypatch.setattr(utils, '_mersenne_factors', no_factors)
+    L = LFSR(fpoly=[257, 12])
+    t0 = time.time()
+    with pytest.raises(ValueError, match='factors'):
+        L.compute_period()
+    with pytest.raises(ValueError, match='too large'):
+        L.compute_period(method='brent')
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        assert L.get_period() == L.expectedPeriod
+    assert len(w) == 1
+    assert L.get_period() == 2**257 - 1
+    assert time.time() - t0 < 5
+
+
+def test_small_period_falls_back_to_cycle_detection(monkeypatch):
+    def no_factors(M):
+        raise ValueError('Could not factorize 2^%d-1' % M)
+    monkeypatch.setattr(utils, '_mersenne_factors', no_factors)
+    L = LFSR(fpoly=[6, 3], initstate=[1, 0, 0, 1, 0, 0])
+    T = brute_period(LFSR(fpoly=[6, 3], initstate=[1, 0, 0, 1, 0, 0]))
+    assert L.compute_period() == T
+
+
+def test_compute_period_with_given_factors(monkeypatch):
+    monkeypatch.setattr(utils, '_mersenne_factors', lambda M: (_ for _ in ()).throw(ValueError('no')))
+    # 2^31-1 is prime
+    L = LFSR(fpoly=[31, 3])
+    assert L.compute_period(factors=[2**31 - 1]) == 2**31 - 1
+    with pytest.raises(ValueError):
+        L.compute_period(factors=[3])
@@ -0,0 +1,81 @@
+'''
+Tests for primitivity of feedback polynomials (is_primitive, search_fpoly) and factor table of 2^M-1
+'''
+import time
+import pytest
+
+import pylfsr.utils as utils
+from pylfsr import LFSR
+from pylfsr.utils import is_primitive, is_irreducible, search_fpoly, get_fpolyList
+
+# Phi_d(2) not completely factored in the Cunningham tables, see tools/build_tables.py
+UNFACTORED = {821, 823, 827, 853, 857, 859, 863, 877, 887, 899, 913, 919, 923, 929, 935, 937, 941,
+              947, 953, 959, 961, 973, 985, 991, 1007, 1009, 1013, 1019}
+
+
+def test_factor_table_is_complete_and_prime():
+    table = utils._loadMersenneFactors()
+    for M in range(1, 1025):
+        if any(d in UNFACTORED for d in utils._divisors(M)):
+            continue
+        n = 2**M - 1
+        for p in utils._mersenne_factors(M):
+            assert utils._is_probable_prime(p)
+            assert n % p == 0
+            while n % p == 0:
+                n //= p
+        assert n == 1, M
+    assert not UNFACTORED & set(table)
+
+
+@pytest.mark.parametrize('M', [257, 997, 1000, 1023, 1024])
+def test_large_degree_factors_from_table(M):
+    utils._mersenne_factors.cache_clear()
+    t = time.perf_counter()
+    fs = utils._mersenne_factors(M)
+    assert time.perf_counter() - t < 1
+    n = 2**M - 1
+    for p in fs:
+        while n % p == 0:
+            n //= p
+    assert n == 1
+
+
+@pytest.mark.parametrize('fpoly, expected', [
+    ([257, 12], True),        # trinomial x^257+x^12+1
+    ([1000, 16, 3, 2], True),
+    ([1000, 4, 3, 1], False),
+    ([1023, 7], True),
+    ([1023, 43], True),
+])
+def test_is_primitive_large_degree(fpoly, expected):
+    assert is_primitive(fpoly) is expected
+
+
+def test_given_factors_agree_with_table():
+    f = [1023, 127]
+    assert is_irreducible(f)
+    assert is_primitive(f, factors=list(utils._mersenne_factors(1023)))
+    with pytest.raises(ValueError):
+        is_primitive(f, factors=[7, 23])
+
+
+def test_search_fpoly_1000():
+    (f,) = search_fpoly(1000, cache=False)
+    assert f[0] == 1000
+    assert is_primitive(f)
+    L = LFSR(fpoly=f)
+    assert L.expectedPeriod == 2**1000 - 1
+
+
+def test_small_degrees_agree_with_table():
+    for m in range(2, 17):
+        for f in get_fpolyList(m)[:20]:
+            assert is_primitive(f)
+
+
+def test_unfactored_degree_needs_factors():
+    # 2^821-1 has a composite cofactor of 570 bits, not in the table
+    M = 821
+    assert M in UNFACTORED
+    assert M not in utils._loadMersenneFactors()
@@ -0,0 +1,116 @@
+'''
+Tests for LFSR properties (test_suite on packed bytes vs balance/runlength/autocorr properties on bits)
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR
+from pylfsr.pylfsr import _packed_ones, _packed_runs
+
+
+def period_bits(fpoly):
+    L = LFSR(fpoly=fpoly, initstate='ones')
+    return L, L.generate_bits(L.expectedPeriod)
+
+
+@pytest.mark.parametrize('fpoly', [[5, 2], [7, 1], [9, 4], [6, 3], [8, 4, 3, 2], [11, 2]])
+def test_test_suite_matches_properties(fpoly):
+    L, p = period_bits(fpoly)
+    res = L.test_suite()
+    r2, (N1s, N0s) = L.balance_property(p)
+    r3, runs = L.runlength_property(p)
+    r4, _ = L.autocorr_property(p, lags=np.arange(1, len(p)))
+    assert (res.balance, res.runlength, res.autocorr) == (bool(r2), bool(r3), bool(r4))
+    assert (res.N1s, res.N0s) == (N1s, N0s)
+    assert np.array_equal(res.runs, runs)
+    assert res.passed == (res.periodicity and r2 and r3 and r4)
+
+
+def test_test_suite_keeps_lfsr():
+    L = LFSR(fpoly=[12, 6, 4, 1], initstate='random')
+    state, count = L.state.copy(), L.count
+    assert L.test_suite().passed
+    assert np.array_equal(L.state, state) and L.count == count
+
+
+@pytest.mark.parametrize('n', [2, 7, 8, 9, 63, 64, 65, 1001])
+def test_packed_counts_match_bits(n):
+    rng = np.random.default_rng(n)
+    for _ in range(10):
+        p = rng.integers(0, 2, n).astype(np.uint8)
+        b = np.packbits(p)
+        assert _packed_ones(b, n) == p.sum()
+        if len(set(p[1:] != p[:-1])) == 2:
+            # small chunk, so runs cross the chunk boundaries
+            expected = np.bincount(run_lengths(p) - 1)
+            assert np.array_equal(_packed_runs(b, n, chunk=3), expected)
+
+
+def run_lengths(p):
+    '''lengths of runs of p as a period (rotated, so that no run wraps around)'''
+    k = np.flatnonzero(p != p[0])[0] if p[0] == p[-1] else 0
+    q = np.roll(p, -k)
+    bnd = np.r_[np.flatnonzero(q[1:] != q[:-1]), len(q) - 1]
+    return np.diff(bnd, prepend=-1)
+
+
+def autocorr_bruteforce(p, k):
+    q = np.roll(p, k)
+    return (np.sum(p == q) - np.sum(p != q))/len(p)
+
+
+@pytest.mark.parametrize('fpoly', [[5, 2], [6, 3], [7, 4, 3, 2]])
+def test_autocorr_fft_matches_direct(fpoly):
+    L, p = period_bits(fpoly)
+    T = len(p)
+    r_fft, (shift, rxx) = L.autocorr_property(p)
+    r_dir, (shift2, rxx2) = L.autocorr_property(p, method='direct')
+    assert np.array_equal(shift, np.arange(-T, T + 1)) and np.array_equal(shift, shift2)
+    assert r_fft == r_dir
+    assert np.allclose(rxx, rxx2)
+    assert np.allclose(rxx, [autocorr_bruteforce(p, k) for k in range(2*T + 1)])
+
+
+def test_autocorr_lags_and_nonbinary():
+    L, p = period_bits([9, 4])
+    lags = [1, 5, 511, 512, 1000]
+    r, (shift, rxx) = L.autocorr_property(p, lags=lags)
+    assert r and list(shift) == lags
+    assert np.allclose(rxx, [autocorr_bruteforce(p, k) for k in lags])
+    # a ±1 sequence is not binary, computed directly
+    r, (_, rxx) = L.autocorr_property(2*p - 1, lags=[0, 3])
+    assert rxx[0] == 1 and np.isclose(rxx[1], -1/len(p))
+    with pytest.raises(ValueError):
+        L.autocorr_property(p, method='wavelet')
+
+
+def runs_by_scanning(p):
+    '''histogram of runs of p as a period, by scanning bit by bit from a run boundary'''
+    T = len(p)
+    start = next(k for k in range(T) if p[k] != p[k - 1])
+    hist, n = {}, 1
+    for j in range(1, T + 1):
+        if p[(start + j) % T] == p[(start + j - 1) % T]:
+            n += 1
+        else:
+            hist[n] = hist.get(n, 0) + 1
+            n = 1
+    return [hist.get(l, 0) for l in range(1, max(hist) + 1)]
+
+
+@pytest.mark.parametrize('fpoly', [[5, 2], [8, 6, 5, 4], [10, 3], [6, 3], [4, 2]])
+def test_runlength_matches_scanning(fpoly):
+    L, p = period_bits(fpoly)
+    r, runs = L.runlength_property(p)
+    assert runs.tolist() == runs_by_scanning(p)
+    M = fpoly[0]
+    if r:
+        # m-sequence: 2^(M-k-1) runs of length k (k < M-1), one run of M-1 and of M
+        assert runs.tolist() == [2**(M - k - 1) for k in range(1, M - 1)] + [1, 1]
+
+
+def test_runlength_wraps_around():
+    # last 0 and first 0 are one run (as a period): runs 1, 00, 111, 00
+    p = np.array([0, 1, 0, 0, 1, 1, 1, 0])
+    _, runs = LFSR().runlength_property(p)
+    assert runs.tolist() == runs_by_scanning(p) == [1, 2, 1]
@@ -0,0 +1,57 @@
+'''
+Tests for search_fpoly and its on-disk cache (opt-in)
+'''
+import json
+import os
+import pytest
+
+import pylfsr.utils as utils
+from pylfsr.utils import search_fpoly, is_primitive
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('PYLFSR_CACHE_DIR', str(tmp_path))
+    monkeypatch.setenv('HOME', str(tmp_path))
+    return tmp_path
+
+
+def test_default_does_not_touch_disk(cache_dir):
+    assert search_fpoly(64) == [[64, 4, 3, 1]]
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_cache_true_writes_and_reads(cache_dir, monkeypatch):
+    # x^89 + x^38 + 1 and its reciprocal are the only primitive trinomials of degree 89
+    polys = search_fpoly(89, n=3, weight=3, cache=True)
+    assert polys == [[89, 38], [89, 51]]
+    fname = cache_dir / utils._FPOLY_SEARCH_CACHE
+    entry = json.loads(fname.read_text())['89']['min3']
+    assert entry == {'polys': polys, 'complete': True}
+
+    # later calls are served from cache, without primitivity tests
+    monkeypatch.setattr(utils, 'is_primitive', None)
+    assert search_fpoly(89, n=1, weight=3, cache=True) == polys[:1]
+    assert search_fpoly(89, n=10, weight=3, cache=True) == polys
+
+
+def test_cache_path_not_writable(tmp_path):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    # directory of cache file is a regular file, so writing fails, result is still returned
+    fname = str(blocker / 'sub' / 'cache.json')
+    assert search_fpoly(31, n=2, weight=3, cache=fname) == [[31, 3], [31, 6]]
+    assert not os.path.exists(fname)
+
+
+def test_random_reproducible():
+    a = search_fpoly(40, n=3, method='random', seed=7)
+    assert a == search_fpoly(40, n=3, method='random', seed=7)
+    assert len(a) == 3 and all(len(f) == 4 and is_primitive(f) for f in a)
+
+
+def test_no_trinomial():
+    # no primitive trinomial of degree multiple of 8
+    assert search_fpoly(16, n=1, weight=3) == []
+    with pytest.raises(ValueError):
+        search_fpoly(4, weight=5)
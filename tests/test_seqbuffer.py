@@ -0,0 +1,80 @@
+'''
+Tests for SeqBuffer, storage of output sequence (seq)
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR, A5_1
+from pylfsr.utils import SeqBuffer
+
+
+class TestUnbounded:
+    def test_append_and_extend_keep_order(self):
+        b = SeqBuffer(capacity=2)
+        ref = []
+        for i in range(100):
+            b.append(i % 2)
+            ref.append(i % 2)
+            b.extend([1, 0, 0])
+            ref += [1, 0, 0]
+        assert len(b) == len(ref)
+        assert b.view().tolist() == ref
+
+    def test_dtype_is_int_by_default(self):
+        assert SeqBuffer([1, 0]).view().dtype == np.dtype(int)
+
+
+@pytest.mark.parametrize('maxlen', [0, 1, 3, 8, 64])
+def test_bounded_keeps_last_maxlen(maxlen):
+    rng = np.random.default_rng(maxlen)
+    b = SeqBuffer(maxlen=maxlen)
+    ref = []
+    for _ in range(200):
+        k = int(rng.integers(0, 2*maxlen + 3))
+        bits = rng.integers(0, 2, k)
+        b.extend(bits)
+        ref += bits.tolist()
+        assert b.view().tolist() == (ref[len(ref) - maxlen:] if maxlen else [])
+        assert len(b._buf) <= max(2*maxlen, 1)
+
+
+def test_negative_maxlen():
+    with pytest.raises(ValueError):
+        SeqBuffer(maxlen=-1)
+
+
+def test_views_are_not_overwritten():
+    # bounded buffer moves bits to start when full, earlier views should still hold their bits
+    b = SeqBuffer(maxlen=4)
+    views, copies = [], []
+    for i in range(40):
+        b.append(i % 3 == 0)
+        v = b.view()
+        views.append(v)
+        copies.append(v.copy())
+        if i % 7 == 0:
+            b.extend([1, 1, 1, 1, 1])
+        if i % 11 == 0:
+            b.clear()
+    for v, c in zip(views, copies):
+        assert np.array_equal(v, c)
+
+
+def test_lfsr_seq_dtype_and_history():
+    L = LFSR(fpoly=[5, 2], initstate='ones', seq_history=10)
+    first = L.seq
+    L.runKCycle(25)
+    assert first.tolist() == [-1]
+    assert L.seq.dtype == np.dtype(int)
+    assert len(L.seq) == 10
+
+    R = LFSR(fpoly=[5, 2], initstate='ones')
+    full = R.runKCycle(25)
+    assert L.seq.tolist() == full[-10:].tolist()
+
+
+def test_generator_seq_history_zero():
+    A = A5_1(key='ones', seq_history=0)
+    out = A.runKCycle(1000)
+    assert len(out) == 1000
+    assert len(A.seq) == 0
@@ -0,0 +1,70 @@
+'''
+Tests for streaming interface: iteration and stream(chunk_size) of LFSR and sequence generators
+'''
+import inspect
+import itertools
+import numpy as np
+import pytest
+
+from pylfsr import LFSR, A5_1, Geffe, Geffe3, ShrinkingGenerator
+
+
+def lfsr(fpoly=(5, 2), **kw):
+    return LFSR(fpoly=list(fpoly), initstate='ones', **kw)
+
+
+GENERATORS = {
+    'lfsr': lambda: lfsr((13, 4, 3, 1)),
+    'a5_1': lambda: A5_1(key='ones'),
+    'geffe': lambda: Geffe([lfsr((5, 2)), lfsr((7, 1))], lfsr((3, 2))),
+    'geffe3': lambda: Geffe3(lfsr((5, 2)), lfsr((7, 1)), lfsr((3, 2))),
+    'shrinking': lambda: ShrinkingGenerator(lfsr((7, 1)), lfsr((5, 2))),
+}
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_stream_chunks_concatenate_to_runKCycle(name):
+    chunks = list(GENERATORS[name]().stream(chunk_size=300, n=1000))
+    assert [len(c) for c in chunks] == [300, 300, 300, 100]
+    assert all(c.dtype == np.uint8 for c in chunks)
+    assert np.array_equal(np.concatenate(chunks), GENERATORS[name]().runKCycle(1000))
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_iteration_is_next(name):
+    it, ref = GENERATORS[name](), GENERATORS[name]()
+    assert [int(b) for b in itertools.islice(iter(it), 50)] == [int(ref.next()) for _ in range(50)]
+
+
+def test_unbounded_stream_with_no_history():
+    L = lfsr((16, 15, 13, 4), seq_history=0)
+    s = L.stream(chunk_size=2**12)
+    total = sum(int(next(s).sum()) for _ in range(32))
+    # 32*2^12 bits of a period 2^16-1, about half ones
+    assert abs(total - 2**16) < 2**10
+    assert len(L.seq) == 0 and L.count == 2**17
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+@pytest.mark.parametrize('bitorder', ['big', 'little'])
+def test_stream_packed(name, bitorder):
+    a = np.concatenate(list(GENERATORS[name]().stream(chunk_size=64, n=640, dtype='packed', bitorder=bitorder)))
+    assert a.dtype == np.uint8 and len(a) == 80
+    assert np.array_equal(np.unpackbits(a, bitorder=bitorder), GENERATORS[name]().runKCycle(640))
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_stream_dtype(name):
+    chunks = list(GENERATORS[name]().stream(chunk_size=100, n=250, dtype=np.int64))
+    assert all(c.dtype == np.int64 for c in chunks)
+    assert np.array_equal(np.concatenate(chunks), GENERATORS[name]().runKCycle(250))
+
+
+def test_same_stream_signature():
+    sig = {name: inspect.signature(G().stream) for name, G in GENERATORS.items()}
+    assert len(set(map(str, sig.values()))) == 1
+
+
+def test_bad_chunk_size():
+    with pytest.raises(ValueError):
+        next(lfsr().stream(chunk_size=0))
@@ -0,0 +1,84 @@
+'''
+Tests for write_sequence: memory-mapped dumps of output sequence, in 'packed', 'npy' and 'ascii' formats
+'''
+import numpy as np
+import pytest
+
+from pylfsr import LFSR, Geffe3
+
+N_BITS = 10003
+
+
+def reference(n=N_BITS):
+    return LFSR(fpoly=[17, 3], initstate='ones').runKCycle(n).astype(np.uint8)
+
+
+def read(fname, fmt, n=N_BITS, bitorder='big'):
+    if fmt == 'ascii':
+        return np.fromfile(fname, dtype=np.uint8) - ord('0')
+    data = np.load(fname) if fmt == 'npy' else np.fromfile(fname, dtype=np.uint8)
+    return np.unpackbits(data, count=n, bitorder=bitorder)
+
+
+@pytest.mark.parametrize('fmt', ['packed', 'npy', 'ascii'])
+def test_formats(tmp_path, fmt):
+    fname = str(tmp_path / ('seq.' + fmt))
+    L = LFSR(fpoly=[17, 3], initstate='ones', seq_history=0)
+    assert L.write_sequence(fname, N_BITS, fmt=fmt, chunk_size=1024) == N_BITS
+    assert np.array_equal(read(fname, fmt), reference())
+
+
+@pytest.mark.parametrize('fmt', ['packed', 'npy'])
+def test_resume_from_offset(tmp_path, fmt):
+    fname = str(tmp_path / 'seq.bin')
+    if fmt == 'npy':
+        fname += '.npy'
+    offset = 4096
+    # first part, then continue from offset with a new LFSR jumped to offset
+    LFSR(fpoly=[17, 3], initstate='ones').write_sequence(fname, N_BITS, fmt=fmt)
+    data = read(fname, fmt).copy()
+    data[offset:] = 0
+    raw = np.packbits(data)
+    np.save(fname, raw) if fmt == 'npy' else raw.tofile(fname)
+
+    L = LFSR(fpoly=[17, 3], initstate='ones')
+    L.jump(offset)
+    assert L.write_sequence(fname, N_BITS, fmt=fmt, offset=offset, chunk_size=1000) == N_BITS - offset
+    assert np.array_equal(read(fname, fmt), reference())
+
+
+def test_bitorder_little(tmp_path):
+    fname = str(tmp_path / 'seq.bin')
+    LFSR(fpoly=[17, 3], initstate='ones').write_sequence(fname, N_BITS, bitorder='little')
+    assert np.array_equal(read(fname, 'packed', bitorder='little'), reference())
+
+
+def test_generator_write_sequence(tmp_path):
+    def g3():
+        return Geffe3(*[LFSR(fpoly=f, initstate='ones') for f in ([5, 2], [7, 1], [3, 2])])
+    fname = str(tmp_path / 'g3.txt')
+    g3().write_sequence(fname, 999, fmt='ascii', chunk_size=100)
+    assert np.array_equal(read(fname, 'ascii'), g3().runKCycle(999))
+
+
+def test_invalid_arguments(tmp_path):
+    L = LFSR()
+    fname = str(tmp_path / 'x.bin')
+    with pytest.raises(ValueError):
+        L.write_sequence(fname, 100, fmt='hex')
+    with pytest.raises(ValueError):
+        L.write_sequence(fname, 100, offset=3)
+    with pytest.raises(ValueError):
+        L.write_sequence(fname, 100, offset=101)
+
+
+@pytest.mark.parametrize('fmt', ['packed', 'npy', 'ascii'])
+def test_resume_missing_file(tmp_path, fmt):
+    # resuming needs the bits written before offset, no file padded with zeros is created
+    fname = tmp_path / 'missing.bin'
+    L = LFSR(fpoly=[9, 4])
+    L.jump(800)
+    with pytest.raises(FileNotFoundError):
+        L.write_sequence(str(fname), 1600, fmt=fmt, offset=800)
+    assert not fname.exists()
+    assert L.count == 800
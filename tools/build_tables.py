@@ -0,0 +1,59 @@
+'''
+Build data tables of pylfsr
+---------------------------
+fpoly:    npz index of primitive polynomials (pylfsr/primitive_polynomials_GF2.npz), used by get_fpolyList,
+          from the text table pylfsr/primitive_polynomials_GF2_dict.txt, to be rebuilt whenever the text table changes.
+mersenne: table of prime factors of 2^M-1, M <= 1024 (pylfsr/mersenne_factors.npz), used by is_primitive and
+          search_fpoly, from a list of primes of the Cunningham project tables (factors of 2^n-1 and 2^n+1).
+          Source is either a text file with one prime per line, or 'cunningham_prime_factors.sobj' of Sage
+          (package database_cunningham).
+
+usage: python tools/build_tables.py fpoly
+       python tools/build_tables.py mersenne <primes.txt | cunningham_prime_factors.sobj> [--maxd 1024]
+'''
+from __future__ import print_function
+import os, sys, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pylfsr import utils
+
+def read_primes(fname):
+    '''
+    List of primes from text file (one per line, '#' comments) or Sage sobj (zlib compressed pickle of Integers)
+    '''
+    if fname.endswith('.sobj'):
+        import io, zlib, pickle
+
+        class _Unpickler(pickle.Unpickler):
+            def find_class(self, module, name):
+                # Sage Integer is pickled as its base-32 string
+                if name == 'make_integer':
+                    return lambda s: int(s if isinstance(s, str) else s.decode(), 32)
+                return pickle.Unpickler.find_class(self, module, name)
+
+        with open(fname, 'rb') as f:
+            data = zlib.decompress(f.read())
+        return [int(p) for p in _Unpickler(io.BytesIO(data), encoding='latin1').load()]
+    with open(fname) as f:
+        return [int(line.split('#')[0]) for line in f if line.split('#')[0].strip()]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='build data tables of pylfsr')
+    sub = parser.add_subparsers(dest='table')
+    sub.add_parser('fpoly', help='npz index of primitive polynomials')
+    p = sub.add_parser('mersenne', help='prime factors of 2^M-1')
+    p.add_argument('primes', help='text file of primes, or cunningham_prime_factors.sobj')
+    p.add_argument('--maxd', type=int, default=1024, help='max M')
+    args = parser.parse_args()
+
+    if args.table == 'fpoly':
+        utils._saveFpolyIndex(utils._loadFpolyTxt())
+        print('saved', utils._FPOLY_NPZ)
+    elif args.table == 'mersenne':
+        missing = utils._saveMersenneFactors(read_primes(args.primes), maxd=args.maxd)
+        print('saved', utils._MERSENNE_NPZ)
+        if missing:
+            print('Phi_d(2) not completely factored, d =', missing)
+    else:
+        parser.print_help()
+        sys.exit(1)